@@ -1,15 +1,33 @@
-from fastapi import APIRouter, Header, Request
-from pydantic import BaseModel
-from typing import List
+import json
+import time
+from dataclasses import asdict
+
+from fastapi import APIRouter, Body, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
 
 from app.agents.base import AgentContext
 from app.agents.registry import registry
 from app.tier import normalize_tier
-from app.core.engine import engine
+from app.core.engine import engine, DEFAULT_BATCH_CONCURRENCY
+from app.core.serialization import FAST_JSON, FastJSONResponse, dumps
+from app.core.http_cache import precomputed
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
 
+# ============================================================
+# Batch limits
+# ============================================================
+# Upper bound on items per batch request (keeps a single request
+# from monopolizing the worker)
+MAX_BATCH_ITEMS = 1000
+
+# Upper bound on the per-request concurrency a client may ask for
+MAX_BATCH_CONCURRENCY = 64
+
+
 # ============================================================
 # Request / Response Models
 # ============================================================
@@ -31,41 +49,191 @@ class OrchestrateResponse(BaseModel):
     plan: List[str]
 
 
+class BatchItem(BaseModel):
+    """
+    A single agent invocation inside a batch.
+    Tier falls back to the X-OperatorX-Tier header when omitted.
+    """
+    agent: str
+    input: Dict[str, Any] = {}
+    tier: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """
+    Input payload for batch requests.
+    Items run through the Core Engine with bounded concurrency.
+    """
+    items: List[BatchItem] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
+
+class BatchItemResult(BaseModel):
+    """
+    Per-item result (same shape as EngineResult).
+    """
+    agent: str
+    request_id: Optional[str]
+    tier: str
+    output: Dict[str, Any]
+    ok: bool
+    error: Optional[str] = None
+    cache: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+
+class BatchSummary(BaseModel):
+    """
+    Batch-level timing and outcome counts.
+    """
+    items: int
+    succeeded: int
+    failed: int
+    concurrency: int
+    elapsed_ms: float
+
+
+class BatchResponse(BaseModel):
+    """
+    Results in request order plus a batch summary.
+    """
+    request_id: Optional[str]
+    results: List[BatchItemResult]
+    summary: BatchSummary
+
+
+class PipelineNodeSpec(BaseModel):
+    """
+    One node of a pipeline: an agent plus where its input comes from.
+
+    - input: literal values
+    - map: input key -> "input.<path>" or "<node_id>[.<path>]"
+    - after: extra ordering dependencies
+    """
+    id: str
+    agent: str
+    input: Dict[str, Any] = {}
+    map: Dict[str, str] = {}
+    after: List[str] = []
+
+
+class PipelineRequest(BaseModel):
+    """
+    Input payload for pipeline requests: a DAG of agents plus the
+    pipeline-level input that nodes can map from.
+    """
+    nodes: List[PipelineNodeSpec] = Field(min_length=1)
+    input: Dict[str, Any] = {}
+
+
+class PipelineResponse(BaseModel):
+    """
+    Per-node results plus the outputs of the final (sink) nodes.
+    """
+    request_id: Optional[str]
+    tier: str
+    ok: bool
+    error: Optional[str] = None
+    order: List[str]
+    elapsed_ms: float
+    outputs: Dict[str, Dict[str, Any]]
+    nodes: Dict[str, BatchItemResult]
+
+
 # ============================================================
 # Routes
 # ============================================================
 
 @router.get("", summary="List available agents")
-def list_agents():
+async def list_agents(request: Request):
     """
     Returns all agents currently registered in the AgentRegistry.
+
+    The body is encoded once per registry version (ETag / 304).
+    """
+    return precomputed.respond(request, "agents", registry.version, lambda: {"agents": registry.list()})
+
+
+@router.get("/cache", summary="Result cache statistics")
+async def cache_stats():
+    """
+    Hit/miss counters and occupancy of the engine result cache.
+    """
+    if engine.result_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **engine.result_cache.stats()}
+
+
+@router.get("/admission", summary="Admission control statistics")
+async def admission_stats():
+    """
+    Per-tier running / queued executions, rejections and limits.
+    """
+    if engine.admission is None:
+        return {"enabled": False}
+    return engine.admission.stats()
+
+
+@router.get("/coalescing", summary="Request coalescing statistics")
+async def coalescing_stats():
+    """
+    Executions started vs. calls that shared an in-flight execution.
+    """
+    if engine.coalescer is None:
+        return {"enabled": False}
+    return {"enabled": True, **engine.coalescer.stats()}
+
+
+@router.get("/processes", summary="Worker process pool statistics")
+async def process_stats():
     """
-    return {"agents": registry.list()}
+    Worker processes of execution="process" agents: size, executions,
+    chunks and crashes.
+    """
+    return engine.processes.stats()
 
 
 @router.post("/orchestrate", response_model=OrchestrateResponse)
-def orchestrate(
+async def orchestrate(
     request_body: OrchestrateRequest,
     request: Request,
+    response: Response,
     x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier"),
 ) -> OrchestrateResponse:
     """
     Orchestrates a plan using the shared Core Engine.
+
+    Runs on the event loop: the engine awaits async-native agents and
+    offloads sync agents to its own executor, so this handler does not
+    hold a Starlette threadpool slot.
+
+    With OPERATORX_FAST_JSON=1 the plan is encoded once and returned as
+    bytes (the engine output is trusted, so response_model validation is
+    skipped).
     """
 
     # Build execution context (tier + request_id)
     ctx = AgentContext(
         tier=normalize_tier(x_operatorx_tier),
         request_id=getattr(request.state, "request_id", None),
+        deadline=getattr(request.state, "deadline", None),
     )
 
     # Execute via core engine
-    engine_result = engine.run_agent(
+    engine_result = await engine.arun_agent(
         "orchestrator",
         request_body.model_dump(),
         ctx
     )
 
+    # Report result cache outcome (HIT / MISS) for cacheable agents
+    if engine_result.cache:
+        response.headers["X-OperatorX-Cache"] = engine_result.cache.upper()
+
+    if FAST_JSON:
+        plan = engine_result.output["plan"] if engine_result.ok else [f"ERROR: {engine_result.error}"]
+        return FastJSONResponse({"plan": plan}, headers=dict(response.headers))
+
     # Handle errors gracefully
     if not engine_result.ok:
         return OrchestrateResponse(
@@ -75,3 +243,165 @@ def orchestrate(
     return OrchestrateResponse(
         plan=engine_result.output["plan"]
     )
+
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    request_body: BatchRequest,
+    request: Request,
+    x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier"),
+) -> BatchResponse:
+    """
+    Runs many agent invocations in one round trip.
+
+    - Each item gets its own request_id ("<request_id>:<index>") and
+      therefore its own memory record
+    - Items run concurrently, bounded by `concurrency`
+    - Failed items are reported per item; the batch itself succeeds
+    - Every item shares the request deadline (X-OperatorX-Deadline-Ms)
+    """
+    request_id = getattr(request.state, "request_id", None)
+    deadline = getattr(request.state, "deadline", None)
+    default_tier = x_operatorx_tier
+
+    concurrency = min(
+        request_body.concurrency or DEFAULT_BATCH_CONCURRENCY,
+        MAX_BATCH_CONCURRENCY,
+    )
+
+    # Build one execution context per item
+    items = [
+        (
+            item.agent,
+            item.input,
+            AgentContext(
+                tier=normalize_tier(item.tier or default_tier),
+                request_id=f"{request_id}:{index}" if request_id else None,
+                deadline=deadline,
+            ),
+        )
+        for index, item in enumerate(request_body.items)
+    ]
+
+    started = time.perf_counter()
+    results = await engine.arun_batch(items, concurrency=concurrency)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    succeeded = sum(1 for result in results if result.ok)
+    summary = {
+        "items": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "concurrency": concurrency,
+        "elapsed_ms": round(elapsed_ms, 3),
+    }
+
+    if FAST_JSON:
+        return FastJSONResponse({
+            "request_id": request_id,
+            "results": [result.to_dict() for result in results],
+            "summary": summary,
+        })
+
+    return BatchResponse(
+        request_id=request_id,
+        results=[BatchItemResult(**asdict(result)) for result in results],
+        summary=BatchSummary(**summary),
+    )
+
+
+@router.post("/pipeline", response_model=PipelineResponse)
+async def pipeline(
+    request_body: PipelineRequest,
+    request: Request,
+    x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier"),
+) -> PipelineResponse:
+    """
+    Runs a DAG of agents through the shared Core Engine.
+
+    Independent nodes run concurrently; a node starts as soon as the
+    nodes it depends on finish. Invalid specs (unknown agents, cycles,
+    bad references) return ok=false with an error message.
+    """
+    ctx = AgentContext(
+        tier=normalize_tier(x_operatorx_tier),
+        request_id=getattr(request.state, "request_id", None),
+        deadline=getattr(request.state, "deadline", None),
+    )
+
+    spec = {"nodes": [node.model_dump() for node in request_body.nodes]}
+    result = await engine.arun_pipeline(spec, request_body.input, ctx)
+
+    if FAST_JSON:
+        return FastJSONResponse(result.to_dict())
+
+    return PipelineResponse(
+        request_id=result.request_id,
+        tier=result.tier,
+        ok=result.ok,
+        error=result.error,
+        order=result.order,
+        elapsed_ms=result.elapsed_ms,
+        outputs=result.outputs,
+        nodes={
+            node_id: BatchItemResult(**asdict(node_result))
+            for node_id, node_result in result.nodes.items()
+        },
+    )
+
+
+@router.post("/{name}/stream", summary="Stream agent output")
+async def stream_agent(
+    name: str,
+    request: Request,
+    input_data: Dict[str, Any] = Body(default_factory=dict),
+    x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier"),
+    accept: str | None = Header(default=None),
+) -> StreamingResponse:
+    """
+    Streams an agent's output as it is produced.
+
+    - Accept: text/event-stream -> Server-Sent Events
+    - anything else             -> NDJSON (one JSON event per line)
+
+    Events are {"event": "chunk", "data": ...} followed by a single
+    {"event": "done", "ok": ..., "error": ...}. Streaming agents (ex:
+    orchestrator) emit one chunk per plan step; other agents emit their
+    whole output as one chunk.
+
+    The first event is produced before the response starts, so a
+    saturated tier is rejected with a plain 429 / 503 (AdmissionRejected)
+    instead of a stream that ends early.
+    """
+    ctx = AgentContext(
+        tier=normalize_tier(x_operatorx_tier),
+        request_id=getattr(request.state, "request_id", None),
+        deadline=getattr(request.state, "deadline", None),
+    )
+
+    use_sse = "text/event-stream" in (accept or "")
+    events = engine.astream_agent(name, input_data, ctx)
+    first = await events.__anext__()
+
+    async def replay():
+        yield first
+        async for event in events:
+            yield event
+
+    async def encode():
+        async for event in replay():
+            if FAST_JSON:
+                payload = dumps(event)
+            else:
+                payload = json.dumps(event, default=str).encode("utf-8")
+
+            if use_sse:
+                yield b"event: " + event["event"].encode("ascii") + b"\ndata: " + payload + b"\n\n"
+            else:
+                yield payload + b"\n"
+
+    return StreamingResponse(
+        encode(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
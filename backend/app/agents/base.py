@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
+import time
+from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
 
 
 @dataclass
@@ -15,21 +16,128 @@ class AgentContext:
     request_id: Optional[str] = None
     metadata: Dict[str, Any] = None
 
+    # Absolute time.monotonic() deadline of the request (None: no
+    # request deadline; the engine still applies the agent's own)
+    deadline: Optional[float] = None
+
     def __post_init__(self) -> None:
         if self.metadata is None:
             self.metadata = {}
 
+    def remaining(self) -> Optional[float]:
+        """
+        Seconds left before the request deadline (None: no deadline).
+
+        Long-running agents can poll this to stop early; the engine
+        abandons the execution when it reaches 0 either way.
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.monotonic()
+
 
 class BaseAgent(ABC):
     """
     Common interface for all agents in OperatorX AI.
+
+    Agents implement at least one of:
+    - run():  synchronous execution (CPU-light or blocking work)
+    - arun(): async-native execution (I/O-bound work: model calls, HTTP, DBs)
+
+    The CoreEngine calls arun() when an agent provides it and offloads
+    run() to the agent's own worker threads (bulkhead) otherwise, so sync
+    agents never block the event loop. Both run under the agent's
+    deadline; long-running agents may check ctx.remaining().
+
+    Streaming agents additionally implement stream() (generator) or
+    astream() (async generator) and set stream_field: the output key
+    whose list items are produced one at a time.
+
+    Agents that hold expensive resources override startup()/shutdown()
+    and are registered as singleton or pool (see AgentRegistry).
     """
 
     name: str = "base-agent"
 
-    @abstractmethod
+    # Opt-in to the engine result cache.
+    # Only set this for agents whose output is a pure function of
+    # (canonical_input(input_data), ctx.tier).
+    cacheable: bool = False
+
+    # Opt-in to request coalescing: identical concurrent calls (same
+    # canonical input + tier) share one execution. Implied by cacheable;
+    # set it alone for agents that may answer concurrent duplicates
+    # together but whose output must not be reused later.
+    coalesce: bool = False
+
+    # Output key built incrementally by stream()/astream() (ex: "plan").
+    # The engine rebuilds the full output as {stream_field: [items...]}.
+    stream_field: Optional[str] = None
+
     def run(self, input_data: Dict[str, Any], ctx: AgentContext) -> Dict[str, Any]:
         """
         Execute the agent and return a structured response.
         """
-        raise NotImplementedError
+        raise NotImplementedError(f"{type(self).__name__} does not implement run()")
+
+    async def arun(self, input_data: Dict[str, Any], ctx: AgentContext) -> Dict[str, Any]:
+        """
+        Async-native execution (optional).
+
+        Override this for agents that await I/O. It must return the same
+        structured response as run().
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement arun()")
+
+    def stream(self, input_data: Dict[str, Any], ctx: AgentContext) -> Iterator[Any]:
+        """
+        Streaming execution (optional): yield stream_field items in order.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement stream()")
+
+    async def astream(self, input_data: Dict[str, Any], ctx: AgentContext) -> AsyncIterator[Any]:
+        """
+        Async streaming execution (optional): yield stream_field items in order.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement astream()")
+        yield  # pragma: no cover (makes this an async generator)
+
+    async def startup(self) -> None:
+        """
+        Warmup hook (optional): load models, open clients, compile prompts.
+
+        Awaited once per instance before first use for singleton and
+        pooled agents (see AgentRegistry); per-request agents never
+        call it.
+        """
+
+    async def shutdown(self) -> None:
+        """
+        Release what startup() acquired (called on worker shutdown).
+        """
+
+    @classmethod
+    def is_async(cls) -> bool:
+        """
+        True when the agent provides its own arun() coroutine.
+        """
+        return cls.arun is not BaseAgent.arun
+
+    @classmethod
+    def streams(cls) -> bool:
+        """
+        True when the agent can produce its output incrementally.
+        """
+        return cls.stream_field is not None and (
+            cls.stream is not BaseAgent.stream or cls.astream is not BaseAgent.astream
+        )
+
+    @classmethod
+    def canonical_input(cls, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Normalize input for cache keys.
+
+        Cacheable agents override this so inputs that produce the same
+        output (extra keys, whitespace, None vs []) share one cache entry.
+        """
+        return input_data
@@ -3,6 +3,33 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from app.agents.base import BaseAgent, AgentContext
+from app.core.profiles import tier_profiles
+
+
+# ------------------------------------------------------------
+# Tier-independent content (built once, copied into each response)
+# ------------------------------------------------------------
+# Core recommendations (generic best practices)
+RECOMMENDATIONS = (
+    "Add deployment health checks and rollback strategy",
+    "Use progressive delivery (canary / blue-green) for safer releases",
+    "Define SLOs/SLIs and alert on error budgets",
+    "Automate CI/CD checks (tests, lint, security scans) before deploy",
+)
+
+# Risk identification (what could go wrong)
+RISKS = (
+    "Deployments without rollback increase outage risk",
+    "No monitoring/alerts causes slow incident detection",
+    "Unvalidated changes increase regression probability",
+)
+
+# Next actions (concrete steps a team can execute)
+NEXT_ACTIONS = (
+    "Implement a basic health endpoint and readiness checks",
+    "Add CI pipeline gates (unit tests + linting + security scan)",
+    "Create a rollback runbook and test rollback in staging",
+)
 
 
 class DeploymentReliabilityAgent(BaseAgent):
@@ -21,6 +48,20 @@ class DeploymentReliabilityAgent(BaseAgent):
 
     name = "deployment_reliability"
 
+    # Output depends only on goal, constraints and tier
+    cacheable = True
+
+    @classmethod
+    def canonical_input(cls, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Only goal (stripped) and constraints affect the output.
+        Constraint order is kept because the response echoes it.
+        """
+        return {
+            "goal": str(input_data.get("goal", "")).strip(),
+            "constraints": list(input_data.get("constraints", []) or []),
+        }
+
     def run(self, input_data: Dict[str, Any], ctx: AgentContext) -> Dict[str, Any]:
         """
         Create a reliability improvement response based on:
@@ -37,65 +78,22 @@ class DeploymentReliabilityAgent(BaseAgent):
         constraints: List[str] = input_data.get("constraints", []) or []
 
         # ------------------------------------------------------------
-        # Core recommendations (generic best practices)
+        # Tier-aware adjustments (deployments/<tier>/profile.json)
         # ------------------------------------------------------------
-        recommendations = [
-            "Add deployment health checks and rollback strategy",
-            "Use progressive delivery (canary / blue-green) for safer releases",
-            "Define SLOs/SLIs and alert on error budgets",
-            "Automate CI/CD checks (tests, lint, security scans) before deploy",
-        ]
-
-        # ------------------------------------------------------------
-        # Tier-aware adjustments (shows deployment-sensitive design)
-        # ------------------------------------------------------------
-        tier_notes: List[str] = []
-        if ctx.tier == "personal":
-            tier_notes = [
-                "Prioritize low-cost monitoring (basic uptime checks, lightweight logs)",
-                "Keep setup simple and avoid heavy infrastructure overhead",
-            ]
-        elif ctx.tier == "business":
-            tier_notes = [
-                "Use audit-friendly logging and deployment reporting",
-                "Integrate with incident workflows (ticketing, on-call, postmortems)",
-            ]
-        elif ctx.tier == "government":
-            tier_notes = [
-                "Add human-in-the-loop approvals for releases when required",
-                "Enforce traceability: what changed, who approved, and why",
-                "Favor explainable controls and documented governance gates",
-            ]
-
-        # ------------------------------------------------------------
-        # Risk identification (what could go wrong)
-        # ------------------------------------------------------------
-        risks = [
-            "Deployments without rollback increase outage risk",
-            "No monitoring/alerts causes slow incident detection",
-            "Unvalidated changes increase regression probability",
-        ]
+        tier_notes = list(tier_profiles.get(ctx.tier).section(self.name, "tier_notes"))
 
         # Add constraint-aware risk notes (simple but realistic)
+        risks = list(RISKS)
         if constraints:
             risks.append(f"Constraints may reduce options: {', '.join(constraints)}")
 
-        # ------------------------------------------------------------
-        # Next actions (concrete steps a team can execute)
-        # ------------------------------------------------------------
-        next_actions = [
-            "Implement a basic health endpoint and readiness checks",
-            "Add CI pipeline gates (unit tests + linting + security scan)",
-            "Create a rollback runbook and test rollback in staging",
-        ]
-
         return {
             "agent": self.name,
             "tier": ctx.tier,
             "goal": goal,
-            "constraints": constraints,
-            "recommendations": recommendations,
+            "constraints": list(constraints),
+            "recommendations": list(RECOMMENDATIONS),
             "tier_notes": tier_notes,
             "risks": risks,
-            "next_actions": next_actions,
+            "next_actions": list(NEXT_ACTIONS),
         }
@@ -1,57 +1,51 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from app.agents.base import BaseAgent, AgentContext
+from app.core.profiles import tier_profiles
 
 
 class OrchestratorAgent(BaseAgent):
     name = "orchestrator"
 
+    # Output depends only on goal, constraints and tier
+    cacheable = True
+
+    # Plan steps can be streamed one at a time
+    stream_field = "plan"
+
+    @classmethod
+    def canonical_input(cls, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        # Constraint order is kept: the plan echoes constraints in order
+        return {
+            "goal": str(input_data.get("goal", "")).strip(),
+            "constraints": list(input_data.get("constraints", []) or []),
+        }
+
     def run(self, input_data: Dict[str, Any], ctx: AgentContext) -> Dict[str, Any]:
+        return {"plan": list(self.stream(input_data, ctx))}
+
+    def stream(self, input_data: Dict[str, Any], ctx: AgentContext) -> Iterator[str]:
+        """
+        Yield plan steps one at a time (used by /agents/orchestrator/stream).
+        run() collects the same steps into {"plan": [...]}.
+        """
         goal = str(input_data.get("goal", "")).strip()
         constraints: List[str] = input_data.get("constraints", []) or []
 
         # Shared core steps (all tiers)
-        plan: List[str] = [
-            f"Analyze goal: {goal}",
-            f"Tier: {ctx.tier}",
-        ]
-
-        # Tier-specific behavior
-        if ctx.tier == "personal":
-            plan += [
-                "Keep data local when possible",
-                "Minimize logging (privacy-first)",
-                "Generate a simple execution plan",
-            ]
-
-        elif ctx.tier == "business":
-            plan += [
-                "Confirm scope + stakeholders",
-                "Enable audit-friendly logging",
-                "Check integration touchpoints (APIs, dashboards, workflows)",
-                "Generate an execution plan with measurable outcomes",
-            ]
-
-        elif ctx.tier == "government":
-            plan += [
-                "Require human-in-the-loop approval for key decisions",
-                "Capture traceability (inputs, outputs, rationale)",
-                "Run policy + compliance checks (privacy, security, accountability)",
-                "Generate an execution plan with governance gates",
-            ]
+        yield f"Analyze goal: {goal}"
+        yield f"Tier: {ctx.tier}"
+
+        # Tier-specific behavior (deployments/<tier>/profile.json)
+        yield from tier_profiles.get(ctx.tier).section(self.name, "steps")
 
         # Constraint handling (all tiers)
-        plan.append("Evaluate constraints")
+        yield "Evaluate constraints"
         if constraints:
-            plan.append(f"Constraints: {', '.join(constraints)}")
+            yield f"Constraints: {', '.join(constraints)}"
 
         # Closing steps (all tiers)
-        plan += [
-            "Generate execution plan",
-            "Return structured response",
-        ]
-
-        return {"plan": plan}
-
+        yield "Generate execution plan"
+        yield "Return structured response"
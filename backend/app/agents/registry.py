@@ -1,10 +1,361 @@
 from __future__ import annotations
 
-from typing import Dict, Type
+import asyncio
+import functools
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 from app.agents.base import BaseAgent
-from app.agents.orchestrator import OrchestratorAgent
-from app.agents.domain_reliability import DeploymentReliabilityAgent
+
+
+logger = logging.getLogger("operatorx.agents.registry")
+
+
+# ------------------------------------------------------------
+# Lifecycle policies
+# ------------------------------------------------------------
+# per_request: a new instance for every execution (no shared state)
+# singleton:   one instance per worker, shared by concurrent requests
+# pool:        up to pool_size instances, each used by one request at a time
+PER_REQUEST = "per_request"
+SINGLETON = "singleton"
+POOL = "pool"
+
+LIFECYCLES = (PER_REQUEST, SINGLETON, POOL)
+
+DEFAULT_POOL_SIZE = 4
+
+
+# ------------------------------------------------------------
+# Execution modes (where a sync agent's run() executes)
+# ------------------------------------------------------------
+# inline:  in the calling thread (event loop included): CPU-trivial
+#          agents only; deadlines cannot interrupt it
+# thread:  on the agent's bulkhead threads (default)
+# process: in a worker process (CoreEngine.processes): CPU-bound
+#          agents, free of the GIL; inputs/outputs must be picklable
+# Async-native agents are awaited on the event loop unless "process".
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+EXECUTIONS = (INLINE, THREAD, PROCESS)
+
+
+# ------------------------------------------------------------
+# Execution limits
+# ------------------------------------------------------------
+# How long one execution may run before the engine gives up on it
+# (seconds; 0 disables the deadline). Per agent: "timeout_seconds".
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("OPERATORX_AGENT_TIMEOUT_SECONDS", "30"))
+
+# Worker threads of an agent's bulkhead executor (sync agents and sync
+# streams). Per agent: "bulkhead"; None uses the engine default.
+DEFAULT_BULKHEAD: Optional[int] = None
+
+
+# ------------------------------------------------------------
+# Discovery
+# ------------------------------------------------------------
+# Installed packages expose agents under this entry point group:
+#   [project.entry-points."operatorx.agents"]
+#   my_agent = "my_pkg.agents:MyAgent"
+ENTRY_POINT_GROUP = "operatorx.agents"
+
+# Built-in agents (JSON manifest next to this module)
+BUILTIN_MANIFEST = Path(__file__).with_name("manifest.json")
+
+# Extra manifest merged on top of the built-ins (same format)
+MANIFEST_ENV = "OPERATORX_AGENT_MANIFEST"
+
+
+class AgentPool:
+    """
+    Bounded pool of agent instances with checkout/checkin.
+
+    Why this exists:
+    - Agents that hold a non-thread-safe resource (a model session, a
+      connection) must serve one request at a time
+    - Building such agents is expensive, so they are reused
+
+    Behavior:
+    - Instances are created on demand up to `size` (or all at once by
+      AgentRegistry.startup)
+    - When every instance is checked out, callers wait in FIFO order;
+      checkin hands the instance straight to the next waiter
+    - Works for threads (checkout) and coroutines (acheckout) alike
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.instances: List[BaseAgent] = []
+
+        self._lock = threading.Lock()
+        self._idle: Deque[BaseAgent] = deque()
+        self._waiters: Deque[Callable[[BaseAgent], None]] = deque()
+        self._reserved = 0
+
+        # Counters (exposed through stats())
+        self.checkouts = 0
+        self.waits = 0
+
+    def reserve(self) -> Optional[BaseAgent]:
+        """
+        Take an idle instance, or reserve room to build one (returns None).
+
+        Raises LookupError when the pool is exhausted.
+        """
+        with self._lock:
+            if self._idle:
+                self.checkouts += 1
+                return self._idle.popleft()
+            if len(self.instances) + self._reserved < self.size:
+                self._reserved += 1
+                return None
+        raise LookupError("pool exhausted")
+
+    def added(self, agent: Optional[BaseAgent], checked_out: bool = True) -> None:
+        """
+        Settle a reservation with the built instance (None if building failed).
+        """
+        with self._lock:
+            self._reserved -= 1
+            if agent is not None:
+                self.instances.append(agent)
+                self.checkouts += int(checked_out)
+
+    async def fill(self, build: Callable[[], Any]) -> None:
+        """
+        Build instances until the pool is full (startup warmup).
+        """
+        while True:
+            with self._lock:
+                if len(self.instances) + self._reserved >= self.size:
+                    return
+                self._reserved += 1
+
+            built: Optional[BaseAgent] = None
+            try:
+                built = await build()
+            finally:
+                self.added(built, checked_out=False)
+            self.checkin(built)
+
+    def checkout(self, build: Callable[[], BaseAgent]) -> BaseAgent:
+        """
+        Blocking checkout (threads and sync code).
+        """
+        agent = self._try_checkout(build)
+        if agent is not None:
+            return agent
+
+        ready = threading.Event()
+        box: List[BaseAgent] = []
+
+        def wake(handed: BaseAgent) -> None:
+            box.append(handed)
+            ready.set()
+
+        if not self._wait(wake):
+            return self.checkout(build)
+        ready.wait()
+        return box[0]
+
+    async def acheckout(self, build: Callable[[], Any]) -> BaseAgent:
+        """
+        Non-blocking checkout for the event loop.
+
+        `build` is a coroutine function (instances are warmed with await).
+        """
+        try:
+            agent = self.reserve()
+        except LookupError:
+            agent = None
+        else:
+            if agent is None:
+                built: Optional[BaseAgent] = None
+                try:
+                    built = await build()
+                finally:
+                    self.added(built)
+                return built
+            return agent
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[BaseAgent]" = loop.create_future()
+
+        def resolve(handed: BaseAgent) -> None:
+            if future.cancelled():
+                # The waiter went away (client disconnected): pass it on
+                self.checkin(handed)
+            else:
+                future.set_result(handed)
+
+        def wake(handed: BaseAgent) -> None:
+            loop.call_soon_threadsafe(resolve, handed)
+
+        if not self._wait(wake):
+            return await self.acheckout(build)
+        return await future
+
+    def checkin(self, agent: BaseAgent) -> None:
+        """
+        Return an instance (to the next waiter if there is one).
+        """
+        with self._lock:
+            if not self._waiters:
+                self._idle.append(agent)
+                return
+            wake = self._waiters.popleft()
+            self.checkouts += 1
+        wake(agent)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": len(self.instances),
+                "idle": len(self._idle),
+                "waiting": len(self._waiters),
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+            }
+
+    def _try_checkout(self, build: Callable[[], BaseAgent]) -> Optional[BaseAgent]:
+        try:
+            agent = self.reserve()
+        except LookupError:
+            return None
+        if agent is not None:
+            return agent
+
+        built: Optional[BaseAgent] = None
+        try:
+            built = build()
+        finally:
+            self.added(built)
+        return built
+
+    def _wait(self, wake: Callable[[BaseAgent], None]) -> bool:
+        """
+        Queue a waiter unless an instance was checked in meanwhile.
+        """
+        with self._lock:
+            if self._idle or len(self.instances) + self._reserved < self.size:
+                return False
+            self._waiters.append(wake)
+            self.waits += 1
+            return True
+
+
+class LoopRunningError(RuntimeError):
+    """
+    Raised when sync code would have to start (or shut down) an agent
+    instance from a thread whose event loop is running: the hooks are
+    coroutines and cannot be awaited there. Use alease()/acheckout().
+    """
+
+
+def _nothing_to_release() -> None:
+    """
+    Release callable of unpooled instances (see AgentRegistry.alease).
+    """
+
+
+class AgentRegistration:
+    """
+    How one registered agent is located, instantiated and shared.
+
+    The class is referenced by "module:Class" target and only imported
+    on first use (see agent_cls), so registering an agent costs nothing
+    at worker startup.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: str,
+        lifecycle: str = PER_REQUEST,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        warmup: bool = False,
+        source: str = "code",
+        agent_cls: Optional[Type[BaseAgent]] = None,
+        timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+        bulkhead: Optional[int] = DEFAULT_BULKHEAD,
+        execution: str = THREAD,
+    ) -> None:
+        self.name = name
+        self.target = target
+        self.lifecycle = lifecycle
+        self.pool_size = pool_size
+        self.warmup = warmup
+        self.source = source
+
+        # Execution deadline (seconds, None = unbounded) and bulkhead size
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.bulkhead = bulkhead
+        self.execution = execution
+
+        # Shared instance (singleton) or instance pool (pool)
+        self.instance: Optional[BaseAgent] = None
+        self.pool: Optional[AgentPool] = AgentPool(pool_size) if lifecycle == POOL else None
+
+        # Resolved class + how long importing it took (None until loaded)
+        self._cls = agent_cls
+        self.import_ms: Optional[float] = None
+        self._load_lock = threading.Lock()
+
+    @property
+    def class_name(self) -> str:
+        """
+        Class name from the target (no import).
+        """
+        return self.target.rpartition(":")[2].rpartition(".")[2]
+
+    @property
+    def loaded(self) -> bool:
+        return self._cls is not None
+
+    @property
+    def agent_cls(self) -> Type[BaseAgent]:
+        """
+        The agent class, imported on first access.
+
+        Raises:
+            ImportError / AttributeError if the target cannot be loaded,
+            TypeError if it is not a BaseAgent subclass.
+        """
+        cls = self._cls
+        if cls is not None:
+            return cls
+
+        with self._load_lock:
+            if self._cls is None:
+                module_name, _, attr = self.target.partition(":")
+                started = time.perf_counter()
+                obj: Any = importlib.import_module(module_name)
+                for part in attr.split("."):
+                    obj = getattr(obj, part)
+                self.import_ms = (time.perf_counter() - started) * 1000
+
+                if not (isinstance(obj, type) and issubclass(obj, BaseAgent)):
+                    raise TypeError(f"{self.target} is not a BaseAgent subclass")
+
+                logger.info(
+                    "registry.agent_loaded agent=%s target=%s import_ms=%.1f",
+                    self.name, self.target, self.import_ms,
+                )
+                self._cls = obj
+            return self._cls
 
 
 class AgentRegistry:
@@ -17,49 +368,284 @@ class AgentRegistry:
     - Provides a single source of truth for what agents exist
 
     Design notes:
-    - Agents are registered by name
-    - The registry stores agent *classes*, not instances
-    - A new agent instance is created per request execution
+    - Agents are registered by name with a lifecycle policy
+      (per_request, singleton or pool, see LIFECYCLES)
+    - Agents come from code (register), JSON manifests (load_manifest)
+      and installed packages (load_entry_points); classes are imported
+      lazily on first use, so list() never imports an agent
+    - Executions borrow an instance with checkout()/acheckout(), which
+      return pooled instances when the execution ends
+    - Singleton and pooled agents are built (and their async startup()
+      hook awaited) once per worker by startup(), called from the
+      FastAPI lifespan; shutdown() awaits their shutdown() hooks
+    - Without a lifespan (scripts, benchmarks) they are built lazily on
+      first use, startup() hook included; startup() only warms agents
+      registered with warmup=True
 
     In later phases, this can be extended to support:
     - Dependency injection
-    - Configuration-based agent loading
     - Tier-based agent availability rules
     """
 
     def __init__(self) -> None:
-        # Internal map: agent_name -> Agent class
-        self._agents: Dict[str, Type[BaseAgent]] = {}
+        # Internal map: agent_name -> registration (class + lifecycle)
+        self._agents: Dict[str, AgentRegistration] = {}
+        self._lock = threading.Lock()
+
+        # Bumped by every register() (ex: invalidates the precomputed
+        # GET /agents response)
+        self.version = 0
 
-    def register(self, name: str, agent_cls: Type[BaseAgent]) -> None:
+    def register(
+        self,
+        name: str,
+        agent_cls: Union[Type[BaseAgent], str],
+        lifecycle: str = PER_REQUEST,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        warmup: Optional[bool] = None,
+        source: str = "code",
+        timeout: Optional[float] = DEFAULT_TIMEOUT_SECONDS,
+        bulkhead: Optional[int] = DEFAULT_BULKHEAD,
+        execution: str = THREAD,
+    ) -> None:
         """
         Register an agent class under a specific name.
 
         Args:
             name: Public identifier used to reference the agent
-            agent_cls: The agent class (not an instance)
+            agent_cls: The agent class (not an instance), or a
+                "module:Class" target imported on first use
+            lifecycle: per_request (default), singleton or pool
+            pool_size: Maximum instances for lifecycle="pool"
+            warmup: Build singleton/pooled instances in startup()
+                (default: True for classes, False for lazy targets)
+            source: Where the registration came from (code, manifest,
+                entry_point); reported by stats()
+            timeout: Execution deadline in seconds (None or 0: unbounded);
+                requests may only shorten it (X-OperatorX-Deadline-Ms)
+            bulkhead: Worker threads dedicated to this agent's sync
+                executions (None: CoreEngine default)
+            execution: inline, thread (default) or process (see
+                EXECUTIONS); process agents must be importable by
+                target and are built in the worker processes
 
         Example:
-            registry.register("orchestrator", OrchestratorAgent)
+            registry.register("orchestrator", "app.agents.orchestrator:OrchestratorAgent",
+                              lifecycle="singleton")
+        """
+        if lifecycle not in LIFECYCLES:
+            raise ValueError(f"Unknown lifecycle: {lifecycle} (expected one of {', '.join(LIFECYCLES)})")
+        if lifecycle == POOL and pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+        if bulkhead is not None and bulkhead < 1:
+            raise ValueError("bulkhead must be >= 1")
+        if execution not in EXECUTIONS:
+            raise ValueError(f"Unknown execution: {execution} (expected one of {', '.join(EXECUTIONS)})")
+
+        if isinstance(agent_cls, str):
+            if ":" not in agent_cls:
+                raise ValueError(f"Agent target must look like 'module:Class': {agent_cls}")
+            target, loaded = agent_cls, None
+        else:
+            target, loaded = f"{agent_cls.__module__}:{agent_cls.__qualname__}", agent_cls
+
+        previous = self._agents.get(name)
+        if previous is not None and previous.target != target:
+            logger.warning(
+                "registry.agent_overridden agent=%s old=%s (%s) new=%s (%s)",
+                name, previous.target, previous.source, target, source,
+            )
+
+        self._agents[name] = AgentRegistration(
+            name=name,
+            target=target,
+            lifecycle=lifecycle,
+            pool_size=pool_size,
+            warmup=(loaded is not None) if warmup is None else warmup,
+            source=source,
+            agent_cls=loaded,
+            timeout=timeout,
+            bulkhead=bulkhead,
+            execution=execution,
+        )
+        self.version += 1
+
+    def load_manifest(self, path: Union[str, Path]) -> int:
+        """
+        Register every agent listed in a JSON manifest.
+
+        Format:
+            {"agents": {"<name>": {"class": "module:Class",
+                                   "lifecycle": "singleton",
+                                   "pool_size": 4,
+                                   "warmup": false,
+                                   "timeout_seconds": 30,
+                                   "bulkhead": 8,
+                                   "execution": "thread"}}}
+
+        Returns the number of agents registered.
+        """
+        with open(path, "r", encoding="utf-8") as handle:
+            manifest = json.load(handle)
+
+        agents = manifest.get("agents", {})
+        for name, entry in agents.items():
+            self.register(
+                name,
+                entry["class"],
+                lifecycle=entry.get("lifecycle", PER_REQUEST),
+                pool_size=entry.get("pool_size", DEFAULT_POOL_SIZE),
+                warmup=entry.get("warmup", False),
+                source="manifest",
+                timeout=entry.get("timeout_seconds", DEFAULT_TIMEOUT_SECONDS),
+                bulkhead=entry.get("bulkhead", DEFAULT_BULKHEAD),
+                execution=entry.get("execution", THREAD),
+            )
+        return len(agents)
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP) -> int:
+        """
+        Register agents exposed by installed packages (per_request).
+
+        Only package metadata is read; the agent modules are imported
+        on first use. Use a manifest to give them another lifecycle.
+
+        Returns the number of agents registered.
+        """
+        count = 0
+        for entry_point in entry_points(group=group):
+            self.register(entry_point.name, entry_point.value, source="entry_point")
+            count += 1
+        return count
+
+    def agent_class(self, name: str) -> Type[BaseAgent]:
         """
-        self._agents[name] = agent_cls
+        Class registered under name (imported on first use; no instance
+        is built).
+
+        Raises:
+            ValueError if the agent name is not registered, or the error
+            raised while importing it.
+        """
+        return self._registration(name).agent_cls
+
+    def timeout_for(self, name: str) -> Optional[float]:
+        """
+        Execution deadline of an agent in seconds (None: unbounded).
+        """
+        registration = self._agents.get(name)
+        return registration.timeout if registration is not None else None
+
+    def bulkhead_for(self, name: str) -> Optional[int]:
+        """
+        Bulkhead size of an agent (None: use the engine default).
+        """
+        registration = self._agents.get(name)
+        return registration.bulkhead if registration is not None else None
+
+    def execution_for(self, name: str) -> str:
+        """
+        Execution mode of an agent (see EXECUTIONS).
+        """
+        registration = self._agents.get(name)
+        return registration.execution if registration is not None else THREAD
+
+    def process_target(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        (target, lifecycle) of an execution="process" agent, None otherwise.
+        """
+        registration = self._agents.get(name)
+        if registration is None or registration.execution != PROCESS:
+            return None
+        return registration.target, registration.lifecycle
+
+    def process_agents(self) -> List[Tuple[str, str]]:
+        """
+        (target, lifecycle) of every execution="process" agent (imported
+        and, unless per_request, built by each worker process at start).
+        """
+        return [
+            (reg.target, reg.lifecycle)
+            for reg in self._agents.values()
+            if reg.execution == PROCESS
+        ]
 
     def get(self, name: str) -> BaseAgent:
         """
-        Retrieve and instantiate an agent by name.
+        Retrieve an agent instance by name.
 
         Returns:
-            A new instance of the requested agent.
+            A new instance (per_request) or the shared instance (singleton).
 
         Raises:
-            ValueError if the agent name is not registered.
+            ValueError if the agent name is not registered or is pooled
+            (pooled instances must be returned: use checkout()).
+            LoopRunningError if a singleton must be started from a
+            thread whose event loop is running (use alease()).
         """
-        if name not in self._agents:
-            raise ValueError(f"Unknown agent: {name}")
+        registration = self._registration(name)
+        if registration.lifecycle == POOL:
+            raise ValueError(f"Agent {name} is pooled: use registry.checkout()")
+        if registration.lifecycle == SINGLETON:
+            return self._singleton(registration)
 
         # Instantiate a fresh agent per execution
         # This avoids shared state across requests
-        return self._agents[name]()
+        return registration.agent_cls()
+
+    @contextmanager
+    def checkout(self, name: str) -> Iterator[BaseAgent]:
+        """
+        Borrow an instance for one execution (sync code / threads).
+
+        Starting a new singleton or pooled instance needs a thread without
+        a running event loop (LoopRunningError otherwise): from the loop,
+        use acheckout() / alease().
+        """
+        registration = self._registration(name)
+        if registration.pool is None:
+            yield self.get(name)
+            return
+
+        agent = registration.pool.checkout(lambda: self._build_sync(registration))
+        try:
+            yield agent
+        finally:
+            registration.pool.checkin(agent)
+
+    @asynccontextmanager
+    async def acheckout(self, name: str) -> AsyncIterator[BaseAgent]:
+        """
+        Borrow an instance for one execution (event loop; never blocks it).
+        """
+        agent, release = await self.alease(name)
+        try:
+            yield agent
+        finally:
+            release()
+
+    async def alease(self, name: str) -> Tuple[BaseAgent, Callable[[], None]]:
+        """
+        Borrow an instance and get the callable that returns it.
+
+        For callers whose use of the instance can outlive the coroutine
+        that borrowed it: work abandoned on a deadline may still be
+        running in a thread, so the instance is only returned once that
+        work ends (release() is thread-safe).
+        """
+        registration = self._registration(name)
+        if registration.lifecycle == PER_REQUEST:
+            return registration.agent_cls(), _nothing_to_release
+
+        if registration.lifecycle == SINGLETON:
+            agent = registration.instance
+            if agent is None:
+                agent = await self._abuild_singleton(registration)
+            return agent, _nothing_to_release
+
+        pool = registration.pool
+        agent = await pool.acheckout(lambda: self._build(registration))
+        return agent, functools.partial(pool.checkin, agent)
 
     def list(self) -> Dict[str, str]:
         """
@@ -69,19 +655,184 @@ class AgentRegistry:
             Dictionary mapping agent names to class names.
         Useful for discovery, debugging, and UI tooling.
         """
-        return {name: agent_cls.__name__ for name, agent_cls in self._agents.items()}
+        return {name: reg.class_name for name, reg in self._agents.items()}
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Lifecycle, origin and instance usage per agent.
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+        for name, reg in self._agents.items():
+            entry: Dict[str, Any] = {
+                "lifecycle": reg.lifecycle,
+                "source": reg.source,
+                "loaded": reg.loaded,
+                "timeout_seconds": reg.timeout,
+                "bulkhead": reg.bulkhead,
+                "execution": reg.execution,
+            }
+            if reg.lifecycle == SINGLETON:
+                entry["started"] = reg.instance is not None
+            if reg.pool is not None:
+                entry.update(reg.pool.stats())
+            stats[name] = entry
+        return stats
+
+    def import_report(self) -> List[Dict[str, Any]]:
+        """
+        Agents sorted by how long importing their class took (slowest
+        first), like `python -X importtime` but per agent.
+
+        Only agents loaded so far have a time; call load_all() first for
+        a complete report. Shared dependencies are charged to the first
+        agent that imported them.
+        """
+        rows = [
+            {
+                "agent": name,
+                "target": reg.target,
+                "source": reg.source,
+                "loaded": reg.loaded,
+                "import_ms": reg.import_ms,
+            }
+            for name, reg in self._agents.items()
+        ]
+        rows.sort(key=lambda row: row["import_ms"] or 0.0, reverse=True)
+        return rows
+
+    def load_all(self) -> Dict[str, str]:
+        """
+        Import every registered agent class (reports, validation).
+
+        Returns {name: error} for agents that failed to load.
+        """
+        errors: Dict[str, str] = {}
+        for name, reg in list(self._agents.items()):
+            try:
+                reg.agent_cls
+            except Exception as e:
+                errors[name] = f"{type(e).__name__}: {e}"
+        return errors
+
+    # --------------------------------------------------------
+    # Lifecycle (FastAPI lifespan)
+    # --------------------------------------------------------
+    async def startup(self) -> None:
+        """
+        Build and warm singleton and pooled agents registered with
+        warmup=True (once per worker); the rest load on first use.
+        Process agents are warmed by CoreEngine.start() in every worker
+        process instead.
+        """
+        for reg in list(self._agents.values()):
+            # Process agents are built in the worker processes instead
+            if not reg.warmup or reg.execution == PROCESS:
+                continue
+
+            if reg.lifecycle == SINGLETON and reg.instance is None:
+                await self._abuild_singleton(reg)
+
+            elif reg.lifecycle == POOL:
+                await reg.pool.fill(lambda: self._build(reg))
+
+    async def shutdown(self) -> None:
+        """
+        Await every built instance's shutdown() hook and forget them.
+
+        Errors are logged so one agent cannot block the others.
+        """
+        for reg in list(self._agents.values()):
+            instances: List[BaseAgent] = []
+            if reg.instance is not None:
+                instances.append(reg.instance)
+                reg.instance = None
+            if reg.pool is not None:
+                instances.extend(reg.pool.instances)
+                reg.pool = AgentPool(reg.pool_size)
+
+            for agent in instances:
+                try:
+                    await agent.shutdown()
+                except Exception:
+                    logger.exception("registry.shutdown failed agent=%s", reg.name)
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _registration(self, name: str) -> AgentRegistration:
+        registration = self._agents.get(name)
+        if registration is None:
+            raise ValueError(f"Unknown agent: {name}")
+        return registration
+
+    async def _build(self, reg: AgentRegistration) -> BaseAgent:
+        started = time.perf_counter()
+        agent = reg.agent_cls()
+        await agent.startup()
+        logger.info(
+            "registry.agent_started agent=%s lifecycle=%s duration_ms=%.1f",
+            reg.name, reg.lifecycle, (time.perf_counter() - started) * 1000,
+        )
+        return agent
+
+    def _build_sync(self, reg: AgentRegistration) -> BaseAgent:
+        return self._run_sync(reg, "started", lambda: self._build(reg))
+
+    @staticmethod
+    def _run_sync(reg: AgentRegistration, action: str, hook: Callable[[], Any]) -> Any:
+        # Sync callers need a thread without a running loop (same rule
+        # as CoreEngine.run_agent for async agents); checked before the
+        # coroutine is created so none is left unawaited
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(hook())
+        raise LoopRunningError(
+            f"Agent {reg.name} cannot be {action} by sync code on a running event loop: "
+            "use await registry.alease() / registry.acheckout(), or warmup=True"
+        )
+
+    async def _abuild_singleton(self, reg: AgentRegistration) -> BaseAgent:
+        # Built and warmed before it is published, so nobody uses a
+        # half-started instance; a concurrent cold start may build twice
+        # and the loser is shut down
+        agent = await self._build(reg)
+        with self._lock:
+            if reg.instance is None:
+                reg.instance = agent
+                return agent
+            winner = reg.instance
+        await agent.shutdown()
+        return winner
+
+    def _singleton(self, reg: AgentRegistration) -> BaseAgent:
+        agent = reg.instance
+        if agent is not None:
+            return agent
+
+        agent = self._build_sync(reg)
+        with self._lock:
+            if reg.instance is None:
+                reg.instance = agent
+                return agent
+            winner = reg.instance
+        self._run_sync(reg, "shut down", agent.shutdown)
+        return winner
 
 
 # ============================================================
 # Global Registry Initialization
 # ============================================================
-# Agents are registered at import time.
-# This keeps bootstrap simple and explicit during early phases.
+# Agents are discovered at import time without importing them:
+# 1. installed packages (entry point group "operatorx.agents")
+# 2. built-in manifest (app/agents/manifest.json)
+# 3. optional deployment manifest (OPERATORX_AGENT_MANIFEST)
+# Later sources override earlier ones with the same name.
 
 registry = AgentRegistry()
 
-# Core orchestration agent
-registry.register("orchestrator", OrchestratorAgent)
+registry.load_entry_points()
+registry.load_manifest(BUILTIN_MANIFEST)
 
-# Phase 3 domain agent (business-focused example)
-registry.register("deployment_reliability", DeploymentReliabilityAgent)
+if os.getenv(MANIFEST_ENV):
+    registry.load_manifest(os.environ[MANIFEST_ENV])
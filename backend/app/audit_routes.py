@@ -0,0 +1,56 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+
+# Hash-chained audit log fed by the Core Engine (audited tiers only)
+from app.core.audit import audit_log
+
+# Router grouping all audit endpoints
+router = APIRouter(prefix="/audit", tags=["audit"])
+
+# Lookups read segment files: the routes below are plain functions so
+# FastAPI runs them in its threadpool instead of on the event loop.
+
+
+@router.get("")
+def get_audit(
+    request_id: Optional[str] = Query(None, description="Entries of this request"),
+    since: Optional[float] = Query(None, description="Written at or after (epoch seconds)"),
+    until: Optional[float] = Query(None, description="Written at or before (epoch seconds)"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """
+    Committed audit entries of one request and/or a time range, oldest first.
+
+    Each entry carries the execution (tier, agent, input, output,
+    outcome, timings) plus seq, prev and hash (see /audit/verify).
+    """
+    if audit_log is None:
+        return {"ok": False, "error": "audit log disabled (OPERATORX_AUDIT=0)"}
+    if request_id is None and since is None and until is None:
+        return {"ok": False, "error": "pass request_id and/or since / until"}
+    return {"ok": True, "items": audit_log.find(request_id=request_id, since=since, until=until, limit=limit)}
+
+
+@router.get("/verify")
+def verify_audit():
+    """
+    Recompute the hash chain over every committed entry.
+
+    ok=false names the first entry that was modified, removed or
+    reordered (segment + line).
+    """
+    if audit_log is None:
+        return {"ok": False, "error": "audit log disabled (OPERATORX_AUDIT=0)"}
+    return audit_log.verify()
+
+
+@router.get("/stats")
+async def get_audit_stats():
+    """
+    Writer counters: pending entries, group commits (one fsync each),
+    records per commit, segments and rotations.
+    """
+    if audit_log is None:
+        return {"enabled": False}
+    return {"enabled": True, **audit_log.stats()}
@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from app.core.metrics import metrics
+from app.core.timing import span
+
+
+# ------------------------------------------------------------
+# Admission defaults
+# ------------------------------------------------------------
+# Executions running at once across every tier (per worker process).
+# Override with OPERATORX_ADMISSION_MAX_CONCURRENCY.
+DEFAULT_MAX_CONCURRENCY = 64
+
+# Retry-After bounds (seconds) sent with 429 / 503 responses
+MIN_RETRY_AFTER_SECONDS = 1
+MAX_RETRY_AFTER_SECONDS = 60
+
+# Smoothing factor of the per-tier execution time average (EWMA)
+_EWMA_ALPHA = 0.2
+
+# Waiter states (see _Waiter)
+_WAITING, _GRANTED, _ABANDONED = 0, 1, 2
+
+# AdmissionRejected.reason when the caller's budget ran out in the queue
+DEADLINE_REASON = "request deadline reached while queued"
+
+
+@dataclass(frozen=True)
+class AdmissionLimits:
+    """
+    Admission policy of one tier (deployments/<tier>/profile.json "admission").
+
+    - max_concurrency: executions of this tier running at once
+    - max_queue: executions waiting for a slot; past it requests are
+      rejected immediately (429)
+    - queue_timeout: seconds an execution may wait before it is
+      rejected (503)
+    - weight: share of freed slots when several tiers are waiting
+      (weight 4 gets 4x the slots of weight 1)
+    """
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    max_queue: int = 128
+    queue_timeout: float = 5.0
+    weight: float = 1.0
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "weight": self.weight,
+        }
+
+
+# Used for tiers whose profile has no "admission" section
+DEFAULT_ADMISSION_LIMITS = AdmissionLimits()
+
+
+def compile_limits(raw: Mapping[str, Any], where: str) -> AdmissionLimits:
+    """
+    Validate a profile "admission" object.
+
+    Raises:
+        ValueError if a field has the wrong type or range.
+    """
+    try:
+        limits = AdmissionLimits(
+            max_concurrency=int(raw.get("max_concurrency", DEFAULT_ADMISSION_LIMITS.max_concurrency)),
+            max_queue=int(raw.get("max_queue", DEFAULT_ADMISSION_LIMITS.max_queue)),
+            queue_timeout=float(raw.get("queue_timeout_seconds", DEFAULT_ADMISSION_LIMITS.queue_timeout)),
+            weight=float(raw.get("weight", DEFAULT_ADMISSION_LIMITS.weight)),
+        )
+    except (TypeError, ValueError):
+        raise ValueError(f"{where} must contain numbers") from None
+
+    if limits.max_concurrency < 1 or limits.max_queue < 0:
+        raise ValueError(f"{where}: max_concurrency must be >= 1 and max_queue >= 0")
+    if limits.queue_timeout < 0 or limits.weight <= 0:
+        raise ValueError(f"{where}: queue_timeout_seconds must be >= 0 and weight > 0")
+    return limits
+
+
+class AdmissionRejected(Exception):
+    """
+    An execution was not admitted (the tier is saturated).
+
+    - status_code 429: the tier queue is full (rejected without waiting)
+    - status_code 503: the execution waited queue_timeout without a slot,
+      or its request deadline passed while it was queued (reason
+      DEADLINE_REASON; the engine reports those as timeouts)
+    - retry_after: seconds a client should wait before retrying
+    """
+
+    def __init__(self, tier: str, status_code: int, reason: str, retry_after: int) -> None:
+        super().__init__(f"{tier} tier saturated: {reason} (retry after {retry_after}s)")
+        self.tier = tier
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("wake", "enqueued", "state")
+
+    def __init__(self, wake: Callable[[], None]) -> None:
+        self.wake = wake
+        self.enqueued = time.perf_counter()
+        self.state = _WAITING
+
+
+class _TierState:
+    """
+    Running count, FIFO queue and scheduling position of one tier.
+    """
+
+    __slots__ = ("running", "queue", "pass_", "admitted", "rejected", "timed_out", "avg_seconds")
+
+    def __init__(self) -> None:
+        self.running = 0
+        self.queue: Deque[_Waiter] = deque()
+        self.pass_ = 0.0
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.avg_seconds = 0.0
+
+
+class AdmissionController:
+    """
+    Per-tier admission control in front of agent executions.
+
+    Why this exists:
+    - Every tier shares one worker; without limits a flood of personal
+      traffic queues up in front of government requests that carry
+      human-in-the-loop SLAs
+    - Rejecting early (429 / 503 + Retry-After) is cheaper for everyone
+      than accepting work that will time out anyway
+
+    Behavior:
+    - An execution runs when its tier is under max_concurrency and the
+      worker is under max_concurrency (all tiers); otherwise it queues
+    - Freed slots go to waiting tiers by weighted-fair (stride)
+      scheduling: each grant advances the tier's pass by 1 / weight and
+      the waiting tier with the lowest pass goes next; FIFO within a tier
+    - Full queue -> AdmissionRejected(429); waiting longer than
+      queue_timeout, or than the caller's remaining budget (request
+      deadline) -> AdmissionRejected(503)
+    - Works for threads (admit) and coroutines (aadmit) alike
+
+    Limits come from the tier profiles (`limits` callback), so they are
+    tuned per deployment and follow profile hot reloads.
+    """
+
+    def __init__(
+        self,
+        limits: Callable[[str], AdmissionLimits],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        enabled: bool = True,
+    ) -> None:
+        self.limits = limits
+        self.max_concurrency = max_concurrency
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._tiers: Dict[str, _TierState] = {}
+        self._running = 0
+
+        # Pass of the last grant: tiers that start waiting begin here, so
+        # an idle tier cannot bank credit and then take every slot
+        self._vtime = 0.0
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+    @contextmanager
+    def admit(self, tier: str, budget: Optional[float] = None) -> Iterator[None]:
+        """
+        Blocking admission (threads and sync code).
+
+        budget: seconds the caller has left (request deadline); the queue
+        wait is min(queue_timeout, budget).
+
+        Raises:
+            AdmissionRejected when the tier is saturated.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        ready = threading.Event()
+        waiter = self._acquire_or_enqueue(tier, ready.set)
+        if waiter is not None:
+            wait, by_deadline = self._queue_wait(tier, budget)
+            with span("queue"):
+                ready.wait(wait)
+            self._settle(tier, waiter, by_deadline)
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(tier, time.perf_counter() - started)
+
+    @asynccontextmanager
+    async def aadmit(self, tier: str, budget: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Non-blocking admission for the event loop (budget: see admit).
+
+        Raises:
+            AdmissionRejected when the tier is saturated.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[None]" = loop.create_future()
+
+        def resolve() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        waiter = self._acquire_or_enqueue(tier, lambda: loop.call_soon_threadsafe(resolve))
+        if waiter is not None:
+            wait, by_deadline = self._queue_wait(tier, budget)
+            try:
+                with span("queue"):
+                    await asyncio.wait_for(future, wait)
+            except asyncio.TimeoutError:
+                pass
+            except asyncio.CancelledError:
+                # Client went away while queued: give back a slot that may
+                # have been granted meanwhile
+                if not self._abandon(tier, waiter):
+                    self.release(tier)
+                raise
+            self._settle(tier, waiter, by_deadline)
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(tier, time.perf_counter() - started)
+
+    def release(self, tier: str, seconds: Optional[float] = None) -> None:
+        """
+        Free a slot and hand it to the next waiter(s).
+
+        `seconds` (how long the slot was held) feeds the Retry-After
+        estimate; None for slots that were never used.
+        """
+        with self._lock:
+            state = self._tiers[tier]
+            state.running -= 1
+            self._running -= 1
+            if seconds is not None:
+                state.avg_seconds += _EWMA_ALPHA * (seconds - state.avg_seconds)
+            woken = self._dispatch_locked()
+        for waiter in woken:
+            waiter.wake()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            tiers = {
+                name: {
+                    "running": state.running,
+                    "queued": len(state.queue),
+                    "admitted": state.admitted,
+                    "rejected": state.rejected,
+                    "timed_out": state.timed_out,
+                    "avg_ms": round(state.avg_seconds * 1000, 3),
+                    **self.limits(name).describe(),
+                }
+                for name, state in sorted(self._tiers.items())
+            }
+            running = self._running
+
+        return {
+            "enabled": self.enabled,
+            "max_concurrency": self.max_concurrency,
+            "running": running,
+            "tiers": tiers,
+        }
+
+    def collect(self) -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        """
+        Scrape-time queue depth / running gauges (MetricsRegistry collector).
+        """
+        with self._lock:
+            samples = [
+                (name, len(state.queue), state.running)
+                for name, state in sorted(self._tiers.items())
+            ]
+        for name, queued, running in samples:
+            yield ("operatorx_admission_queue_depth", "gauge", "Executions waiting for an admission slot.", {"tier": name}, queued)
+        for name, queued, running in samples:
+            yield ("operatorx_admission_running", "gauge", "Executions holding an admission slot.", {"tier": name}, running)
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _acquire_or_enqueue(self, tier: str, wake: Callable[[], None]) -> Optional[_Waiter]:
+        """
+        Take a slot now (returns None) or join the tier queue.
+
+        Raises:
+            AdmissionRejected(429) when the tier queue is full.
+        """
+        limits = self.limits(tier)
+        with self._lock:
+            state = self._tiers.get(tier)
+            if state is None:
+                state = self._tiers[tier] = _TierState()
+
+            if (
+                not state.queue
+                and state.running < limits.max_concurrency
+                and self._running < self.max_concurrency
+            ):
+                self._grant_locked(state, limits)
+                admission_wait.observe(tier, value=0.0)
+                return None
+
+            if len(state.queue) >= limits.max_queue:
+                state.rejected += 1
+                retry_after = self._retry_after_locked(state, limits)
+                admission_rejections.inc(tier, "queue_full")
+                raise AdmissionRejected(tier, 429, "queue full", retry_after)
+
+            if not state.queue:
+                state.pass_ = max(state.pass_, self._vtime)
+            waiter = _Waiter(wake)
+            state.queue.append(waiter)
+            return waiter
+
+    def _queue_wait(self, tier: str, budget: Optional[float]) -> Tuple[float, bool]:
+        """
+        (seconds to wait for a slot, whether the caller's budget is
+        what limits the wait).
+        """
+        timeout = self.limits(tier).queue_timeout
+        if budget is not None and budget < timeout:
+            return max(0.0, budget), True
+        return timeout, False
+
+    def _settle(self, tier: str, waiter: _Waiter, by_deadline: bool = False) -> None:
+        """
+        After waiting: keep the granted slot or give up (503).
+        """
+        if not self._abandon(tier, waiter):
+            return
+
+        limits = self.limits(tier)
+        with self._lock:
+            state = self._tiers[tier]
+            state.timed_out += 1
+            retry_after = self._retry_after_locked(state, limits)
+        if by_deadline:
+            admission_rejections.inc(tier, "deadline")
+            raise AdmissionRejected(tier, 503, DEADLINE_REASON, retry_after)
+        admission_rejections.inc(tier, "timeout")
+        raise AdmissionRejected(tier, 503, "queue wait timed out", retry_after)
+
+    def _abandon(self, tier: str, waiter: _Waiter) -> bool:
+        """
+        Leave the queue. Returns True if the slot was never granted,
+        False if it was (the caller owns it).
+        """
+        with self._lock:
+            if waiter.state == _GRANTED:
+                return False
+            waiter.state = _ABANDONED
+            try:
+                self._tiers[tier].queue.remove(waiter)
+            except ValueError:
+                pass
+            return True
+
+    def _grant_locked(self, state: _TierState, limits: AdmissionLimits) -> None:
+        state.running += 1
+        state.admitted += 1
+        self._running += 1
+        self._vtime = state.pass_
+        state.pass_ += 1.0 / limits.weight
+
+    def _dispatch_locked(self) -> List[_Waiter]:
+        """
+        Grant freed slots: lowest pass among tiers that have waiters and
+        room under their own limit.
+        """
+        woken: List[_Waiter] = []
+        while self._running < self.max_concurrency:
+            best: Optional[str] = None
+            for name, state in self._tiers.items():
+                if state.queue and state.running < self.limits(name).max_concurrency:
+                    if best is None or state.pass_ < self._tiers[best].pass_:
+                        best = name
+            if best is None:
+                break
+
+            state = self._tiers[best]
+            waiter = state.queue.popleft()
+            waiter.state = _GRANTED
+            self._grant_locked(state, self.limits(best))
+            admission_wait.observe(best, value=time.perf_counter() - waiter.enqueued)
+            woken.append(waiter)
+        return woken
+
+    def _retry_after_locked(self, state: _TierState, limits: AdmissionLimits) -> int:
+        """
+        Seconds until the current queue should have drained.
+        """
+        estimate = state.avg_seconds * (len(state.queue) + 1) / limits.max_concurrency
+        return int(min(
+            MAX_RETRY_AFTER_SECONDS,
+            max(MIN_RETRY_AFTER_SECONDS, math.ceil(estimate)),
+        ))
+
+
+# ------------------------------------------------------------
+# Metrics
+# ------------------------------------------------------------
+admission_wait = metrics.histogram(
+    "operatorx_admission_wait_seconds",
+    "Time executions waited for an admission slot (0 when admitted immediately).",
+    ("tier",),
+)
+
+admission_rejections = metrics.counter(
+    "operatorx_admission_rejections_total",
+    "Executions rejected by admission control (queue_full -> 429, timeout / deadline -> 503).",
+    ("tier", "reason"),
+)
+
+
+# ------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------
+# OPERATORX_ADMISSION=0 disables admission control (every execution
+# runs immediately, as before)
+ADMISSION_ENABLED = os.getenv("OPERATORX_ADMISSION", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+MAX_CONCURRENCY = int(os.getenv("OPERATORX_ADMISSION_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
@@ -0,0 +1,602 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import struct
+import threading
+import time
+from typing import Any, Deque, Dict, IO, Iterable, List, Optional, Tuple
+
+from app.core.serialization import dumps, loads
+
+
+logger = logging.getLogger("operatorx.core.audit")
+
+
+# ------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------
+# OPERATORX_AUDIT=0 disables the audit log (tiers with "audit": true in
+# their profile are no longer recorded)
+AUDIT_ENABLED = os.getenv("OPERATORX_AUDIT", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# Directory holding the segments (created on first write)
+AUDIT_DIR = os.getenv("OPERATORX_AUDIT_DIR", "operatorx-audit")
+
+# A segment is sealed and a new one started past this size
+DEFAULT_SEGMENT_BYTES = int(os.getenv("OPERATORX_AUDIT_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+# Records written per fsync at most (group commit)
+DEFAULT_COMMIT_BATCH = 1024
+
+
+# ------------------------------------------------------------
+# File Layout
+# ------------------------------------------------------------
+# <dir>/segment-000001.log   one JSON object per line, append-only
+# <dir>/segment-000001.idx   one fixed-size entry per line of the .log
+#
+# Each line carries "prev" (hash of the previous line) and ends with
+# "hash": sha256(prev + line without its hash field). Editing, removing
+# or reordering any line breaks the chain from that line on (verify()).
+_SEGMENT = re.compile(r"^segment-(\d{6})\.log$")
+
+# Index entry: ts, request_id hash, offset, length
+_INDEX = struct.Struct("<dQQI")
+
+# Every line ends with this field (fixed size: hashes are 64 hex chars)
+_HASH_FIELD = b',"hash":"'
+_HASH_SUFFIX_SIZE = len(_HASH_FIELD) + 64 + len(b'"}\n')
+
+# "prev" of the first line ever written
+GENESIS = "0" * 64
+
+# Characters of repr(entry) kept when an entry cannot be encoded at all
+_UNENCODABLE_REPR = 4096
+
+# Fallback encoder: the stdlib one handles ints orjson rejects (> 64 bits);
+# NaN/Infinity still raise (loads() would not read them back)
+_FALLBACK_ENCODER = json.JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), default=str, allow_nan=False,
+)
+
+
+def _key_hash(request_id: str) -> int:
+    # Stable across processes (hash() is randomized per interpreter)
+    return int.from_bytes(hashlib.blake2b(request_id.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _chain(prev: str, body: bytes) -> str:
+    return hashlib.sha256(prev.encode("ascii") + body).hexdigest()
+
+
+def _split(line: bytes) -> Tuple[bytes, str]:
+    """
+    (hashed body, stored hash) of one line; the body is the line without
+    its trailing hash field, closed again.
+    """
+    body = line[:-_HASH_SUFFIX_SIZE] + b"}"
+    return body, line[-_HASH_SUFFIX_SIZE + len(_HASH_FIELD):-3].decode("ascii")
+
+
+class _Segment:
+    """
+    One .log/.idx pair and the time range it covers.
+    """
+    __slots__ = ("number", "path", "index_path", "first_ts", "last_ts")
+
+    def __init__(self, directory: str, number: int) -> None:
+        self.number = number
+        self.path = os.path.join(directory, f"segment-{number:06d}.log")
+        self.index_path = os.path.join(directory, f"segment-{number:06d}.idx")
+        self.first_ts: Optional[float] = None
+        self.last_ts: Optional[float] = None
+
+    def entries(self) -> List[Tuple[float, int, int, int]]:
+        """
+        Index entries (ts, request_id hash, offset, length); a torn last
+        entry is ignored.
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return []
+        return list(_INDEX.iter_unpack(raw[: len(raw) - len(raw) % _INDEX.size]))
+
+
+class AuditLog:
+    """
+    Append-only, hash-chained log of agent executions (tamper evidence).
+
+    Why this exists:
+    - Business (audit-friendly logging) and government (traceability)
+      tiers need a durable record of what ran, with which input and
+      output, that nobody can edit unnoticed
+    - An fsync per request would add milliseconds to every call
+
+    Behavior:
+    - append() only queues the entry (no serialization, no I/O); one
+      writer thread encodes, chains and writes everything queued, then
+      fsyncs once for the whole batch (group commit)
+    - Segments rotate past segment_bytes; each has a sidecar index
+      (time, request_id hash, offset) so find() reads only matching lines
+    - Every process start opens a new segment; the chain continues from
+      the last line already on disk (a torn last line is cut first)
+    - One writer per directory (flock); another process sharing the
+      directory writes its own chain under <dir>/worker-<pid>
+
+    Trade-offs:
+    - Entries become durable (and visible to find()) a few milliseconds
+      after append(); flush() waits for that
+    - Entries still queued when the process is killed (not stopped) are lost
+    - Inputs and outputs must not be mutated after append() (the engine
+      never does: outputs are shared with the result cache already)
+    - An entry no JSON encoder accepts is written as a quarantined record
+      (metadata + repr) rather than dropped; stats() counts them
+    """
+
+    def __init__(
+        self,
+        directory: str = AUDIT_DIR,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        commit_batch: int = DEFAULT_COMMIT_BATCH,
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = max(1, segment_bytes)
+        self.commit_batch = max(1, commit_batch)
+
+        # Write queue (deque append/popleft are thread-safe)
+        self._pending: Deque[Dict[str, Any]] = collections.deque()
+        self._append_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        # Durability waiters: flush() waits until _committed >= its target
+        self._commit = threading.Condition()
+        self._appended = 0
+        self._committed = 0
+
+        # Writer state (writer thread only, once opened)
+        self._lock_file: Optional[IO[bytes]] = None
+        self._segments: List[_Segment] = []
+        self._log: Optional[IO[bytes]] = None
+        self._index: Optional[IO[bytes]] = None
+        self._size = 0
+        self._seq = 0
+        self._prev = GENESIS
+
+        # Counters (exposed through stats())
+        self._commits = 0
+        self._rotations = 0
+        self._bytes_written = 0
+        self._errors = 0
+        self._unencodable = 0
+        self._corrupt = 0
+
+    # --------------------------------------------------------
+    # Write path (hot)
+    # --------------------------------------------------------
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Queue one execution entry (must include request_id); the writer
+        thread adds seq, ts (write time), prev and hash, and persists it.
+        """
+        if self._writer is None:
+            self.start()
+        with self._append_lock:
+            self._pending.append(entry)
+            self._appended += 1
+        self._wake.set()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every entry appended so far is on disk (fsynced).
+
+        Returns False on timeout.
+        """
+        target = self._appended
+        self._wake.set()
+        with self._commit:
+            return self._commit.wait_for(lambda: self._committed >= target, timeout)
+
+    # --------------------------------------------------------
+    # Read path
+    # --------------------------------------------------------
+    def find(
+        self,
+        request_id: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Committed entries of one request and/or a time range, oldest first.
+
+        Segments outside the time range are skipped; within a segment the
+        sidecar index is bisected by time and filtered by request_id hash,
+        so only matching lines are read from the .log.
+        """
+        key = _key_hash(request_id) if request_id is not None else None
+        found: List[Dict[str, Any]] = []
+        for segment in list(self._segments):
+            if since is not None and segment.last_ts is not None and segment.last_ts < since:
+                continue
+            if until is not None and segment.first_ts is not None and segment.first_ts > until:
+                break
+
+            entries = segment.entries()
+            start = 0
+            if since is not None:
+                start = bisect.bisect_left(entries, (since,))
+            matches = []
+            for ts, key_hash, offset, length in entries[start:]:
+                if until is not None and ts > until:
+                    break
+                if key is None or key_hash == key:
+                    matches.append((offset, length))
+            if not matches:
+                continue
+
+            with open(segment.path, "rb") as f:
+                for offset, length in matches:
+                    f.seek(offset)
+                    try:
+                        entry = loads(f.read(length))
+                    except ValueError:
+                        # Corrupted after it was indexed (verify() reports it)
+                        continue
+                    if request_id is None or entry.get("request_id") == request_id:
+                        found.append(entry)
+                        if len(found) >= limit:
+                            return found
+        return found
+
+    def verify(self) -> Dict[str, Any]:
+        """
+        Recompute the hash chain over every committed line.
+
+        Returns {"ok", "records", "segments"} plus, on the first broken
+        line, "error" with its segment, line number and reason.
+        """
+        segments = list(self._segments)
+        # Older segments may have been archived: only a log that still
+        # starts at segment 1 must start at GENESIS
+        prev: Optional[str] = GENESIS if segments and segments[0].number == 1 else None
+        records = 0
+        for segment in segments:
+            committed = self._committed_size(segment)
+            with open(segment.path, "rb") as f:
+                data = f.read(committed)
+            for number, line in enumerate(data.splitlines(keepends=True), start=1):
+                problem = self._check_line(line, prev)
+                if problem is not None:
+                    return {
+                        "ok": False,
+                        "records": records,
+                        "segments": len(segments),
+                        "error": {"segment": os.path.basename(segment.path), "line": number, "reason": problem},
+                    }
+                prev = _split(line)[1]
+                records += 1
+        return {"ok": True, "records": records, "segments": len(segments)}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "running": self._writer is not None and self._writer.is_alive(),
+            "segments": len(self._segments),
+            "pending": len(self._pending),
+            "records": self._seq,
+            "committed": self._committed,
+            "commits": self._commits,
+            "records_per_commit": round(self._committed / self._commits, 2) if self._commits else 0.0,
+            "rotations": self._rotations,
+            "bytes_written": self._bytes_written,
+            "errors": self._errors,
+            "unencodable": self._unencodable,
+            "corrupt_lines": self._corrupt,
+            "segment_bytes": self.segment_bytes,
+        }
+
+    def collect(self) -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        """
+        Scrape-time audit counters (MetricsRegistry collector).
+        """
+        yield ("operatorx_audit_records_total", "counter", "Audit entries written and fsynced.", {}, self._committed)
+        yield ("operatorx_audit_commits_total", "counter", "Group commits (one fsync each).", {}, self._commits)
+        yield ("operatorx_audit_pending", "gauge", "Audit entries waiting for the writer thread.", {}, len(self._pending))
+        yield ("operatorx_audit_errors_total", "counter", "Failed audit writes (retried).", {}, self._errors)
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self) -> None:
+        """
+        Open the directory and start the writer thread (idempotent;
+        append() starts it on first use).
+        """
+        with self._start_lock:
+            if self._writer is not None and self._writer.is_alive():
+                return
+            if self._log is None:
+                self._open()
+            self._stopping.clear()
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                name="operatorx-audit-writer",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def stop(self) -> None:
+        """
+        Commit everything queued, then stop the writer and close files.
+        """
+        with self._start_lock:
+            writer, self._writer = self._writer, None
+            if writer is not None:
+                self._stopping.set()
+                self._wake.set()
+                writer.join()
+            if self._pending and self._log is not None:
+                self._commit_pending()
+            for f in (self._log, self._index, self._lock_file):
+                if f is not None:
+                    f.close()
+            self._log = self._index = self._lock_file = None
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        lock_file = open(os.path.join(self.directory, "LOCK"), "ab")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # Another process owns this directory: keep a separate chain
+            lock_file.close()
+            self.directory = os.path.join(self.directory, f"worker-{os.getpid()}")
+            logger.warning("audit.directory_locked using=%s", self.directory)
+            return self._open()
+        self._lock_file = lock_file
+
+        numbers = sorted(
+            int(match.group(1))
+            for match in map(_SEGMENT.match, os.listdir(self.directory))
+            if match
+        )
+        self._segments = [_Segment(self.directory, number) for number in numbers]
+        if self._segments:
+            self._recover(self._segments[-1])
+        for segment in self._segments:
+            entries = segment.entries()
+            if entries:
+                segment.first_ts, segment.last_ts = entries[0][0], entries[-1][0]
+
+        self._start_segment(numbers[-1] + 1 if numbers else 1)
+
+    def _recover(self, segment: _Segment) -> None:
+        """
+        Cut a torn last line, re-index lines the index missed, and resume
+        the chain (seq, prev) from the last line of the newest segment.
+
+        A complete line that does not decode (corrupted on disk) is
+        logged and left in place unindexed: startup goes on, lookups
+        skip it and verify() reports it. The chain resumes from the last
+        line that still decodes.
+        """
+        with open(segment.path, "r+b") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                logger.warning("audit.recover truncated=%s segment=%s", len(data) - end, segment.path)
+                f.truncate(end)
+                data = data[:end]
+
+        lines = data.splitlines(keepends=True)
+        entries = segment.entries()
+        indexed_end = entries[-1][2] + entries[-1][3] if entries else 0
+        if indexed_end != end:
+            rebuilt = []
+            offset = 0
+            for line in lines:
+                try:
+                    entry = loads(line)
+                    rebuilt.append(_INDEX.pack(entry["ts"], _key_hash(str(entry.get("request_id") or "")), offset, len(line)))
+                except (ValueError, TypeError, KeyError, struct.error):
+                    self._corrupt += 1
+                    logger.error("audit.recover corrupt_line segment=%s offset=%s (not indexed)", segment.path, offset)
+                offset += len(line)
+            with open(segment.index_path, "wb") as f:
+                f.write(b"".join(rebuilt))
+                f.flush()
+                os.fsync(f.fileno())
+
+        for number, line in enumerate(reversed(lines)):
+            try:
+                seq, prev = loads(line)["seq"], _split(line)[1]
+            except (ValueError, TypeError, KeyError):
+                continue
+            if number:
+                logger.error("audit.recover resumed_before_corrupt_lines=%s segment=%s", number, segment.path)
+            self._seq, self._prev = seq, prev
+            break
+
+    def _start_segment(self, number: int) -> None:
+        for f in (self._log, self._index):
+            if f is not None:
+                f.close()
+        segment = _Segment(self.directory, number)
+        self._log = open(segment.path, "ab")
+        self._index = open(segment.index_path, "ab")
+        self._size = 0
+        self._segments.append(segment)
+
+        # Make the new files' directory entries durable too
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _run_writer(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            try:
+                while self._pending:
+                    self._commit_pending()
+            except Exception:
+                self._errors += 1
+                logger.exception("audit.writer commit failed")
+                # Entries were put back; retry shortly
+                self._stopping.wait(0.5)
+                self._wake.set()
+
+            if self._stopping.is_set():
+                return
+
+    def _commit_pending(self) -> None:
+        """
+        Write up to commit_batch queued entries, then fsync once.
+        """
+        segment = self._segments[-1]
+        batch: List[Dict[str, Any]] = []
+        lines: List[bytes] = []
+        index: List[bytes] = []
+        offset = self._size
+        seq, prev = self._seq, self._prev
+        ts = time.time()
+        while self._pending and len(batch) < self.commit_batch and offset < self.segment_bytes:
+            entry = self._pending.popleft()
+            batch.append(entry)
+            seq += 1
+            body = self._encode(seq, ts, entry, prev)
+            prev = _chain(prev, body)
+            line = body[:-1] + _HASH_FIELD + prev.encode("ascii") + b'"}\n'
+            lines.append(line)
+            index.append(_INDEX.pack(ts, _key_hash(str(entry.get("request_id") or "")), offset, len(line)))
+            offset += len(line)
+        if not batch:
+            return
+
+        # Data first, then the index: a crash in between leaves lines the
+        # index does not know yet, which _recover() re-indexes
+        try:
+            self._log.write(b"".join(lines))
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._index.write(b"".join(index))
+            self._index.flush()
+            os.fsync(self._index.fileno())
+        except BaseException:
+            # Requeue in order; the segment is sealed (it may hold part of
+            # the batch) and the chain resumes from what is on disk
+            self._pending.extendleft(reversed(batch))
+            self._reopen()
+            raise
+
+        if segment.first_ts is None:
+            segment.first_ts = ts
+        segment.last_ts = ts
+        taken = len(batch)
+        self._bytes_written += offset - self._size
+        self._size = offset
+        self._seq, self._prev = seq, prev
+        self._commits += 1
+        with self._commit:
+            self._committed += taken
+            self._commit.notify_all()
+
+        if self._size >= self.segment_bytes:
+            self._rotations += 1
+            self._start_segment(segment.number + 1)
+
+    def _encode(self, seq: int, ts: float, entry: Dict[str, Any], prev: str) -> bytes:
+        """
+        JSON body of one line (without its hash field).
+
+        Never raises: one bad entry must not fail (and requeue forever)
+        the batch it was popped with. Tried in order:
+        - the fast encoder (orjson when installed)
+        - the stdlib encoder (ints above 64 bits)
+        - a quarantined record: request_id, tier, agent and outcome kept,
+          the rest replaced by its truncated repr() under "unencodable"
+        """
+        record = {"seq": seq, "ts": ts, **entry, "prev": prev}
+        try:
+            return dumps(record)
+        except Exception:
+            pass
+        try:
+            return _FALLBACK_ENCODER.encode(record).encode("utf-8")
+        except Exception:
+            pass
+
+        self._unencodable += 1
+        try:
+            text = repr(entry)[:_UNENCODABLE_REPR]
+        except Exception:
+            text = f"<{type(entry).__name__}>"
+        logger.warning(
+            "audit.unencodable_entry",
+            extra={"request_id": str(entry.get("request_id")), "seq": seq},
+        )
+        quarantined: Dict[str, Any] = {"seq": seq, "ts": ts}
+        for key in ("request_id", "tier", "agent", "outcome"):
+            if key in entry:
+                quarantined[key] = str(entry[key])
+        quarantined["unencodable"] = text
+        quarantined["prev"] = prev
+        return dumps(quarantined)
+
+    def _reopen(self) -> None:
+        segment = self._segments[-1]
+        try:
+            self._log.close()
+            self._index.close()
+        except OSError:
+            pass
+        self._log = self._index = None
+        # Lines of the failed batch that did reach the disk stay in the
+        # chain (their entries are written again: at-least-once)
+        self._recover(segment)
+        self._rotations += 1
+        self._start_segment(segment.number + 1)
+
+    def _committed_size(self, segment: _Segment) -> int:
+        if segment is self._segments[-1]:
+            return self._size
+        return os.path.getsize(segment.path)
+
+    @staticmethod
+    def _check_line(line: bytes, prev: Optional[str]) -> Optional[str]:
+        if len(line) <= _HASH_SUFFIX_SIZE or not line.endswith(b'"}\n'):
+            return "malformed line"
+        body, stored = _split(line)
+        try:
+            entry = loads(body)
+        except ValueError:
+            return "malformed line"
+        if prev is not None and entry.get("prev") != prev:
+            return "prev does not match the previous line"
+        if _chain(entry.get("prev", ""), body) != stored:
+            return "hash mismatch (line modified)"
+        return None
+
+
+# ------------------------------------------------------------
+# Singleton (fed by CoreEngine, stopped by app.main)
+# ------------------------------------------------------------
+audit_log: Optional[AuditLog] = AuditLog() if AUDIT_ENABLED else None
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.serialization import dumps, loads
+
+
+# ------------------------------------------------------------
+# Cache defaults
+# ------------------------------------------------------------
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+DEFAULT_CACHE_TTL_SECONDS = 60.0
+
+
+def canonical_hash(value: Any) -> str:
+    """
+    Stable hash of a JSON-like value (key order does not matter).
+    """
+    canonical = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded LRU + TTL cache for deterministic agent outputs.
+
+    Why this exists:
+    - Dashboards repeat the same goals constantly
+    - Deterministic agents (pure functions of input + tier) do not need
+      to recompute them
+
+    Keys are (agent name, tier, hash of the canonical input); see
+    CoreEngine for how agents opt in.
+
+    Important:
+    - Entries hold the encoded output; every hit decodes its own copy,
+      so callers (pipeline outputs, batch items, memory records) may
+      keep or mutate what they get without changing later hits
+    - Outputs that cannot be encoded as JSON are not cached
+    - Safe to use from the event loop and executor threads
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        # key -> (expires_at, encoded output), least recently used first
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters (exposed through stats())
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @staticmethod
+    def make_key(agent_name: str, tier: str, canonical_input: Any) -> Tuple[str, str, str]:
+        """
+        Build a cache key from the agent name, tier and canonical input.
+        """
+        return (agent_name, tier, canonical_hash(canonical_input))
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh copy of the cached output, or None on a miss /
+        expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expires_at, output = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return loads(output)
+
+    def put(self, key: Tuple[str, str, str], output: Dict[str, Any]) -> None:
+        """
+        Store an output, evicting the least recently used entries if full.
+
+        The output is encoded now: changes the caller makes to it later
+        are not cached.
+        """
+        try:
+            encoded = dumps(output)
+        except (TypeError, ValueError):
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, encoded)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Drop every entry (counters are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss counters and occupancy.
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
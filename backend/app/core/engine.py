@@ -1,17 +1,71 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait as wait_futures
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import (
+    Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, ContextManager,
+    Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union,
+)
 
 # Context object that travels through the system (tier + request_id)
-from app.agents.base import AgentContext
+from app.agents.base import AgentContext, BaseAgent
 
-# Registry contains agent classes mapped by name (ex: "orchestrator")
-from app.agents.registry import registry
+# Registry maps agent names to classes + lifecycle (ex: "orchestrator")
+from app.agents.registry import INLINE, registry
 
 # Memory store (Phase 2: in-memory only)
-from app.core.memory import memory_store
+from app.core.memory import MemoryRecord, memory_store
+
+# Per-request Server-Timing spans (engine / agent / memory)
+from app.core.timing import span
+
+# Latency histograms + counters exposed on /metrics
+from app.core.metrics import agent_latency, agent_runs, agents_in_flight, metrics
+
+# Result cache for deterministic agents (opt-in per agent)
+from app.core.cache import ResultCache
+
+# Declarative tier behavior (log level per tier, hot reload)
+from app.core.profiles import tier_profiles
+
+# Per-tier admission control (limits come from the tier profiles)
+from app.core.admission import (
+    ADMISSION_ENABLED,
+    MAX_CONCURRENCY as ADMISSION_MAX_CONCURRENCY,
+    DEADLINE_REASON,
+    AdmissionController,
+    AdmissionRejected,
+)
+
+# Worker processes for CPU-bound agents (execution="process")
+from app.core.processes import (
+    PROCESS_WORKERS,
+    START_METHOD as PROCESS_START_METHOD,
+    AgentProcessPool,
+    unwrap as unwrap_outcome,
+)
+
+# Request coalescing (identical concurrent calls share one execution)
+from app.core.singleflight import COALESCING_ENABLED, SingleFlight
+
+# Hash-chained audit trail for tiers that require one (profile "audit")
+from app.core.audit import AuditLog, audit_log
+
+# Multi-agent pipelines (DAG spec validation + topological sort)
+from app.core.pipeline import (
+    CompiledPipeline,
+    PipelineSpecError,
+    build_node_input,
+    compile_pipeline,
+    pipeline_key,
+)
 
 
 # ------------------------------------------------------------
@@ -21,6 +75,68 @@ from app.core.memory import memory_store
 logger = logging.getLogger("operatorx.core.engine")
 
 
+# ------------------------------------------------------------
+# Executor defaults
+# ------------------------------------------------------------
+# Sync-only agents run on a bulkhead: worker threads dedicated to one
+# agent, so a slow or hung agent only exhausts its own threads. This
+# is the bulkhead size of agents registered without "bulkhead".
+DEFAULT_EXECUTOR_WORKERS = 16
+
+# How many items of a batch run at the same time (see arun_batch)
+DEFAULT_BATCH_CONCURRENCY = 16
+
+# How many compiled pipelines are kept (LRU)
+PIPELINE_CACHE_SIZE = 256
+
+# Marks the end of a sync generator iterated through the executor
+_STREAM_DONE = object()
+
+# Timeouts kept per MemoryRecord (data["timeouts"], oldest dropped)
+MAX_RECORDED_TIMEOUTS = 16
+
+
+# ------------------------------------------------------------
+# Deadlines
+# ------------------------------------------------------------
+class AgentTimeout(Exception):
+    """
+    An execution passed its deadline (agent timeout or request deadline).
+
+    Raised inside the engine only: callers get an ok=False EngineResult
+    whose error starts with "timeout:".
+    """
+
+    def __init__(self, agent: str, timeout: float) -> None:
+        self.agent = agent
+        self.timeout = timeout
+        if timeout > 0:
+            message = f"timeout: {agent} did not finish within {timeout * 1000:.0f} ms"
+        else:
+            message = f"timeout: request deadline passed before {agent} started"
+        super().__init__(message)
+
+
+def _when_done(running: Optional[Union[Future, "asyncio.Future[Any]"]], fn: Callable[[], None]) -> None:
+    """
+    Call fn() now, or once abandoned work (a thread or task still
+    running after its deadline) really ends.
+    """
+    if running is None or running.done():
+        fn()
+    else:
+        running.add_done_callback(lambda _: fn())
+
+
+def _discard_outcome(task: "asyncio.Future[Any]") -> None:
+    """
+    Retrieve the outcome of abandoned work nobody awaits anymore
+    (silences "exception was never retrieved").
+    """
+    if not task.cancelled():
+        task.exception()
+
+
 # ------------------------------------------------------------
 # Engine Result (structured output)
 # ------------------------------------------------------------
@@ -45,6 +161,67 @@ class EngineResult:
     # Human-readable error message when ok=False
     error: Optional[str] = None
 
+    # Result cache outcome: "hit", "miss", "coalesced" (shared another
+    # request's in-flight execution), or None when not cacheable
+    cache: Optional[str] = None
+
+    # Wall-clock time spent in the engine for this execution
+    duration_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain dict for serialization (shallow: the output is not copied,
+        unlike dataclasses.asdict).
+        """
+        return {
+            "agent": self.agent,
+            "request_id": self.request_id,
+            "tier": self.tier,
+            "output": self.output,
+            "ok": self.ok,
+            "error": self.error,
+            "cache": self.cache,
+            "duration_ms": self.duration_ms,
+        }
+
+
+@dataclass
+class PipelineResult:
+    """
+    Result container returned by CoreEngine.arun_pipeline.
+
+    - nodes: one EngineResult per node (skipped nodes are ok=False)
+    - outputs: outputs of the sink nodes (nothing depends on them)
+    - order: the topological order the pipeline was compiled to
+    """
+    request_id: Optional[str]
+    tier: str
+    nodes: Dict[str, EngineResult]
+    outputs: Dict[str, Dict[str, Any]]
+    order: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+    # True when every node succeeded
+    ok: bool = True
+
+    # Human-readable error message when ok=False
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Plain dict in the /agents/pipeline response shape (shallow).
+        """
+        return {
+            "request_id": self.request_id,
+            "tier": self.tier,
+            "ok": self.ok,
+            "error": self.error,
+            "order": self.order,
+            "elapsed_ms": self.elapsed_ms,
+            "outputs": self.outputs,
+            "nodes": {node_id: result.to_dict() for node_id, result in self.nodes.items()},
+        }
+
 
 # ------------------------------------------------------------
 # Core Engine
@@ -59,6 +236,41 @@ class CoreEngine:
     ✅ Apply consistent logging + error handling
     ✅ Store lightweight memory per request_id (debugging)
 
+    Execution paths:
+    - run_agent():  synchronous (scripts, sync callers)
+    - arun_agent(): async (route handlers); awaits arun() for async-native
+      agents and offloads sync-only agents to the agent's bulkhead
+
+    Admission control (app.core.admission): executions that miss the
+    result cache take a per-tier slot first; when the tier is saturated
+    the run/arun/astream calls raise AdmissionRejected (HTTP 429 / 503)
+    instead of returning a result. Batches and pipelines turn it into a
+    failed item / node.
+
+    Deadlines and bulkheads: every execution runs under its agent's
+    timeout (registry), shortened by the request deadline (ctx.deadline,
+    X-OperatorX-Deadline-Ms). On expiry async work is cancelled, the
+    engine stops waiting on threads, and the result is ok=False with a
+    "timeout: ..." error (recorded under data["timeouts"] in memory).
+    Sync work runs on the agent's own executor (bulkhead), so abandoned
+    threads only reduce that agent's capacity.
+
+    Coalescing (app.core.singleflight): identical concurrent arun_agent
+    calls of cacheable / coalesce agents share one execution; each
+    caller still gets its own EngineResult (cache="coalesced") and
+    MemoryRecord entry.
+
+    Execution modes (registry): sync agents run inline, on their
+    bulkhead (thread, default) or in the worker processes of
+    self.processes (process: CPU-bound agents, not limited by the GIL).
+    Outputs and errors of process agents come back as EngineResults like
+    any other; process agents do not stream incrementally (the whole
+    output is replayed as chunks).
+
+    Audit (app.core.audit): every execution on a tier whose profile sets
+    "audit" (input, output, outcome, timings) is appended to self.audit;
+    the append only queues the entry, a writer thread group-commits it.
+
     Later phases may add:
     - routing rules
     - policy enforcement
@@ -67,6 +279,108 @@ class CoreEngine:
     - persistence (Redis/Postgres/etc.)
     """
 
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        max_workers: int = DEFAULT_EXECUTOR_WORKERS,
+        result_cache: Optional[ResultCache] = None,
+        admission: Optional[AdmissionController] = None,
+        processes: Optional[AgentProcessPool] = None,
+        coalescer: Optional[SingleFlight] = None,
+        audit: Optional[AuditLog] = None,
+    ) -> None:
+        # Shared executor for every agent (None: one bulkhead per agent).
+        # Bulkheads are created lazily so importing the engine stays cheap.
+        self._executor = executor
+        self._max_workers = max_workers
+        self._bulkheads: Dict[str, ThreadPoolExecutor] = {}
+        self._bulkhead_lock = threading.Lock()
+
+        # Outputs of cacheable agents (None disables caching)
+        self.result_cache = result_cache
+
+        # Per-tier admission control (None admits everything)
+        self.admission = admission
+
+        # Shares identical concurrent executions (None disables coalescing)
+        self.coalescer = coalescer
+
+        # Audit trail for tiers with "audit" in their profile (None: off)
+        self.audit = audit
+
+        # Worker processes for execution="process" agents (started lazily,
+        # or warmed by start())
+        self.processes = processes if processes is not None else AgentProcessPool(
+            warm=registry.process_agents
+        )
+
+        # Compiled pipelines keyed by spec hash (validated + sorted once)
+        self._pipelines: "OrderedDict[str, CompiledPipeline]" = OrderedDict()
+
+    # --------------------------------------------------------
+    # Executor management
+    # --------------------------------------------------------
+    def bulkhead(self, agent_name: str) -> Executor:
+        """
+        Executor that runs an agent's sync work (its bulkhead).
+
+        Created on first use with the agent's registered "bulkhead" size
+        (DEFAULT_EXECUTOR_WORKERS otherwise); an executor given to the
+        constructor or set_executor() is shared by every agent instead.
+        """
+        if self._executor is not None:
+            return self._executor
+
+        bulkhead = self._bulkheads.get(agent_name)
+        if bulkhead is None:
+            with self._bulkhead_lock:
+                bulkhead = self._bulkheads.get(agent_name)
+                if bulkhead is None:
+                    bulkhead = ThreadPoolExecutor(
+                        max_workers=registry.bulkhead_for(agent_name) or self._max_workers,
+                        thread_name_prefix=f"operatorx-{agent_name}",
+                    )
+                    self._bulkheads[agent_name] = bulkhead
+        return bulkhead
+
+    def set_executor(self, executor: Optional[Executor]) -> None:
+        """
+        Run every agent's sync work on one executor (None restores the
+        per-agent bulkheads).
+
+        The caller keeps ownership of the executor (shutdown() will not
+        close it).
+        """
+        self.shutdown(wait=False)
+        self._executor = executor
+
+    async def start(self) -> None:
+        """
+        Start and warm the worker processes when process agents are
+        registered, and open the audit log when a tier is audited
+        (FastAPI lifespan startup).
+        """
+        await self.processes.start()
+        if self.audit is not None and any(tier_profiles.get(tier).audit for tier in tier_profiles.tiers()):
+            self.audit.start()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Release the engine-owned bulkheads and worker processes, and
+        commit queued audit entries (always waited for) (FastAPI lifespan
+        shutdown).
+        """
+        with self._bulkhead_lock:
+            bulkheads, self._bulkheads = self._bulkheads, {}
+        for bulkhead in bulkheads.values():
+            bulkhead.shutdown(wait=wait)
+        self.processes.shutdown(wait=wait)
+        if self.audit is not None:
+            self.audit.stop()
+
+    # --------------------------------------------------------
+    # Execution paths
+    # --------------------------------------------------------
     def run_agent(
         self,
         agent_name: str,
@@ -81,39 +395,622 @@ class CoreEngine:
             input_data: dict payload to send into the agent
             ctx: AgentContext (tier + request_id)
         """
+        started = time.perf_counter()
+        with span("engine"):
+            agent_cls, failure = self._prepare(agent_name, ctx)
+            if failure is not None:
+                return self._finish(failure, started, known=False)
+
+            # --------------------------------------------
+            # Run agent safely
+            # --------------------------------------------
+            agents_in_flight.inc(agent_name, ctx.tier)
+            outcome = None
+            try:
+                cache_key, cached = self._cache_lookup(agent_cls, agent_name, input_data, ctx)
+                if cached is not None:
+                    result = self._succeed(agent_name, cached, ctx, cache="hit")
+                else:
+                    with self._admit(ctx):
+                        output = self._execute(agent_cls, agent_name, input_data, ctx)
+                    result = self._succeed(agent_name, output, ctx, cache_key=cache_key)
+
+            except AdmissionRejected as e:
+                if e.reason != DEADLINE_REASON:
+                    raise
+                result, outcome = self._timed_out(AgentTimeout(agent_name, 0.0), ctx, started), "timeout"
+
+            except AgentTimeout as e:
+                result, outcome = self._timed_out(e, ctx, started), "timeout"
+
+            except Exception as e:
+                result = self._fail(agent_name, e, ctx)
+
+            finally:
+                agents_in_flight.dec(agent_name, ctx.tier)
+
+            return self._finish(result, started, outcome=outcome, input_data=input_data)
+
+    async def arun_agent(
+        self,
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+    ) -> EngineResult:
+        """
+        Async execution path (same contract as run_agent).
+
+        Async-native agents are awaited directly; sync-only agents run on
+        the agent's bulkhead so the event loop is never blocked.
+        """
+        started = time.perf_counter()
+        with span("engine"):
+            agent_cls, failure = self._prepare(agent_name, ctx)
+            if failure is not None:
+                return self._finish(failure, started, known=False)
+
+            # --------------------------------------------
+            # Run agent safely
+            # --------------------------------------------
+            agents_in_flight.inc(agent_name, ctx.tier)
+            outcome = None
+            try:
+                cache_key, cached = self._cache_lookup(agent_cls, agent_name, input_data, ctx)
+                if cached is not None:
+                    result = self._succeed(agent_name, cached, ctx, cache="hit")
+                else:
+                    key = self._coalesce_key(agent_cls, agent_name, input_data, ctx, cache_key)
+                    if key is None:
+                        output = await self._arun_admitted(agent_name, input_data, ctx)
+                        result = self._succeed(agent_name, output, ctx, cache_key=cache_key)
+                    else:
+                        output, shared = await self.coalescer.run(
+                            key, lambda: self._arun_admitted(agent_name, input_data, ctx, cache_key)
+                        )
+                        if shared:
+                            cache = "coalesced"
+                        else:
+                            cache = "miss" if cache_key is not None else None
+                        result = self._succeed(agent_name, output, ctx, cache=cache)
+
+            except AdmissionRejected as e:
+                if e.reason != DEADLINE_REASON:
+                    raise
+                result, outcome = self._timed_out(AgentTimeout(agent_name, 0.0), ctx, started), "timeout"
+
+            except AgentTimeout as e:
+                result, outcome = self._timed_out(e, ctx, started), "timeout"
+
+            except Exception as e:
+                result = self._fail(agent_name, e, ctx)
+
+            finally:
+                agents_in_flight.dec(agent_name, ctx.tier)
+
+            return self._finish(result, started, outcome=outcome, input_data=input_data)
+
+    async def astream_agent(
+        self,
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming execution path.
+
+        Yields events as the agent produces them:
+        - {"event": "chunk", "data": <item>} for every stream_field item
+          (or once with the full output for non-streaming agents)
+        - {"event": "done", "agent", "request_id", "tier", "ok", "error"}
+          exactly once at the end
+
+        Logging, error handling, caching, metrics and memory recording
+        match arun_agent; the recorded output is {stream_field: [items...]}.
+        """
+        started = time.perf_counter()
+        agent_cls, failure = self._prepare(agent_name, ctx)
+        if failure is not None:
+            yield self._done_event(self._finish(failure, started, known=False))
+            return
+
+        agents_in_flight.inc(agent_name, ctx.tier)
+        outcome = None
+        try:
+            cache_key, cached = self._cache_lookup(agent_cls, agent_name, input_data, ctx)
+            if cached is not None:
+                # Replay the cached output as if it was produced live
+                for item in self._stream_items(agent_cls, cached):
+                    yield {"event": "chunk", "data": item}
+                result = self._succeed(agent_name, cached, ctx, cache="hit")
+
+            elif agent_cls.streams() and registry.process_target(agent_name) is None:
+                items: List[Any] = []
+                async with self._aadmit(ctx):
+                    # One deadline for the whole stream (not per chunk)
+                    timeout = self._time_budget(agent_name, ctx)
+                    async for item in self._aiter_agent(agent_name, input_data, ctx, timeout):
+                        items.append(item)
+                        yield {"event": "chunk", "data": item}
+                result = self._succeed(
+                    agent_name, {agent_cls.stream_field: items}, ctx, cache_key=cache_key
+                )
+
+            else:
+                async with self._aadmit(ctx):
+                    output = await self._aexecute(agent_name, input_data, ctx)
+                for item in self._stream_items(agent_cls, output):
+                    yield {"event": "chunk", "data": item}
+                result = self._succeed(agent_name, output, ctx, cache_key=cache_key)
+
+        except AdmissionRejected as e:
+            if e.reason != DEADLINE_REASON:
+                raise
+            result, outcome = self._timed_out(AgentTimeout(agent_name, 0.0), ctx, started), "timeout"
+
+        except AgentTimeout as e:
+            result, outcome = self._timed_out(e, ctx, started), "timeout"
+
+        except Exception as e:
+            result = self._fail(agent_name, e, ctx)
+
+        finally:
+            agents_in_flight.dec(agent_name, ctx.tier)
+
+        yield self._done_event(self._finish(result, started, outcome=outcome, input_data=input_data))
+
+    def _execute(
+        self,
+        agent_cls: Type[BaseAgent],
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+    ) -> Dict[str, Any]:
+        """
+        Sync execution under the agent's deadline.
+
+        - Process agents: run in a worker process while this thread waits
+        - No deadline / execution="inline": run here, as a plain call
+        - Async-native agents: a private event loop in this thread (no
+          running loop here, e.g. a script or a threadpool worker); the
+          coroutine is cancelled at the deadline
+        - Sync-only agents: run on the agent's bulkhead while this thread
+          waits; at the deadline it stops waiting (a running thread
+          cannot be interrupted, it finishes run() on its own)
+        """
+        timeout = self._time_budget(agent_name, ctx)
+        target = registry.process_target(agent_name)
+        if target is not None:
+            future = self.processes.run(target, input_data, ctx, timeout)
+            with span("agent"):
+                wait_futures((future,), timeout=timeout)
+            if not future.done():
+                future.cancel()
+                raise AgentTimeout(agent_name, timeout)
+            return unwrap_outcome(future.result())
+
+        if timeout is None or agent_cls.is_async() or registry.execution_for(agent_name) == INLINE:
+            with registry.checkout(agent_name) as agent, span("agent"):
+                if agent.is_async():
+                    return asyncio.run(self._within(agent_name, agent.arun(input_data, ctx), timeout))
+                return agent.run(input_data, ctx)
+
+        # Checked out on the worker thread: a pooled instance goes back
+        # to the pool when run() really returns, not at the deadline
+        future = self.bulkhead(agent_name).submit(
+            self._run_checked_out, agent_name, input_data, ctx
+        )
+        with span("agent"):
+            wait_futures((future,), timeout=timeout)
+        if not future.done():
+            future.cancel()
+            raise AgentTimeout(agent_name, timeout)
+        return future.result()
+
+    @staticmethod
+    def _run_checked_out(
+        agent_name: str, input_data: Dict[str, Any], ctx: AgentContext
+    ) -> Dict[str, Any]:
+        with registry.checkout(agent_name) as agent:
+            return agent.run(input_data, ctx)
+
+    async def _arun_admitted(
+        self,
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+        cache_key: Optional[Tuple[str, str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Take an admission slot, then execute (the unit a coalesced flight
+        shares: followers neither queue nor hold a slot).
+
+        With a cache_key the output is cached before the flight lands, so
+        calls arriving right after it hit the cache instead of starting
+        a new flight.
+        """
+        async with self._aadmit(ctx):
+            output = await self._aexecute(agent_name, input_data, ctx)
+        if cache_key is not None and self.result_cache is not None:
+            self.result_cache.put(cache_key, output)
+        return output
+
+    async def _aexecute(
+        self, agent_name: str, input_data: Dict[str, Any], ctx: AgentContext
+    ) -> Dict[str, Any]:
+        """
+        Borrow an instance, then await arun() for async-native agents or
+        run run() on the agent's bulkhead, within the agent's deadline.
+
+        The instance is returned once the work really ends: a thread
+        abandoned at the deadline keeps its pooled instance until run()
+        returns. Process agents borrow no local instance: the worker
+        process builds its own.
+        """
+        target = registry.process_target(agent_name)
+        if target is not None:
+            timeout = self._time_budget(agent_name, ctx)
+            with span("agent"):
+                return await self._within(
+                    agent_name, self.processes.submit(target, input_data, ctx, timeout), timeout
+                )
+
+        agent, release = await registry.alease(agent_name)
+        running: Optional[Union[Future, "asyncio.Future[Any]"]] = None
+        try:
+            # After the lease: waiting for a pooled instance counts
+            # against the request deadline, not the agent timeout
+            timeout = self._time_budget(agent_name, ctx)
+            with span("agent"):
+                if agent.is_async():
+                    if timeout is None:
+                        return await agent.arun(input_data, ctx)
+                    running = asyncio.ensure_future(agent.arun(input_data, ctx))
+                    return await self._within(agent_name, running, timeout)
+
+                if registry.execution_for(agent_name) == INLINE:
+                    return agent.run(input_data, ctx)
+
+                running = self.bulkhead(agent_name).submit(agent.run, input_data, ctx)
+                return await self._within(agent_name, asyncio.wrap_future(running), timeout)
+        finally:
+            _when_done(running, release)
+
+    async def _aiter_agent(
+        self,
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate an agent's astream(), or its sync stream() through the
+        agent's bulkhead (one next() call at a time so the loop never
+        blocks), until `timeout` seconds from now.
+
+        The instance stays checked out until the stream (including a
+        next() call abandoned at the deadline) ends.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        async def step(work: Awaitable[Any]) -> Any:
+            if deadline is None:
+                return await work
+            try:
+                return await self._within(agent_name, work, deadline - time.monotonic())
+            except AgentTimeout:
+                # Report the stream's budget, not what was left of it
+                raise AgentTimeout(agent_name, timeout) from None
+
+        agent, release = await registry.alease(agent_name)
+        running: Optional[Union[Future, "asyncio.Future[Any]"]] = None
+        try:
+            if type(agent).astream is not BaseAgent.astream:
+                stream = agent.astream(input_data, ctx)
+                if deadline is None:
+                    async for item in stream:
+                        yield item
+                    return
 
+                while True:
+                    running = asyncio.ensure_future(stream.__anext__())
+                    try:
+                        item = await step(running)
+                    except StopAsyncIteration:
+                        return
+                    yield item
+
+            bulkhead = self.bulkhead(agent_name)
+            iterator = iter(agent.stream(input_data, ctx))
+            try:
+                while True:
+                    running = bulkhead.submit(next, iterator, _STREAM_DONE)
+                    item = await step(asyncio.wrap_future(running))
+                    if item is _STREAM_DONE:
+                        return
+                    yield item
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    # Never while a worker thread is inside next()
+                    _when_done(running, close)
+        finally:
+            _when_done(running, release)
+
+    async def _within(
+        self, agent_name: str, work: Awaitable[Any], timeout: Optional[float]
+    ) -> Any:
+        """
+        Await work (a coroutine or future) for at most `timeout` seconds.
+
+        On expiry the work is cancelled and AgentTimeout is raised right
+        away, without waiting for the cancellation to complete (an agent
+        that ignores it runs on unobserved).
+        """
+        if timeout is None:
+            return await work
+
+        task = asyncio.ensure_future(work)
+        try:
+            done, _ = await asyncio.wait((task,), timeout=timeout)
+        except BaseException:
+            # The caller was cancelled (ex: client disconnected)
+            task.cancel()
+            raise
+
+        if not done:
+            task.cancel()
+            task.add_done_callback(_discard_outcome)
+            raise AgentTimeout(agent_name, timeout)
+        return task.result()
+
+    @staticmethod
+    def _stream_items(agent_cls: Type[BaseAgent], output: Dict[str, Any]) -> List[Any]:
+        """
+        Split a complete output back into stream chunks.
+        """
+        if agent_cls.stream_field and agent_cls.stream_field in output:
+            return list(output[agent_cls.stream_field])
+        return [output]
+
+    @staticmethod
+    def _done_event(result: EngineResult) -> Dict[str, Any]:
+        """
+        Final stream event (everything in EngineResult except the output).
+        """
+        return {
+            "event": "done",
+            "agent": result.agent,
+            "request_id": result.request_id,
+            "tier": result.tier,
+            "ok": result.ok,
+            "error": result.error,
+            "cache": result.cache,
+            "duration_ms": result.duration_ms,
+        }
+
+    async def arun_batch(
+        self,
+        items: Sequence[Tuple[str, Dict[str, Any], AgentContext]],
+        concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[EngineResult]:
+        """
+        Run many (agent_name, input_data, ctx) items with bounded concurrency.
+
+        - Results are returned in the same order as items
+        - At most `concurrency` items execute at the same time
+        - A failing item produces an ok=False result; it never fails
+          the whole batch (items rejected by admission control included)
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(
+            agent_name: str, input_data: Dict[str, Any], ctx: AgentContext
+        ) -> EngineResult:
+            async with semaphore:
+                return await self.arun_agent(agent_name, input_data, ctx)
+
+        outcomes = await asyncio.gather(
+            *(run_one(*item) for item in items),
+            return_exceptions=True,
+        )
+
+        # arun_agent already converts agent errors into results; this only
+        # guards against failures outside the agent (memory, logging, ...)
+        results: List[EngineResult] = []
+        for (agent_name, _, ctx), outcome in zip(items, outcomes):
+            if isinstance(outcome, AdmissionRejected):
+                outcome = self._reject(agent_name, outcome, ctx)
+            elif isinstance(outcome, BaseException):
+                outcome = self._fail(agent_name, outcome, ctx)
+            results.append(outcome)
+
+        return results
+
+    # --------------------------------------------------------
+    # Pipelines (DAG of agents)
+    # --------------------------------------------------------
+    def compile_pipeline(self, spec: Mapping[str, Any]) -> CompiledPipeline:
+        """
+        Validate + topologically sort a pipeline spec (cached by spec hash).
+
+        Raises:
+            PipelineSpecError if the spec is invalid.
+        """
+        key = pipeline_key(spec)
+        compiled = self._pipelines.get(key)
+        if compiled is not None:
+            self._pipelines.move_to_end(key)
+            return compiled
+
+        compiled = compile_pipeline(spec, registry.list().keys())
+        self._pipelines[key] = compiled
+        if len(self._pipelines) > PIPELINE_CACHE_SIZE:
+            self._pipelines.popitem(last=False)
+        return compiled
+
+    async def arun_pipeline(
+        self,
+        spec: Mapping[str, Any],
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+    ) -> PipelineResult:
+        """
+        Run a DAG of agents.
+
+        Each node starts as soon as its own dependencies finish, so
+        independent nodes run concurrently and the pipeline costs its
+        critical path rather than the sum of all agent latencies.
+
+        - A failed node marks every downstream node as skipped
+        - Each node's output is recorded in the request MemoryRecord
+          under data["pipeline"]
+        """
+        started = time.perf_counter()
+
+        try:
+            compiled = self.compile_pipeline(spec)
+        except PipelineSpecError as e:
+            return PipelineResult(
+                request_id=ctx.request_id,
+                tier=ctx.tier,
+                nodes={},
+                outputs={},
+                ok=False,
+                error=str(e),
+            )
+
+        if ctx.request_id:
+            def start_pipeline(record: MemoryRecord) -> None:
+                record.data["pipeline"] = {"order": list(compiled.order), "nodes": {}}
+
+            memory_store.update(ctx.request_id, start_pipeline, tier=ctx.tier)
+
+        outputs: Dict[str, Dict[str, Any]] = {}
+
+        async def run_node(node_id: str, upstream: List[asyncio.Task]) -> EngineResult:
+            node = compiled.nodes[node_id]
+            upstream_results = await asyncio.gather(*upstream)
+
+            # upstream follows node.depends_on, so results map back to node ids
+            failed = [
+                dep for dep, upstream_result in zip(node.depends_on, upstream_results)
+                if not upstream_result.ok
+            ]
+            if failed:
+                result = EngineResult(
+                    agent=node.agent,
+                    request_id=ctx.request_id,
+                    tier=ctx.tier,
+                    output={},
+                    ok=False,
+                    error=f"skipped: upstream node failed ({', '.join(sorted(failed))})",
+                )
+            else:
+                try:
+                    node_input = build_node_input(node, input_data, outputs)
+                except PipelineSpecError as e:
+                    result = self._fail(node.agent, e, ctx)
+                else:
+                    try:
+                        result = await self.arun_agent(node.agent, node_input, ctx)
+                    except AdmissionRejected as e:
+                        result = self._reject(node.agent, e, ctx)
+
+            if result.ok:
+                outputs[node_id] = result.output
+            self._record_pipeline_node(node_id, result, ctx)
+            return result
+
+        # Tasks are created in topological order, so every dependency
+        # already has a task when its dependents are scheduled.
+        tasks: Dict[str, asyncio.Task] = {}
+        for node_id in compiled.order:
+            upstream = [tasks[dep] for dep in compiled.nodes[node_id].depends_on]
+            tasks[node_id] = asyncio.ensure_future(run_node(node_id, upstream))
+
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+        failed = [node_id for node_id, result in results.items() if not result.ok]
+
+        return PipelineResult(
+            request_id=ctx.request_id,
+            tier=ctx.tier,
+            nodes=results,
+            outputs={node_id: outputs[node_id] for node_id in compiled.sinks if node_id in outputs},
+            order=list(compiled.order),
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+            ok=not failed,
+            error=f"failed nodes: {', '.join(failed)}" if failed else None,
+        )
+
+    def _record_pipeline_node(
+        self, node_id: str, result: EngineResult, ctx: AgentContext
+    ) -> None:
+        """
+        Store one pipeline node's outcome in the request MemoryRecord.
+        """
+        if not ctx.request_id:
+            return
+
+        def remember(record: MemoryRecord) -> None:
+            pipeline = record.data.setdefault("pipeline", {"order": [], "nodes": {}})
+            pipeline["nodes"][node_id] = {
+                "agent": result.agent,
+                "ok": result.ok,
+                "output": result.output,
+                "error": result.error,
+            }
+
+        with span("memory"):
+            memory_store.update(ctx.request_id, remember)
+
+    # --------------------------------------------------------
+    # Shared steps
+    # --------------------------------------------------------
+    def _prepare(
+        self, agent_name: str, ctx: AgentContext
+    ) -> Tuple[Optional[Type[BaseAgent]], Optional[EngineResult]]:
+        """
+        Log start, ensure memory, and resolve the agent class.
+
+        Returns (agent_cls, None) on success or (None, EngineResult) when
+        the agent cannot be resolved. Instances are only borrowed from
+        the registry when the agent actually runs (not on cache hits).
+        """
         # --------------------------------------------
-        # Log execution start
+        # Log execution start (DEBUG; the INFO line is logged by _finish
+        # with the duration). Tier profile decides level + sampling
         # --------------------------------------------
-        logger.info(
-            "engine.run_agent start agent=%s tier=%s request_id=%s",
-            agent_name,
-            ctx.tier,
-            ctx.request_id,
-        )
+        if tier_profiles.get(ctx.tier).logs(logging.DEBUG, ctx.request_id):
+            logger.debug(
+                "engine.run_agent start",
+                extra={"agent": agent_name, "tier": ctx.tier, "request_id": ctx.request_id},
+            )
 
         # --------------------------------------------
         # Ensure memory exists for this request_id
         # --------------------------------------------
         # If middleware did not attach a request_id, we skip memory.
         if ctx.request_id:
-            memory_store.ensure(request_id=ctx.request_id, tier=ctx.tier)
+            with span("memory"):
+                memory_store.ensure(request_id=ctx.request_id, tier=ctx.tier)
 
         # --------------------------------------------
         # Resolve agent
         # --------------------------------------------
         try:
-            agent = registry.get(agent_name)
+            return registry.agent_class(agent_name), None
         except Exception as e:
             # Registry couldn't find the agent or failed to build it
             logger.warning(
-                "engine.run_agent unknown agent=%s tier=%s request_id=%s error=%s",
-                agent_name,
-                ctx.tier,
-                ctx.request_id,
-                str(e),
+                "engine.run_agent unknown",
+                extra={
+                    "agent": agent_name,
+                    "tier": ctx.tier,
+                    "request_id": ctx.request_id,
+                    "error": str(e),
+                },
             )
-            return EngineResult(
+            return None, EngineResult(
                 agent=agent_name,
                 request_id=ctx.request_id,
                 tier=ctx.tier,
@@ -122,55 +1019,323 @@ class CoreEngine:
                 error=str(e),
             )
 
-        # --------------------------------------------
-        # Run agent safely
-        # --------------------------------------------
-        try:
-            output = agent.run(input_data, ctx)
+    def _cache_lookup(
+        self,
+        agent_cls: Type[BaseAgent],
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+    ) -> Tuple[Optional[Tuple[str, str, str]], Optional[Dict[str, Any]]]:
+        """
+        Look up a cached output for cacheable agents.
+
+        Returns (cache_key, cached_output). cache_key is None when the
+        agent is not cacheable or caching is disabled.
+        """
+        if self.result_cache is None or not agent_cls.cacheable:
+            return None, None
+
+        cache_key = ResultCache.make_key(
+            agent_name, ctx.tier, agent_cls.canonical_input(input_data)
+        )
+        return cache_key, self.result_cache.get(cache_key)
+
+    def _coalesce_key(
+        self,
+        agent_cls: Type[BaseAgent],
+        agent_name: str,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+        cache_key: Optional[Tuple[str, str, str]],
+    ) -> Optional[Tuple[str, str, str]]:
+        """
+        Single-flight key (same shape as the result cache key), or None
+        when the agent does not opt in, coalescing is disabled, or the
+        request carries its own deadline (X-OperatorX-Deadline-Ms).
+
+        A shared execution runs under the leader's deadline only, so a
+        caller with a deadline of its own would either be cut short by
+        a leader's tighter one or wait past its own; it runs alone.
+        """
+        if self.coalescer is None or not (agent_cls.cacheable or agent_cls.coalesce):
+            return None
+        if ctx.deadline is not None:
+            return None
+        if cache_key is not None:
+            return cache_key
+        return ResultCache.make_key(agent_name, ctx.tier, agent_cls.canonical_input(input_data))
+
+    def _succeed(
+        self,
+        agent_name: str,
+        output: Dict[str, Any],
+        ctx: AgentContext,
+        cache_key: Optional[Tuple[str, str, str]] = None,
+        cache: Optional[str] = None,
+    ) -> EngineResult:
+        """
+        Build the result of a successful execution.
+
+        A fresh output with a cache_key is stored in the result cache
+        (reported as a "miss"). The output is recorded in memory by
+        _finish, together with the outcome and duration.
+        """
+        if cache_key is not None and self.result_cache is not None:
+            self.result_cache.put(cache_key, output)
+            cache = "miss"
+
+        return EngineResult(
+            agent=agent_name,
+            request_id=ctx.request_id,
+            tier=ctx.tier,
+            output=output,
+            ok=True,
+            cache=cache,
+        )
+
+    def _finish(
+        self,
+        result: EngineResult,
+        started: float,
+        known: bool = True,
+        outcome: Optional[str] = None,
+        input_data: Optional[Dict[str, Any]] = None,
+    ) -> EngineResult:
+        """
+        Attach timing to the result, record it in memory, record
+        latency/outcome metrics (outcome defaults to success / error),
+        audit it (tiers with "audit") and log the call.
+
+        Unknown agent names are counted under agent="unknown" so client
+        input cannot create unbounded metric series (and never recorded
+        in memory).
+        """
+        elapsed = time.perf_counter() - started
+        result.duration_ms = round(elapsed * 1000, 3)
 
-            # Store last output in memory for debugging (Phase 2)
-            if ctx.request_id:
-                record = memory_store.get(ctx.request_id)
-                if record:
-                    record.data["last_agent"] = agent_name
-                    record.data["last_output"] = output
-                    memory_store.upsert(record)
+        # Store the last execution in memory (debugging + /memory queries)
+        if known and result.request_id:
+            def remember(record: MemoryRecord) -> None:
+                # Interned: every record for an agent shares one name string
+                record.data["last_agent"] = sys.intern(result.agent)
+                record.data["last_output"] = result.output
+                record.data["last_ok"] = result.ok
+                record.data["last_error"] = result.error
+                record.data["last_duration_ms"] = result.duration_ms
 
+            with span("memory"):
+                memory_store.update(result.request_id, remember)
+
+        agent_label = result.agent if known else "unknown"
+        if outcome is None:
+            outcome = "success" if result.ok else "error"
+        agent_runs.inc(agent_label, result.tier, outcome)
+        if known:
+            agent_latency.observe(agent_label, result.tier, value=elapsed)
+
+        profile = tier_profiles.get(result.tier)
+
+        # Durable, hash-chained audit entry (queued: no I/O here)
+        if known and profile.audit and self.audit is not None:
+            self.audit.append({
+                "request_id": result.request_id,
+                "tier": result.tier,
+                "agent": result.agent,
+                "outcome": outcome,
+                "error": result.error,
+                "cache": result.cache,
+                "started_at": time.time() - elapsed,
+                "duration_ms": result.duration_ms,
+                "input": input_data,
+                "output": result.output,
+            })
+
+        # One INFO line per call (tier profile decides level + sampling)
+        if profile.logs(logging.INFO, result.request_id):
             logger.info(
-                "engine.run_agent success agent=%s tier=%s request_id=%s",
-                agent_name,
-                ctx.tier,
-                ctx.request_id,
+                "engine.run_agent",
+                extra={
+                    "agent": agent_label,
+                    "tier": result.tier,
+                    "request_id": result.request_id,
+                    "outcome": outcome,
+                    "cache": result.cache,
+                    "duration_ms": result.duration_ms,
+                },
             )
 
-            return EngineResult(
-                agent=agent_name,
-                request_id=ctx.request_id,
-                tier=ctx.tier,
-                output=output,
-                ok=True,
-            )
+        return result
 
-        except Exception as e:
-            # Agent crashed (bug / runtime exception)
-            logger.exception(
-                "engine.run_agent error agent=%s tier=%s request_id=%s",
-                agent_name,
-                ctx.tier,
-                ctx.request_id,
-            )
+    def _time_budget(self, agent_name: str, ctx: AgentContext) -> Optional[float]:
+        """
+        Seconds this execution may run: the agent's timeout, capped by
+        the request deadline (None: unbounded).
 
-            return EngineResult(
-                agent=agent_name,
-                request_id=ctx.request_id,
-                tier=ctx.tier,
-                output={},
-                ok=False,
-                error=str(e),
-            )
+        Raises AgentTimeout when the request deadline already passed
+        (ex: while the execution waited for admission).
+        """
+        timeout = registry.timeout_for(agent_name)
+        if ctx.deadline is not None:
+            remaining = ctx.deadline - time.monotonic()
+            if remaining <= 0:
+                raise AgentTimeout(agent_name, 0.0)
+            if timeout is None or remaining < timeout:
+                timeout = remaining
+        return timeout
+
+    def _timed_out(
+        self, error: AgentTimeout, ctx: AgentContext, started: float
+    ) -> EngineResult:
+        """
+        Log an execution abandoned at its deadline, record it in the
+        request MemoryRecord (data["timeouts"]) and build the error result.
+        """
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        logger.warning(
+            "engine.run_agent timeout",
+            extra={
+                "agent": error.agent,
+                "tier": ctx.tier,
+                "request_id": ctx.request_id,
+                "timeout_ms": round(error.timeout * 1000),
+                "elapsed_ms": elapsed_ms,
+            },
+        )
+
+        if ctx.request_id:
+            entry = {
+                "agent": error.agent,
+                "timeout_ms": round(error.timeout * 1000, 3),
+                "elapsed_ms": elapsed_ms,
+                "at": time.time(),
+            }
+
+            def remember(record: MemoryRecord) -> None:
+                timeouts = record.data.setdefault("timeouts", [])
+                timeouts.append(entry)
+                del timeouts[:-MAX_RECORDED_TIMEOUTS]
+
+            with span("memory"):
+                memory_store.update(ctx.request_id, remember)
+
+        return EngineResult(
+            agent=error.agent,
+            request_id=ctx.request_id,
+            tier=ctx.tier,
+            output={},
+            ok=False,
+            error=str(error),
+        )
+
+    def _admit(self, ctx: AgentContext) -> ContextManager[None]:
+        """
+        Admission slot for a sync execution (no-op without a controller).
+
+        The queue wait is capped by the request deadline; running out of
+        it raises AdmissionRejected(DEADLINE_REASON), reported by the
+        run/arun/astream paths as a timeout.
+        """
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.admit(ctx.tier, ctx.remaining())
+
+    def _aadmit(self, ctx: AgentContext) -> AsyncContextManager[None]:
+        """
+        Admission slot for an async execution (see _admit).
+        """
+        if self.admission is None:
+            return nullcontext()
+        return self.admission.aadmit(ctx.tier, ctx.remaining())
+
+    def _reject(
+        self, agent_name: str, rejected: AdmissionRejected, ctx: AgentContext
+    ) -> EngineResult:
+        """
+        Build the error result of an execution refused by admission
+        control (batch items / pipeline nodes; single runs raise).
+        """
+        agent_runs.inc(agent_name, ctx.tier, "rejected")
+        return EngineResult(
+            agent=agent_name,
+            request_id=ctx.request_id,
+            tier=ctx.tier,
+            output={},
+            ok=False,
+            error=str(rejected),
+        )
+
+    def _fail(
+        self, agent_name: str, error: Exception, ctx: AgentContext
+    ) -> EngineResult:
+        """
+        Log an agent crash and build the error result.
+        """
+        # Agent crashed (bug / runtime exception)
+        logger.error(
+            "engine.run_agent error",
+            extra={"agent": agent_name, "tier": ctx.tier, "request_id": ctx.request_id},
+            exc_info=error,
+        )
+
+        return EngineResult(
+            agent=agent_name,
+            request_id=ctx.request_id,
+            tier=ctx.tier,
+            output={},
+            ok=False,
+            error=str(error),
+        )
 
 
 # ------------------------------------------------------------
 # Singleton engine instance (simple for Phase 2)
 # ------------------------------------------------------------
-engine = CoreEngine()
+engine = CoreEngine(
+    result_cache=ResultCache(),
+    processes=AgentProcessPool(
+        warm=registry.process_agents,
+        workers=PROCESS_WORKERS,
+        start_method=PROCESS_START_METHOD,
+    ),
+    coalescer=SingleFlight() if COALESCING_ENABLED else None,
+    audit=audit_log,
+    admission=AdmissionController(
+        limits=lambda tier: tier_profiles.get(tier).admission,
+        max_concurrency=ADMISSION_MAX_CONCURRENCY,
+        enabled=ADMISSION_ENABLED,
+    ),
+)
+
+# Cached outputs embed tier behavior: drop them when profiles change
+tier_profiles.add_listener(engine.result_cache.clear)
+
+# Worker processes loaded the profiles once: replace them on change
+tier_profiles.add_listener(engine.processes.recycle)
+
+
+# ------------------------------------------------------------
+# Scrape-time metrics (memory store + result cache)
+# ------------------------------------------------------------
+def _collect_store_metrics():
+    """
+    Memory store and result cache sizes, read when /metrics is scraped.
+    """
+    stats = memory_store.stats()
+    yield ("operatorx_memory_records", "gauge", "Records held by the memory store.", {}, stats["records"])
+    yield ("operatorx_memory_bytes", "gauge", "Approximate bytes held by the memory store.", {}, stats["bytes"])
+    yield ("operatorx_memory_evictions_total", "counter", "Records evicted because the store was full.", {}, stats["evictions"])
+    yield ("operatorx_memory_expirations_total", "counter", "Records dropped because their TTL elapsed.", {}, stats["expirations"])
+
+    if engine.result_cache is not None:
+        cache = engine.result_cache.stats()
+        yield ("operatorx_result_cache_entries", "gauge", "Entries held by the result cache.", {}, cache["entries"])
+        yield ("operatorx_result_cache_lookups_total", "counter", "Result cache lookups by outcome.", {"outcome": "hit"}, cache["hits"])
+        yield ("operatorx_result_cache_lookups_total", "counter", "Result cache lookups by outcome.", {"outcome": "miss"}, cache["misses"])
+
+
+metrics.add_collector(_collect_store_metrics)
+metrics.add_collector(engine.admission.collect)
+if engine.coalescer is not None:
+    metrics.add_collector(engine.coalescer.collect)
+if engine.audit is not None:
+    metrics.add_collector(engine.audit.collect)
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.serialization import dumps
+
+
+# ------------------------------------------------------------
+# Cache-Control policies
+# ------------------------------------------------------------
+# Clients may keep the response but must revalidate every time (a 304
+# costs a dict lookup + a header comparison)
+REVALIDATE = "no-cache"
+
+# Same, but never stored by shared caches (varies per caller)
+REVALIDATE_PRIVATE = "private, no-cache"
+
+# Distinct keys remembered by PrecomputedResponses (ex: raw tier headers)
+MAX_PRECOMPUTED = 1024
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Strong ETag of an encoded body.
+    """
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def version_etag(version: Any) -> str:
+    """
+    Strong ETag from a version marker (ex: MemoryRecord.updated_at),
+    without encoding the body.
+    """
+    return f'"v{version!r}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match evaluation (weak comparison, RFC 9110 13.1.2).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(request: Request, etag: str, headers: Mapping[str, str]) -> Optional[Response]:
+    """
+    304 response when the client already has this representation, else None.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, **headers})
+    return None
+
+
+class PrecomputedResponses:
+    """
+    Encoded bodies + ETags of read-mostly GET endpoints.
+
+    Why this exists:
+    - /health, /meta, /tier and /agents are polled constantly by load
+      balancers and dashboards and return the same payload every time
+    - Rebuilding the dict and encoding it on every poll is wasted work
+
+    Behavior:
+    - get(key, version, build) returns the cached (body, etag) while the
+      version is unchanged (ex: AgentRegistry.version); a new version
+      rebuilds it once
+    - respond() answers If-None-Match with 304, else sends the bytes
+    - Keys are bounded (MAX_PRECOMPUTED); the oldest is dropped past it
+    """
+
+    def __init__(self, max_entries: int = MAX_PRECOMPUTED) -> None:
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[Hashable, bytes, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable, build: Callable[[], Any]) -> Tuple[bytes, str]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1], entry[2]
+
+        body = dumps(build())
+        etag = make_etag(body)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (version, body, etag)
+            if len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return body, etag
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        version: Hashable,
+        build: Callable[[], Any],
+        cache_control: str = REVALIDATE,
+        vary: Optional[str] = None,
+    ) -> Response:
+        body, etag = self.get(key, version, build)
+        headers = {"Cache-Control": cache_control}
+        if vary is not None:
+            headers["Vary"] = vary
+
+        unchanged = not_modified(request, etag, headers)
+        if unchanged is not None:
+            return unchanged
+        return Response(body, media_type="application/json", headers={"ETag": etag, **headers})
+
+
+# ------------------------------------------------------------
+# Singleton (shared by the GET routes)
+# ------------------------------------------------------------
+precomputed = PrecomputedResponses()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from app.core.metrics import metrics
+from app.core.serialization import dumps
+
+
+# ------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------
+# Output format: "json" (one object per line) or "text"
+LOG_FORMAT = os.getenv("OPERATORX_LOG_FORMAT", "json").strip().lower()
+
+# Root level; tier profiles can only lower verbosity below it per tier
+LOG_LEVEL = os.getenv("OPERATORX_LOG_LEVEL", "INFO").strip().upper()
+
+# Records waiting for the writer thread; when full, records are dropped
+# (counted) instead of blocking the request that logged them
+LOG_QUEUE_SIZE = int(os.getenv("OPERATORX_LOG_QUEUE_SIZE", "10000"))
+
+# Lines written per write() call at most
+LOG_BATCH_SIZE = int(os.getenv("OPERATORX_LOG_BATCH_SIZE", "256"))
+
+
+# Attributes every LogRecord has; anything else came from extra={...}
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+def _fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """
+    Structured fields passed with extra={...} (request_id, tier, agent, ...).
+    """
+    return {
+        key: value
+        for key, value in record.__dict__.items()
+        if key not in _RECORD_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One compact JSON object per record.
+
+    {"ts": ..., "level": ..., "logger": ..., "event": <message>, <extra fields>,
+     "exc": <traceback>}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        line: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        line.update(_fields(record))
+        if record.exc_info:
+            line["exc"] = self.formatException(record.exc_info)
+        return dumps(line).decode("utf-8")
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Human-readable lines (local development): the message followed by
+    the structured fields as key=value.
+    """
+
+    def __init__(self) -> None:
+        super().__init__("%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = _fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that does no work on the logging thread.
+
+    Why this exists:
+    - The stdlib QueueHandler formats the message (and the traceback)
+      before enqueueing, on the request path
+    - A full queue would block (or raise) in the request path
+
+    Behavior:
+    - Records are enqueued as they are; the writer thread formats them
+      (arguments must not be mutated after logging, the usual contract)
+    - When the queue is full the record is dropped and counted
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that buffers formatted lines and writes them in batches
+    (one write + flush per batch instead of per record).
+
+    Flushed when the batch is full and whenever the queue runs empty
+    (BatchingQueueListener), so lines are never held back while idle.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None, batch_size: int = LOG_BATCH_SIZE) -> None:
+        super().__init__(stream)
+        self.batch_size = max(1, batch_size)
+        self._pending: List[str] = []
+        self.batches = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._pending.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._pending and self.stream is not None:
+                lines, self._pending = self._pending, []
+                self.stream.write(self.terminator.join(lines) + self.terminator)
+                self.batches += 1
+            super().flush()
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers before waiting on an empty
+    queue (batched writes under load, immediate writes when idle).
+    """
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+class LogPipeline:
+    """
+    Root logging through a queue and a single writer thread.
+
+    Why this exists:
+    - logging.basicConfig writes every record to stderr on the thread
+      that logged it (formatting + blocking stream I/O in the request path)
+    - Log aggregation wants one JSON object per line with request_id,
+      tier, agent and duration as fields
+
+    Behavior:
+    - install() points the root logger at a DeferredQueueHandler; the
+      listener thread formats records and writes them in batches
+    - Per-tier verbosity and sampling are decided before a record is
+      built (TierProfile.logs), so skipped lines cost one comparison
+    - stop() drains the queue and flushes (app shutdown)
+    """
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        fmt: str = LOG_FORMAT,
+        level: str = LOG_LEVEL,
+        queue_size: int = LOG_QUEUE_SIZE,
+        batch_size: int = LOG_BATCH_SIZE,
+    ) -> None:
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=max(0, queue_size))
+        self.handler = DeferredQueueHandler(self.queue)
+        self.writer = BatchStreamHandler(stream if stream is not None else sys.stderr, batch_size)
+        self.writer.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        self.listener = BatchingQueueListener(self.queue, self.writer, respect_handler_level=True)
+        self.level = level
+        self.started_at: Optional[float] = None
+
+    def install(self) -> None:
+        """
+        Replace the root handlers with the queue handler and start the
+        writer thread (idempotent).
+        """
+        if self.started_at is not None:
+            return
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self.listener.start()
+        self.started_at = time.time()
+
+    def stop(self) -> None:
+        """
+        Write everything still queued, then stop the writer thread.
+        Records logged afterwards are written directly.
+        """
+        if self.started_at is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        self.listener.stop()
+        self.writer.flush()
+        root.addHandler(self.writer)
+        self.started_at = None
+
+    def collect(self) -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        """
+        Scrape-time logging counters (MetricsRegistry collector).
+        """
+        yield ("operatorx_log_dropped_total", "counter", "Log records dropped because the log queue was full.", {}, self.handler.dropped)
+        yield ("operatorx_log_queue_depth", "gauge", "Log records waiting for the writer thread.", {}, self.queue.qsize())
+
+
+# ------------------------------------------------------------
+# Singleton (installed by app.main)
+# ------------------------------------------------------------
+log_pipeline = LogPipeline()
+metrics.add_collector(log_pipeline.collect)
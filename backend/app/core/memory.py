@@ -1,11 +1,88 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import logging
+import os
+import sys
+import threading
 import time
-from dataclasses import dataclass, field
-from typing import Any, Dict, Optional
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.serialization import dumps, loads
+
+
+logger = logging.getLogger("operatorx.core.memory")
+
+
+# ------------------------------------------------------------
+# Store Limits (defaults)
+# ------------------------------------------------------------
+# Records expire this many seconds after their last update.
+# Personal deployments are privacy-first, so they keep memory the
+# shortest; government deployments keep it longest for traceability.
+DEFAULT_TIER_TTLS: Dict[str, float] = {
+    "personal": 15 * 60,
+    "business": 60 * 60,
+    "government": 4 * 60 * 60,
+}
+
+# TTL used for tiers that are not listed above
+DEFAULT_TTL_SECONDS: float = 15 * 60
+
+# Upper bounds before least-recently-used records are evicted
+DEFAULT_MAX_RECORDS: int = 100_000
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+# How often the background sweeper drops expired records
+DEFAULT_SWEEP_INTERVAL_SECONDS: float = 30.0
+
+# Number of lock stripes (independent slices) in the store
+DEFAULT_SHARDS: int = 16
+
+# Payload keys stored as encoded JSON bytes when compaction is enabled
+# (agent outputs are the bulk of every record)
+PACKED_KEYS: Tuple[str, ...] = ("last_output",)
+
+# Opt-in: OPERATORX_MEMORY_COMPACT=1 packs PACKED_KEYS in InMemoryStore
+COMPACT_RECORDS = os.getenv("OPERATORX_MEMORY_COMPACT", "").strip().lower() in {"1", "true", "yes", "on"}
+
+# Query page sizes (see InMemoryStore.query)
+DEFAULT_QUERY_LIMIT: int = 50
+MAX_QUERY_LIMIT: int = 500
+
+# Index entries a query may inspect per shard and per returned record
+# before it returns a partial page (with a cursor to continue)
+QUERY_SCAN_FACTOR: int = 20
+
+
+# ------------------------------------------------------------
+# Query cursors
+# ------------------------------------------------------------
+# Position in the time-ordered indexes: (stamp, shard, seq). Queries
+# return records strictly older than the cursor, newest first.
+Cursor = Tuple[float, int, int]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    stamp, shard, seq = cursor
+    return f"{stamp!r}:{shard}:{seq}"
+
+
+def decode_cursor(value: str) -> Cursor:
+    """
+    Parse a cursor returned by a previous query.
+
+    Raises:
+        ValueError if the cursor is malformed.
+    """
+    stamp, shard, seq = value.split(":")
+    return float(stamp), int(shard), int(seq)
 
 
-@dataclass
 class MemoryRecord:
     """
     Represents request-scoped memory for OperatorX AI.
@@ -18,78 +95,933 @@ class MemoryRecord:
     Important:
     - This is NOT long-term memory yet
     - This is a lightweight foundation to support later phases
+
+    Compact representation:
+    - __slots__ (no per-record __dict__) and an interned tier string
+    - Large values (PACKED_KEYS, ex: last_output) can be moved out of
+      `data` into `packed` as encoded JSON bytes (see pack()); they are
+      decoded only when read (value() / payload())
+    - `size` is the approximate resident size, set by the store
+    - `seq` identifies the latest store of the record in the query
+      indexes (older index entries with another seq are stale)
+    """
+
+    __slots__ = ("request_id", "tier", "created_at", "updated_at", "data", "packed", "size", "seq")
+
+    def __init__(
+        self,
+        request_id: str,
+        tier: str,
+        created_at: Optional[float] = None,
+        updated_at: Optional[float] = None,
+        data: Optional[Dict[str, Any]] = None,
+        packed: Optional[Dict[str, bytes]] = None,
+    ) -> None:
+        now = time.time()
+
+        # Unique request identifier (comes from RequestIdMiddleware)
+        self.request_id = request_id
+
+        # Deployment tier for this request (personal/business/government)
+        self.tier = sys.intern(tier)
+
+        # Creation/update timestamps for debugging + future audit usefulness
+        self.created_at = now if created_at is None else created_at
+        self.updated_at = now if updated_at is None else updated_at
+
+        # Arbitrary structured memory payload
+        # Example future keys: last_agent, last_output, errors, metrics, etc.
+        self.data: Dict[str, Any] = {} if data is None else data
+
+        # Packed payload values: key -> encoded JSON (None until used)
+        self.packed: Optional[Dict[str, bytes]] = packed
+
+        # Approximate resident bytes + index position (maintained by InMemoryStore)
+        self.size = 0
+        self.seq = 0
+
+    def pack(self, keys: Tuple[str, ...] = PACKED_KEYS) -> None:
+        """
+        Move `keys` from data into packed (encoded once, read lazily).
+
+        A value written to data again replaces the packed copy.
+        """
+        for key in keys:
+            if key in self.data:
+                if self.packed is None:
+                    self.packed = {}
+                self.packed[key] = dumps(self.data.pop(key))
+
+    def value(self, key: str, default: Any = None) -> Any:
+        """
+        Read one payload value, decoding it if it is packed.
+        """
+        if key in self.data:
+            return self.data[key]
+        if self.packed and key in self.packed:
+            return loads(self.packed[key])
+        return default
+
+    def payload(self) -> Dict[str, Any]:
+        """
+        Full payload (data + decoded packed values) as a new dict.
+        """
+        if not self.packed:
+            return dict(self.data)
+        merged = dict(self.data)
+        for key, encoded in self.packed.items():
+            merged.setdefault(key, loads(encoded))
+        return merged
+
+    def payload_json(self) -> bytes:
+        """
+        Payload encoded as a JSON object; packed values are spliced in
+        as-is (never decoded and re-encoded).
+        """
+        encoded = dumps(self.data)
+        packed = [
+            dumps(key) + b":" + value
+            for key, value in (self.packed or {}).items()
+            if key not in self.data
+        ]
+        if not packed:
+            return encoded
+        body = b",".join(packed)
+        if encoded == b"{}":
+            return b"{" + body + b"}"
+        return encoded[:-1] + b"," + body + b"}"
+
+    def __repr__(self) -> str:
+        return (
+            f"MemoryRecord(request_id={self.request_id!r}, tier={self.tier!r}, "
+            f"created_at={self.created_at!r}, updated_at={self.updated_at!r}, "
+            f"data={self.data!r}, packed={sorted(self.packed or ())!r})"
+        )
+
+
+def approx_size(obj: Any, _depth: int = 0) -> int:
+    """
+    Cheap, approximate deep size of a JSON-like value in bytes.
+
+    This is not exact accounting (shared objects are counted twice,
+    interpreter overhead is ignored); it only needs to be stable enough
+    to enforce a byte budget on the store.
+    """
+    size = sys.getsizeof(obj)
+    if _depth > 16:
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += approx_size(key, _depth + 1) + approx_size(value, _depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += approx_size(item, _depth + 1)
+
+    return size
+
+
+def record_size(record: MemoryRecord) -> int:
+    """
+    Approximate resident size of a MemoryRecord (object + payload).
+
+    The tier is interned (shared by every record) so it is not counted;
+    packed values count as their encoded bytes.
+    """
+    size = (
+        sys.getsizeof(record)
+        + sys.getsizeof(record.request_id)
+        + approx_size(record.data)
+    )
+    if record.packed:
+        size += sys.getsizeof(record.packed) + sum(
+            sys.getsizeof(value) for value in record.packed.values()
+        )
+    return size
+
+
+def packed_size(record: MemoryRecord) -> int:
+    """
+    Encoded bytes held in record.packed.
+    """
+    if not record.packed:
+        return 0
+    return sum(len(value) for value in record.packed.values())
+
+
+def record_fields(record: MemoryRecord) -> Dict[str, Any]:
+    """
+    Public fields of a record, in /memory response order (shallow).
+    """
+    return {
+        "request_id": record.request_id,
+        "tier": record.tier,
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+        "data": record.payload(),
+    }
+
+
+def record_summary(record: MemoryRecord) -> Dict[str, Any]:
+    """
+    Execution outcome of a record (no payload), as listed by queries.
+    """
+    data = record.data
+    return {
+        "request_id": record.request_id,
+        "tier": record.tier,
+        "agent": data.get("last_agent"),
+        "ok": data.get("last_ok"),
+        "error": data.get("last_error"),
+        "duration_ms": data.get("last_duration_ms"),
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+    }
+
+
+def record_json(record: MemoryRecord) -> bytes:
+    """
+    record_fields(record) encoded as JSON, without decoding packed values.
+    """
+    head = dumps({
+        "request_id": record.request_id,
+        "tier": record.tier,
+        "created_at": record.created_at,
+        "updated_at": record.updated_at,
+    })
+    return head[:-1] + b',"data":' + record.payload_json() + b"}"
+
+
+class MemoryStore(ABC):
+    """
+    Interface every memory backend implements.
+
+    The engine and routes only use these methods, so backends can be
+    swapped (see create_memory_store) without touching the API layer.
+
+    Backends:
+    - InMemoryStore: per-process, bounded (default)
+    - SQLiteMemoryStore: shared by every worker on a host (app.core.sqlite_store)
+    - MmapMemoryStore: shared memory-mapped file, no database (app.core.mmap_store)
+    """
+
+    # Background sweeper task (see start_sweeper)
+    _sweeper: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    def get(self, request_id: str) -> Optional[MemoryRecord]:
+        """Fetch a record (None if missing or expired)."""
+
+    @abstractmethod
+    def upsert(self, record: MemoryRecord) -> MemoryRecord:
+        """Insert or replace a record."""
+
+    @abstractmethod
+    def get_or_create(self, request_id: str, tier: str) -> MemoryRecord:
+        """Atomically return the record, creating it if needed."""
+
+    @abstractmethod
+    def update(
+        self,
+        request_id: str,
+        fn: Callable[[MemoryRecord], None],
+        tier: Optional[str] = None,
+    ) -> Optional[MemoryRecord]:
+        """Atomically apply fn(record) and store the result."""
+
+    @abstractmethod
+    def snapshot(self, request_id: str) -> Optional[MemoryRecord]:
+        """Copy of a record that is safe to serialize."""
+
+    @abstractmethod
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop expired records; returns how many were removed."""
+
+    def snapshot_json(self, request_id: str) -> Optional[bytes]:
+        """
+        The record encoded as a JSON object (request_id, tier,
+        created_at, updated_at, data), or None if missing.
+
+        Backends override this when they can encode without copying.
+        """
+        record = self.snapshot(request_id)
+        if record is None:
+            return None
+        return record_json(record)
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Counters and sizes for /memory/stats and /metrics."""
+
+    def query(
+        self,
+        tier: Optional[str] = None,
+        agent: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = DEFAULT_QUERY_LIMIT,
+        cursor: Optional[Cursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Find executions, newest first (see InMemoryStore.query).
+
+        Raises:
+            NotImplementedError if the backend has no query indexes.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support memory queries"
+        )
+
+    def ensure(self, request_id: str, tier: str) -> MemoryRecord:
+        """
+        Ensure a record exists for this request_id.
+
+        If it exists, return it.
+        If it does not exist, create it and store it.
+        """
+        return self.get_or_create(request_id, tier)
+
+    # --------------------------------------------------------
+    # Lifecycle (FastAPI lifespan)
+    # --------------------------------------------------------
+    def start(self) -> None:
+        """
+        Start background work on the running event loop.
+        """
+        self.start_sweeper()
+
+    async def stop(self) -> None:
+        """
+        Stop background work (and flush pending writes, if any).
+        """
+        await self.stop_sweeper()
+
+    # --------------------------------------------------------
+    # Background sweeper
+    # --------------------------------------------------------
+    async def run_sweeper(
+        self, interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS
+    ) -> None:
+        """
+        Periodically drop expired records until cancelled.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = self.sweep()
+            except Exception:
+                logger.exception("memory.sweep failed")
+                continue
+
+            if removed:
+                logger.debug("memory.sweep removed=%s", removed)
+
+    def start_sweeper(
+        self, interval: float = DEFAULT_SWEEP_INTERVAL_SECONDS
+    ) -> asyncio.Task:
+        """
+        Start the sweeper on the running event loop (FastAPI lifespan).
+        """
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self.run_sweeper(interval))
+        return self._sweeper
+
+    async def stop_sweeper(self) -> None:
+        """
+        Cancel the sweeper started by start_sweeper (if any).
+        """
+        task, self._sweeper = self._sweeper, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+class _Shard:
     """
-    # Unique request identifier (comes from RequestIdMiddleware)
-    request_id: str
+    One lock-protected slice of the store (see InMemoryStore).
 
-    # Deployment tier for this request (personal/business/government)
-    tier: str
+    Records are ordered from least to most recently used.
+
+    Query indexes map (field, value) -> [(stamp, seq, request_id), ...]
+    in store order. Stamps never decrease within a shard, so time ranges
+    are found with bisect. Entries whose seq no longer matches the
+    record are stale and are dropped by compact_index().
+    """
+
+    __slots__ = (
+        "lock", "records", "bytes", "packed_bytes",
+        "hits", "misses", "evictions", "expirations",
+        "index", "index_entries", "seq", "stamp",
+    )
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.records: "OrderedDict[str, MemoryRecord]" = OrderedDict()
+        self.bytes = 0
+        self.packed_bytes = 0
+        self.index: Dict[Tuple[str, str], List[Tuple[float, int, str]]] = {}
+        self.index_entries = 0
+        self.seq = 0
+        self.stamp = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def remove(self, request_id: str) -> None:
+        record = self.records.pop(request_id, None)
+        if record is not None:
+            self.bytes -= record.size
+            self.packed_bytes -= packed_size(record)
+
+    def add_to_index(self, record: MemoryRecord) -> None:
+        """
+        Append the record to every index it belongs to.
+        """
+        self.seq += 1
+        self.stamp = max(self.stamp, record.updated_at)
+        record.seq = self.seq
+
+        entry = (self.stamp, self.seq, record.request_id)
+        index = self.index
+        for key in index_keys(record):
+            entries = index.get(key)
+            if entries is None:
+                entries = index[key] = []
+            entries.append(entry)
+            self.index_entries += 1
+
+        # Every record has at most 4 live entries: past 8 per record at
+        # least half are stale, so compaction is amortized O(1) per store
+        if self.index_entries > 8 * len(self.records) + 1024:
+            self.compact_index()
+
+    def compact_index(self) -> None:
+        """
+        Drop stale entries (replaced or removed records), keeping order.
+        """
+        records = self.records
+        total = 0
+        for key in list(self.index):
+            live = [
+                entry for entry in self.index[key]
+                if (record := records.get(entry[2])) is not None and record.seq == entry[1]
+            ]
+            if live:
+                self.index[key] = live
+                total += len(live)
+            else:
+                del self.index[key]
+        self.index_entries = total
 
-    # Creation/update timestamps for debugging + future audit usefulness
-    created_at: float = field(default_factory=lambda: time.time())
-    updated_at: float = field(default_factory=lambda: time.time())
 
-    # Arbitrary structured memory payload
-    # Example future keys: last_agent, last_output, errors, metrics, etc.
-    data: Dict[str, Any] = field(default_factory=dict)
+# Index of every record (time-ordered)
+_ALL: Tuple[str, str] = ("all", "")
 
 
-class InMemoryStore:
+def index_keys(record: MemoryRecord) -> List[Tuple[str, str]]:
     """
-    Tiny in-memory store keyed by request_id.
+    (field, value) indexes a record is listed in: all, tier, and, once
+    an agent ran, agent + status ("ok" / "error").
+    """
+    keys = [_ALL, ("tier", record.tier)]
+    agent = record.data.get("last_agent")
+    if agent:
+        keys.append(("agent", agent))
+    ok = record.data.get("last_ok")
+    if ok is not None:
+        keys.append(("status", "ok" if ok else "error"))
+    return keys
+
+
+class InMemoryStore(MemoryStore):
+    """
+    Bounded, thread-safe in-memory store keyed by request_id.
 
     Why it exists (Phase 2):
     - Fast and simple
     - Allows us to prove end-to-end context flow
     - Keeps architecture clean while the platform is early-stage
 
+    Concurrency:
+    - Records are spread over `shards` slices by request_id hash, each
+      with its own lock, so threadpool workers and the event loop only
+      contend when they touch the same slice
+    - get_or_create() and update() are atomic per record; prefer them
+      over get() + mutate + upsert()
+    - snapshot() returns a deep copy that is safe to serialize while
+      other requests keep writing
+
+    Bounds:
+    - Records expire after a per-tier TTL (measured from updated_at)
+    - Least-recently-used records are evicted past max_records
+      (split evenly across shards, so LRU order is per shard)
+    - max_bytes is one global budget over every shard (approximate
+      resident size, see record_size): past it, the oldest head record
+      among all shards is evicted until the store fits again
+    - compact=True packs PACKED_KEYS into encoded bytes on every store
+      (MemoryRecord.pack), so large agent outputs cost their JSON size
+      instead of a tree of Python objects
+
+    Queries:
+    - query() finds executions by tier / agent / status and time range
+      from per-shard secondary indexes kept up to date on every store;
+      pages are cursor-based and never scan the whole store
+    - Expired records are dropped lazily on read and by a background
+      sweeper (see run_sweeper)
+
     Limitations (known + acceptable for now):
     - Not persistent (restarts lose memory)
     - Not safe for multi-process or multi-server deployments
     - Intended for local development + scaffolding only
     """
 
-    def __init__(self) -> None:
-        # Internal storage: request_id -> MemoryRecord
-        self._store: Dict[str, MemoryRecord] = {}
+    def __init__(
+        self,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        tier_ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        shards: int = DEFAULT_SHARDS,
+        compact: bool = COMPACT_RECORDS,
+    ) -> None:
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.compact = compact
+
+        # Keys packed on every store (empty when compaction is off)
+        self.packed_keys: Tuple[str, ...] = PACKED_KEYS if compact else ()
+        self.tier_ttls: Dict[str, float] = dict(
+            DEFAULT_TIER_TTLS if tier_ttls is None else tier_ttls
+        )
+        self.default_ttl = default_ttl
+
+        # Internal storage: request_id -> MemoryRecord, striped by hash
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+
+        # Per-shard record limit (ceil so the total is never below the config)
+        count = len(self._shards)
+        self._shard_max_records = max(1, -(-max_records // count))
 
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
     def get(self, request_id: str) -> Optional[MemoryRecord]:
         """
         Fetch a memory record by request_id.
 
-        Returns None if not found.
+        Returns None if not found or expired. The returned record is the
+        live object: use update() to change it or snapshot() to read it
+        while other requests may write.
         """
-        return self._store.get(request_id)
+        shard = self._shard(request_id)
+        with shard.lock:
+            return self._get_locked(shard, request_id, time.time())
 
-    def upsert(self, record: MemoryRecord) -> MemoryRecord:
+    def upsert(self, record: MemoryRecord, touch: bool = True) -> MemoryRecord:
         """
         Insert or update a MemoryRecord.
 
-        We update updated_at every time to track changes over time.
+        We update updated_at every time to track changes over time
+        (touch=False keeps it, ex: when caching a record loaded from
+        another backend). The record becomes the most recently used one,
+        and older records are evicted if the store is over its limits.
         """
-        record.updated_at = time.time()
-        self._store[record.request_id] = record
+        shard = self._shard(record.request_id)
+        with shard.lock:
+            self._store_locked(shard, record, touch=touch)
+        self._enforce_budget(record.request_id)
         return record
 
-    def ensure(self, request_id: str, tier: str) -> MemoryRecord:
+    def get_or_create(self, request_id: str, tier: str) -> MemoryRecord:
         """
-        Ensure a record exists for this request_id.
+        Atomically return the record for request_id, creating it if needed.
+        """
+        shard = self._shard(request_id)
+        with shard.lock:
+            existing = self._get_locked(shard, request_id, time.time())
+            if existing is not None:
+                return existing
 
-        If it exists, return it.
-        If it does not exist, create it and store it.
+            # Create a new record if nothing exists yet
+            record = MemoryRecord(request_id=request_id, tier=tier)
+            self._store_locked(shard, record)
+        self._enforce_budget(request_id)
+        return record
+
+    def update(
+        self,
+        request_id: str,
+        fn: Callable[[MemoryRecord], None],
+        tier: Optional[str] = None,
+        touch: bool = True,
+    ) -> Optional[MemoryRecord]:
+        """
+        Atomically apply fn(record) and store the result.
+
+        - If the record does not exist and tier is given, it is created
+          first; otherwise nothing happens and None is returned
+        - fn runs under the shard lock: keep it small and never call
+          back into the store from it
+        - touch=False keeps the updated_at set by fn (see upsert)
+        """
+        shard = self._shard(request_id)
+        with shard.lock:
+            record = self._get_locked(shard, request_id, time.time())
+            if record is None:
+                if tier is None:
+                    return None
+                record = MemoryRecord(request_id=request_id, tier=tier)
+
+            fn(record)
+            self._store_locked(shard, record, touch=touch)
+        self._enforce_budget(request_id)
+        return record
+
+    def snapshot(self, request_id: str) -> Optional[MemoryRecord]:
+        """
+        Copy-on-read: a deep copy of the record, safe to serialize while
+        other requests keep writing to the original.
+        """
+        shard = self._shard(request_id)
+        with shard.lock:
+            record = self._get_locked(shard, request_id, time.time())
+            if record is None:
+                return None
+
+            # Packed values are immutable bytes: no deep copy needed
+            return MemoryRecord(
+                request_id=record.request_id,
+                tier=record.tier,
+                created_at=record.created_at,
+                updated_at=record.updated_at,
+                data=copy.deepcopy(record.data),
+                packed=dict(record.packed) if record.packed else None,
+            )
+
+    def snapshot_json(self, request_id: str) -> Optional[bytes]:
+        """
+        Encode the record under the shard lock: no deep copy is needed
+        because nothing can write to it while it is being encoded.
+        """
+        shard = self._shard(request_id)
+        with shard.lock:
+            record = self._get_locked(shard, request_id, time.time())
+            if record is None:
+                return None
+            return record_json(record)
+
+    def ttl_for(self, tier: str) -> float:
+        """
+        TTL (seconds) applied to records of the given tier.
+        """
+        return self.tier_ttls.get(tier, self.default_ttl)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Drop every expired record (one shard locked at a time).
+
+        Returns the number of records removed.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        for shard in self._shards:
+            with shard.lock:
+                expired = [
+                    request_id
+                    for request_id, record in shard.records.items()
+                    if self._is_expired(record, now)
+                ]
+                for request_id in expired:
+                    shard.remove(request_id)
+                shard.expirations += len(expired)
+                if shard.index_entries > 8 * len(shard.records) + 1024:
+                    shard.compact_index()
+            removed += len(expired)
+        return removed
+
+    def query(
+        self,
+        tier: Optional[str] = None,
+        agent: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = DEFAULT_QUERY_LIMIT,
+        cursor: Optional[Cursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Find executions, newest first.
+
+        Args:
+            tier / agent / status: exact filters ("ok" or "error")
+            since / until: updated_at range (epoch seconds, inclusive)
+            min_duration_ms: only executions at least this slow
+            limit: page size (capped at MAX_QUERY_LIMIT)
+            cursor: next_cursor from the previous page
+
+        Returns:
+            (summaries, next_cursor); next_cursor is None on the last page.
+
+        How it stays cheap:
+        - Walks the smallest matching index only (others are checked per
+          record), starting at the time range found with bisect
+        - Each shard inspects at most limit * QUERY_SCAN_FACTOR entries;
+          when that budget runs out the page may be short but still comes
+          with a cursor, so callers just keep paging
+        """
+        limit = max(1, min(limit, MAX_QUERY_LIMIT))
+        budget = limit * QUERY_SCAN_FACTOR
+        now = time.time()
+
+        # Most selective index (entry counts are read without locks)
+        keys = [_ALL]
+        if tier:
+            keys.append(("tier", tier))
+        if agent:
+            keys.append(("agent", agent))
+        if status:
+            keys.append(("status", status))
+        key = min(keys, key=lambda k: sum(len(shard.index.get(k, ())) for shard in self._shards))
+
+        def matches(record: MemoryRecord) -> bool:
+            data = record.data
+            if tier and record.tier != tier:
+                return False
+            if agent and data.get("last_agent") != agent:
+                return False
+            if status and data.get("last_ok") is not (status == "ok"):
+                return False
+            if since is not None and record.updated_at < since:
+                return False
+            if until is not None and record.updated_at > until:
+                return False
+            if min_duration_ms is not None and (data.get("last_duration_ms") or 0) < min_duration_ms:
+                return False
+            return not self._is_expired(record, now)
+
+        found: List[Tuple[Cursor, Dict[str, Any]]] = []
+        floor: Optional[Cursor] = None
+        for number, shard in enumerate(self._shards):
+            with shard.lock:
+                entries = shard.index.get(key)
+                if not entries:
+                    continue
+
+                # Index stamps are >= updated_at (never decreasing), so
+                # `since` is a safe lower bound; `until` is re-checked
+                start = 0 if since is None else bisect_left(entries, (since,))
+                end = len(entries)
+                if cursor is not None:
+                    stamp, cursor_shard, seq = cursor
+                    if number < cursor_shard:
+                        end = bisect_right(entries, (stamp, float("inf")))
+                    elif number == cursor_shard:
+                        end = bisect_left(entries, (stamp, seq))
+                    else:
+                        end = bisect_left(entries, (stamp,))
+
+                taken = 0
+                index = end - 1
+                while index >= start and taken < limit and end - index <= budget:
+                    stamp, seq, request_id = entries[index]
+                    index -= 1
+                    record = shard.records.get(request_id)
+                    if record is None or record.seq != seq or not matches(record):
+                        continue
+                    found.append(((stamp, number, seq), record_summary(record)))
+                    taken += 1
+
+                if index >= start:
+                    # Stopped early: nothing below the last inspected entry
+                    # of this shard was seen
+                    stamp, seq, _ = entries[index + 1]
+                    if floor is None or (stamp, number, seq) > floor:
+                        floor = (stamp, number, seq)
+
+        # Newest first across shards; results are only complete down to
+        # the highest position where a shard stopped early
+        found.sort(key=lambda item: item[0], reverse=True)
+        if floor is not None:
+            found = [item for item in found if item[0] >= floor]
+
+        page = found[:limit]
+        if len(found) > limit:
+            return [summary for _, summary in page], page[-1][0]
+        return [summary for _, summary in page], floor
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Counters and sizes used to tune the store limits.
+        """
+        totals = {
+            "records": 0, "bytes": 0, "packed_bytes": 0, "hits": 0,
+            "misses": 0, "evictions": 0, "expirations": 0,
+        }
+        for shard in self._shards:
+            with shard.lock:
+                totals["records"] += len(shard.records)
+                totals["bytes"] += shard.bytes
+                totals["packed_bytes"] += shard.packed_bytes
+                totals["hits"] += shard.hits
+                totals["misses"] += shard.misses
+                totals["evictions"] += shard.evictions
+                totals["expirations"] += shard.expirations
+
+        return {
+            "records": totals["records"],
+            "bytes": totals["bytes"],
+            "max_records": self.max_records,
+            "max_bytes": self.max_bytes,
+            "shards": len(self._shards),
+            "hits": totals["hits"],
+            "misses": totals["misses"],
+            "evictions": totals["evictions"],
+            "expirations": totals["expirations"],
+            "compact": self.compact,
+            "packed_bytes": totals["packed_bytes"],
+            "index_entries": sum(shard.index_entries for shard in self._shards),
+        }
+
+    def resident_bytes(self) -> int:
         """
-        existing = self.get(request_id)
-        if existing:
-            return existing
+        Approximate bytes held by every shard (lock-free read).
+        """
+        return sum(shard.bytes for shard in self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard.records) for shard in self._shards)
+
+    # --------------------------------------------------------
+    # Internals (callers hold shard.lock)
+    # --------------------------------------------------------
+    def _shard(self, request_id: str) -> _Shard:
+        return self._shards[hash(request_id) % len(self._shards)]
+
+    def _is_expired(self, record: MemoryRecord, now: float) -> bool:
+        return now - record.updated_at > self.ttl_for(record.tier)
+
+    def _get_locked(
+        self, shard: _Shard, request_id: str, now: float
+    ) -> Optional[MemoryRecord]:
+        record = shard.records.get(request_id)
+        if record is None:
+            shard.misses += 1
+            return None
+
+        if self._is_expired(record, now):
+            shard.remove(request_id)
+            shard.expirations += 1
+            shard.misses += 1
+            return None
+
+        shard.records.move_to_end(request_id)
+        shard.hits += 1
+        return record
+
+    def _store_locked(
+        self, shard: _Shard, record: MemoryRecord, touch: bool = True
+    ) -> None:
+        if touch:
+            record.updated_at = time.time()
+        if self.packed_keys:
+            record.pack(self.packed_keys)
+
+        # Replace the accounting of whatever was stored under this id
+        shard.remove(record.request_id)
+        record.size = record_size(record)
+        shard.bytes += record.size
+        shard.packed_bytes += packed_size(record)
+        shard.records[record.request_id] = record
+        shard.add_to_index(record)
+
+        # Always keep the most recent record
+        while len(shard.records) > 1 and len(shard.records) > self._shard_max_records:
+            shard.remove(next(iter(shard.records)))
+            shard.evictions += 1
+
+    # --------------------------------------------------------
+    # Global byte budget (no shard lock held by the caller)
+    # --------------------------------------------------------
+    def _enforce_budget(self, keep: str) -> None:
+        """
+        Evict the oldest head record across shards until resident bytes
+        fit max_bytes. `keep` (the record just written) is never evicted,
+        even if it alone is over budget.
+
+        Shard heads are peeked without locks (approximate global LRU);
+        only the victim's shard is locked, one at a time.
+        """
+        while self.resident_bytes() > self.max_bytes:
+            victim: Optional[_Shard] = None
+            oldest = float("inf")
+            for shard in self._shards:
+                try:
+                    head = next(iter(shard.records.values()))
+                except (StopIteration, RuntimeError):
+                    # Empty, or mutated by another thread while peeking
+                    continue
+                if head.request_id != keep and head.updated_at < oldest:
+                    victim, oldest = shard, head.updated_at
+
+            if victim is None:
+                return
+
+            with victim.lock:
+                for request_id in victim.records:
+                    if request_id != keep:
+                        victim.remove(request_id)
+                        victim.evictions += 1
+                        break
+
+
+def create_memory_store() -> MemoryStore:
+    """
+    Build the configured memory backend.
+
+    Environment:
+    - OPERATORX_MEMORY_BACKEND: "memory" (default), "sqlite" or "mmap"
+    - OPERATORX_MEMORY_PATH: SQLite database file
+      (default: operatorx-memory.db in the working directory) or shared
+      mmap file (default: /dev/shm/operatorx-memory.mmap)
+
+    Use "sqlite" or "mmap" when running several workers
+    (uvicorn --workers N) so every worker sees the same records.
+    """
+    backend = os.getenv("OPERATORX_MEMORY_BACKEND", "memory").strip().lower()
+
+    if backend == "memory":
+        return InMemoryStore()
+
+    if backend == "sqlite":
+        # Imported lazily: the default backend never needs sqlite3
+        from app.core.sqlite_store import SQLiteMemoryStore
+
+        path = os.getenv("OPERATORX_MEMORY_PATH", "operatorx-memory.db")
+        return SQLiteMemoryStore(path)
+
+    if backend == "mmap":
+        from app.core.mmap_store import MmapMemoryStore
+
+        return MmapMemoryStore(os.getenv("OPERATORX_MEMORY_PATH") or None)
 
-        # Create a new record if nothing exists yet
-        return self.upsert(MemoryRecord(request_id=request_id, tier=tier))
+    raise ValueError(
+        f"Unknown OPERATORX_MEMORY_BACKEND: {backend!r} (expected 'memory', 'sqlite' or 'mmap')"
+    )
 
 
 # ------------------------------------------------------------
 # Singleton Store (shared across the backend process)
 # ------------------------------------------------------------
 # The engine and routes import and use this shared instance.
-# In future phases, this can be swapped for a persistent store
+# The backend is chosen at import time (see create_memory_store)
 # without changing the API layer.
-memory_store = InMemoryStore()
+memory_store: MemoryStore = create_memory_store()
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# ------------------------------------------------------------
+# Histogram buckets (seconds)
+# ------------------------------------------------------------
+# Spans sub-millisecond stub agents up to slow model-backed agents.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """
+    Base class: a named metric family with fixed label names.
+
+    Recording path: each label combination (series) gets its own lock,
+    so contention only happens between requests for the same
+    agent + tier, and never with a /metrics scrape of another series.
+    """
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[LabelValues, object] = {}
+        self._create_lock = threading.Lock()
+
+    def _get_series(self, labels: LabelValues):
+        series = self._series.get(labels)
+        if series is None:
+            with self._create_lock:
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._new_series()
+                    self._series[labels] = series
+        return series
+
+    def _new_series(self):  # pragma: no cover (overridden)
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        for labels, series in sorted(self._series.items()):
+            lines.extend(self._render_series(labels, series))
+        return lines
+
+    def _render_series(self, labels: LabelValues, series) -> List[str]:  # pragma: no cover
+        raise NotImplementedError
+
+
+class _ValueSeries:
+    __slots__ = ("value", "lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count (ex: successful agent runs).
+    """
+
+    type_name = "counter"
+
+    def _new_series(self) -> _ValueSeries:
+        return _ValueSeries()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        series = self._get_series(labels)
+        with series.lock:
+            series.value += amount
+
+    def value(self, *labels: str) -> float:
+        return self._get_series(labels).value
+
+    def _render_series(self, labels: LabelValues, series: _ValueSeries) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(series.value)}"]
+
+
+class Gauge(Counter):
+    """
+    Value that goes up and down (ex: in-flight executions).
+    """
+
+    type_name = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        series = self._get_series(labels)
+        with series.lock:
+            series.value = value
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum", "count", "lock")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * buckets
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observations in fixed buckets (ex: agent latency).
+    """
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> _HistogramSeries:
+        # One extra slot for observations above the largest bucket (+Inf)
+        return _HistogramSeries(len(self.buckets) + 1)
+
+    def observe(self, *labels: str, value: float) -> None:
+        series = self._get_series(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with series.lock:
+            series.counts[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def _render_series(self, labels: LabelValues, series: _HistogramSeries) -> List[str]:
+        with series.lock:
+            counts = list(series.counts)
+            total, count = series.sum, series.count
+
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(
+                f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+            )
+        label_text = _format_labels(self.labelnames, labels)
+        lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+        lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds metric families and renders them in Prometheus text format.
+
+    Collectors are callbacks run at scrape time for values that are
+    cheaper to read on demand than to track (ex: memory store size).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Optional[Sequence[float]] = None,
+    ) -> Histogram:
+        return self.register(  # type: ignore[return-value]
+            Histogram(name, documentation, labelnames, buckets or DEFAULT_LATENCY_BUCKETS)
+        )
+
+    def add_collector(
+        self,
+        collector: Callable[[], Iterable[Tuple[str, str, str, Dict[str, str], float]]],
+    ) -> None:
+        """
+        Register a scrape-time callback yielding
+        (name, type, help, labels, value) samples.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        described = set()
+        for collector in self._collectors:
+            for name, type_name, documentation, labels, value in collector():
+                if name not in described:
+                    lines.append(f"# HELP {name} {documentation}")
+                    lines.append(f"# TYPE {name} {type_name}")
+                    described.add(name)
+                lines.append(
+                    f"{name}{_format_labels(list(labels), list(labels.values()))} {_format_value(value)}"
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------
+# Singleton registry + engine metrics
+# ------------------------------------------------------------
+metrics = MetricsRegistry()
+
+agent_latency = metrics.histogram(
+    "operatorx_agent_duration_seconds",
+    "Agent execution latency as seen by CoreEngine.",
+    ("agent", "tier"),
+)
+
+agent_runs = metrics.counter(
+    "operatorx_agent_runs_total",
+    "Agent executions by outcome (success / error / timeout / rejected).",
+    ("agent", "tier", "outcome"),
+)
+
+agents_in_flight = metrics.gauge(
+    "operatorx_agent_in_flight",
+    "Agent executions currently running.",
+    ("agent", "tier"),
+)
@@ -0,0 +1,542 @@
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from app.core.memory import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_RECORDS,
+    DEFAULT_TIER_TTLS,
+    DEFAULT_TTL_SECONDS,
+    MemoryRecord,
+    MemoryStore,
+)
+from app.core.serialization import loads
+
+
+logger = logging.getLogger("operatorx.core.mmap_store")
+
+
+# ------------------------------------------------------------
+# File Layout
+# ------------------------------------------------------------
+# [header][index: capacity fixed-size entries][arena: capacity blocks]
+#
+# Index entry i owns arena block i, so reusing a slot reuses its block
+# (no allocator, no fragmentation). Entries are small and contiguous,
+# so probing touches a few cache lines instead of the payloads.
+MAGIC = b"OPXMEM01"
+
+# magic, capacity, block_size, records, bytes, evictions, expirations
+_HEADER = struct.Struct("<8sIIQQQQ")
+_HEADER_SIZE = 64
+
+# seq, state, key_hash, created_at, updated_at, key_len, tier_len, data_len
+_ENTRY = struct.Struct("<IB3xQddHHI")
+
+_EMPTY, _USED, _TOMBSTONE = 0, 1, 2
+
+# Arena block size: key + tier + serialized data must fit in one block
+DEFAULT_BLOCK_SIZE = 16 * 1024
+
+# Slots examined per lookup/insert (linear probing window)
+PROBE_LIMIT = 32
+
+# Reader retries before giving up on a slot that keeps changing
+_READ_RETRIES = 16
+
+# Slots swept per writer-lock acquisition
+_SWEEP_CHUNK = 1024
+
+# Block data starting with this byte is the name of an overflow file
+# (JSON never starts with NUL) holding a payload larger than the block
+_OVERFLOW = b"\x00"
+
+
+class StoreClosed(RuntimeError):
+    """
+    Raised by every call made on a store after close().
+    """
+
+
+def _key_hash(key: bytes) -> int:
+    # Stable across processes (hash() is randomized per interpreter)
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def default_mmap_path() -> str:
+    """
+    Prefer tmpfs (/dev/shm) so the region never touches a disk.
+    """
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else "/tmp"
+    return os.path.join(base, "operatorx-memory.mmap")
+
+
+class MmapMemoryStore(MemoryStore):
+    """
+    Memory store in a memory-mapped file shared by every worker on a host.
+
+    Why this exists:
+    - `uvicorn --workers N` runs N processes; /memory must find a record
+      no matter which worker served the original request
+    - No database or network round trip: every worker maps the same
+      pages (tmpfs by default), so a read is a hash probe + a decode
+
+    Layout:
+    - Fixed-size open-addressing index keyed by a stable hash of
+      request_id (linear probing over PROBE_LIMIT slots)
+    - Arena of fixed-size blocks holding key, tier and JSON data;
+      index slot i owns block i
+    - Expired slots become tombstones and are reused by later inserts;
+      when a probe window is full, its least recently updated record
+      is evicted (approximate LRU)
+
+    Concurrency:
+    - Writers serialize on a thread lock + flock on the file
+      (update/get_or_create are atomic across workers)
+    - Readers take no lock: every entry carries a sequence counter
+      (odd while being written) and reads retry if it changed
+    - Entry fields and keys are read in place from the mapping; the JSON
+      payload is decoded straight from the mapping with orjson (copied
+      once with the stdlib fallback)
+    - close() unmaps the region once; later calls raise StoreClosed.
+      Stop whatever still writes (the engine) before closing
+
+    Limits:
+    - capacity = max_records (fixed when the file is created; an existing
+      file keeps its geometry)
+    - A payload that does not fit in its block is written to an overflow
+      file next to the mapping (<path>.overflow/) and the block holds its
+      name; reads follow it, so every backend returns the same record.
+      Overflow files are removed when the slot is rewritten, expires or
+      is evicted, and are not counted in max_bytes
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        tier_ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.path = path or default_mmap_path()
+        self.tier_ttls: Dict[str, float] = dict(
+            DEFAULT_TIER_TTLS if tier_ttls is None else tier_ttls
+        )
+        self.default_ttl = default_ttl
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        # Per-process counters (reads never take the shared lock)
+        self._hits = 0
+        self._misses = 0
+        self._overflows = 0
+
+        # Spread the byte budget over the slots (512-byte aligned blocks)
+        block_size = max(1024, max_bytes // max(1, max_records))
+        block_size = min(-(-block_size // 512) * 512, DEFAULT_BLOCK_SIZE)
+        self.capacity, self.block_size = self._open(max(PROBE_LIMIT, max_records), block_size)
+
+        self._index_offset = _HEADER_SIZE
+        arena = self._index_offset + self.capacity * _ENTRY.size
+        self._arena_offset = -(-arena // mmap.PAGESIZE) * mmap.PAGESIZE
+
+        self._mm = mmap.mmap(self._fd, self._arena_offset + self.capacity * self.block_size)
+        self._overflow_dir = self.path + ".overflow"
+        self._view = memoryview(self._mm)
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+    def get(self, request_id: str) -> Optional[MemoryRecord]:
+        """
+        Lock-free read. Returns a decoded copy (changes must go through
+        update() to be visible to other workers).
+        """
+        self._check_open()
+        try:
+            record = self._read(request_id.encode("utf-8"), time.time())
+        except (ValueError, BufferError):
+            # The region was unmapped under a lock-free read
+            self._check_open()
+            raise
+        if record is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return record
+
+    def upsert(self, record: MemoryRecord) -> MemoryRecord:
+        with self._write_lock():
+            record.updated_at = time.time()
+            self._write(record, record.updated_at)
+        return record
+
+    def get_or_create(self, request_id: str, tier: str) -> MemoryRecord:
+        key = request_id.encode("utf-8")
+        with self._write_lock():
+            now = time.time()
+            existing = self._read(key, now)
+            if existing is not None:
+                return existing
+
+            record = MemoryRecord(request_id=request_id, tier=tier)
+            self._write(record, now)
+            return record
+
+    def update(
+        self,
+        request_id: str,
+        fn: Callable[[MemoryRecord], None],
+        tier: Optional[str] = None,
+    ) -> Optional[MemoryRecord]:
+        """
+        Atomic read-modify-write across every worker on the host.
+
+        fn runs under the cross-process writer lock: keep it small.
+        """
+        key = request_id.encode("utf-8")
+        with self._write_lock():
+            now = time.time()
+            record = self._read(key, now)
+            if record is None:
+                if tier is None:
+                    return None
+                record = MemoryRecord(request_id=request_id, tier=tier)
+
+            fn(record)
+            record.updated_at = time.time()
+            self._write(record, record.updated_at)
+            return record
+
+    def snapshot(self, request_id: str) -> Optional[MemoryRecord]:
+        # Records are always decoded copies
+        return self.get(request_id)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Turn every expired slot into a reusable tombstone.
+
+        The writer lock is taken per chunk of slots so a sweep never
+        stalls writers in other workers for a full table scan.
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        for first in range(0, self.capacity, _SWEEP_CHUNK):
+            with self._write_lock():
+                expired = 0
+                for slot in range(first, min(first + _SWEEP_CHUNK, self.capacity)):
+                    entry = _ENTRY.unpack_from(self._mm, self._entry_offset(slot))
+                    if entry[1] == _USED and self._expired(slot, entry, now):
+                        self._clear(slot, entry)
+                        expired += 1
+                self._bump_header(expirations=expired)
+            removed += expired
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        self._check_open()
+        _, capacity, block_size, records, size, evictions, expirations = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        return {
+            "records": records,
+            "bytes": size,
+            "max_records": capacity,
+            "max_bytes": capacity * block_size,
+            "shards": 1,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": evictions,
+            "expirations": expirations,
+            "backend": "mmap",
+            "path": self.path,
+            "block_size": block_size,
+            "overflows": self._overflows,
+        }
+
+    def close(self) -> None:
+        """
+        Unmap the region (the file stays for the other workers).
+
+        Idempotent. Waits for writers of this process to finish; any
+        later call raises StoreClosed.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._view.release()
+            self._mm.close()
+            os.close(self._fd)
+
+    async def stop(self) -> None:
+        await super().stop()
+        self.close()
+
+    def __len__(self) -> int:
+        return self.stats()["records"]
+
+    # --------------------------------------------------------
+    # Setup
+    # --------------------------------------------------------
+    def _open(self, capacity: int, block_size: int) -> Tuple[int, int]:
+        """
+        Initialize the file once (first worker wins) or adopt its geometry.
+        """
+        with self._write_lock():
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == MAGIC:
+                _, file_capacity, file_block_size, *_ = _HEADER.unpack(header)
+                if (file_capacity, file_block_size) != (capacity, block_size):
+                    logger.warning(
+                        "mmap_store.geometry_mismatch path=%s file=%sx%s config=%sx%s (using file)",
+                        self.path, file_capacity, file_block_size, capacity, block_size,
+                    )
+                return file_capacity, file_block_size
+
+            index = _HEADER_SIZE + capacity * _ENTRY.size
+            arena_offset = -(-index // mmap.PAGESIZE) * mmap.PAGESIZE
+            # Sparse: pages are only allocated when a slot is first written
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, arena_offset + capacity * block_size)
+            os.pwrite(self._fd, _HEADER.pack(MAGIC, capacity, block_size, 0, 0, 0, 0), 0)
+            return capacity, block_size
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        # flock excludes other processes; the thread lock excludes
+        # threads of this process (flock is per open file, not per thread)
+        with self._lock:
+            self._check_open()
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise StoreClosed(f"memory store is closed: {self.path}")
+
+    def _entry_offset(self, slot: int) -> int:
+        return self._index_offset + slot * _ENTRY.size
+
+    def _block_offset(self, slot: int) -> int:
+        return self._arena_offset + slot * self.block_size
+
+    def _ttl(self, tier: str) -> float:
+        return self.tier_ttls.get(tier, self.default_ttl)
+
+    def _expired(self, slot: int, entry: tuple, now: float) -> bool:
+        _, _, _, _, updated_at, key_len, tier_len, _ = entry
+        start = self._block_offset(slot) + key_len
+        tier = self._view[start:start + tier_len].tobytes().decode("utf-8")
+        return now - updated_at > self._ttl(tier)
+
+    def _probe(self, key_hash: int) -> Iterator[int]:
+        first = key_hash % self.capacity
+        for step in range(min(PROBE_LIMIT, self.capacity)):
+            yield (first + step) % self.capacity
+
+    def _read(self, key: bytes, now: float) -> Optional[MemoryRecord]:
+        key_hash = _key_hash(key)
+        for slot in self._probe(key_hash):
+            offset = self._entry_offset(slot)
+            for _ in range(_READ_RETRIES):
+                entry = _ENTRY.unpack_from(self._mm, offset)
+                seq, state = entry[0], entry[1]
+                if seq & 1:
+                    # Writer in progress on this slot
+                    continue
+
+                if state == _EMPTY:
+                    return None
+                if state != _USED or entry[2] != key_hash:
+                    break
+
+                record = self._decode(slot, entry, key)
+                if _ENTRY.unpack_from(self._mm, offset)[0] != seq:
+                    continue
+                if record is None:
+                    break
+                if now - record.updated_at > self._ttl(record.tier):
+                    return None
+                return record
+        return None
+
+    def _decode(self, slot: int, entry: tuple, key: bytes) -> Optional[MemoryRecord]:
+        _, _, _, created_at, updated_at, key_len, tier_len, data_len = entry
+        if key_len + tier_len + data_len > self.block_size:
+            # Torn read: lengths from a concurrent write
+            return None
+
+        start = self._block_offset(slot)
+        view = self._view
+        if key_len != len(key) or view[start:start + key_len] != key:
+            return None
+
+        tier_start = start + key_len
+        data_start = tier_start + tier_len
+        try:
+            tier = view[tier_start:data_start].tobytes().decode("utf-8")
+            raw = view[data_start:data_start + data_len]
+            if raw[:1] == _OVERFLOW:
+                with open(os.path.join(self._overflow_dir, raw[1:].tobytes().decode("ascii")), "rb") as f:
+                    raw = f.read()
+            data = loads(raw)
+        except (ValueError, OSError):
+            # Torn read, or an overflow file replaced meanwhile (caller
+            # re-checks seq and retries)
+            return None
+
+        return MemoryRecord(
+            request_id=key.decode("utf-8"),
+            tier=tier,
+            created_at=created_at,
+            updated_at=updated_at,
+            data=data,
+        )
+
+    def _write(self, record: MemoryRecord, now: float) -> None:
+        """
+        Store the record (caller holds the writer lock).
+        """
+        key = record.request_id.encode("utf-8")
+        tier = record.tier.encode("utf-8")
+        data = record.payload_json()
+        key_hash = _key_hash(key)
+
+        room = self.block_size - len(key) - len(tier)
+        if len(data) > room:
+            data = self._spill(key_hash, data, room)
+
+        slot, evicted = self._place(key, key_hash, now)
+        offset = self._entry_offset(slot)
+        entry = _ENTRY.unpack_from(self._mm, offset)
+        seq, state, old_data_len = entry[0], entry[1], entry[7]
+        replaced = self._overflow_name(slot, entry) if state == _USED else None
+
+        # Begin write (odd seq): readers retry until it is even again
+        struct.pack_into("<I", self._mm, offset, seq + 1)
+
+        start = self._block_offset(slot)
+        self._mm[start:start + len(key)] = key
+        self._mm[start + len(key):start + len(key) + len(tier)] = tier
+        data_start = start + len(key) + len(tier)
+        self._mm[data_start:data_start + len(data)] = data
+
+        _ENTRY.pack_into(
+            self._mm, offset,
+            seq + 2, _USED, key_hash, record.created_at, now,
+            len(key), len(tier), len(data),
+        )
+
+        if state == _USED:
+            self._bump_header(size=len(data) - old_data_len, evictions=int(evicted))
+        else:
+            self._bump_header(records=1, size=len(data))
+
+        # Readers holding the old name retry (seq changed) and follow the new one
+        if replaced is not None:
+            self._unlink_overflow(replaced)
+
+    def _spill(self, key_hash: int, data: bytes, room: int) -> bytes:
+        """
+        Write an oversized payload to its own overflow file; returns the
+        block data pointing to it. A new name per write, so readers of
+        the previous version never see a half-written file.
+        """
+        name = f"{key_hash:016x}-{uuid.uuid4().hex}".encode("ascii")
+        if len(_OVERFLOW) + len(name) > room:
+            raise ValueError(f"request_id too long for the memory block: {self.block_size - room} bytes")
+        os.makedirs(self._overflow_dir, exist_ok=True)
+        with open(os.path.join(self._overflow_dir, name.decode("ascii")), "wb") as f:
+            f.write(data)
+        self._overflows += 1
+        return _OVERFLOW + name
+
+    def _overflow_name(self, slot: int, entry: tuple) -> Optional[str]:
+        _, _, _, _, _, key_len, tier_len, data_len = entry
+        start = self._block_offset(slot) + key_len + tier_len
+        if data_len < 2 or self._view[start:start + 1] != _OVERFLOW:
+            return None
+        return self._view[start + 1:start + data_len].tobytes().decode("ascii")
+
+    def _unlink_overflow(self, name: str) -> None:
+        try:
+            os.unlink(os.path.join(self._overflow_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def _place(self, key: bytes, key_hash: int, now: float) -> Tuple[int, bool]:
+        """
+        Slot for key: its current slot, else the first free/expired one,
+        else the least recently updated slot in the window (evicted).
+        """
+        free: Optional[int] = None
+        oldest: Optional[int] = None
+        oldest_at = float("inf")
+
+        for slot in self._probe(key_hash):
+            entry = _ENTRY.unpack_from(self._mm, self._entry_offset(slot))
+            state = entry[1]
+            if state == _EMPTY:
+                return (slot if free is None else free), False
+            if state == _TOMBSTONE:
+                if free is None:
+                    free = slot
+                continue
+
+            if entry[2] == key_hash and self._decode_key_matches(slot, entry, key):
+                return slot, False
+
+            if free is None and self._expired(slot, entry, now):
+                self._clear(slot, entry)
+                self._bump_header(expirations=1)
+                free = slot
+            elif entry[4] < oldest_at:
+                oldest, oldest_at = slot, entry[4]
+
+        if free is not None:
+            return free, False
+        return oldest, True
+
+    def _decode_key_matches(self, slot: int, entry: tuple, key: bytes) -> bool:
+        start = self._block_offset(slot)
+        return entry[5] == len(key) and self._view[start:start + len(key)] == key
+
+    def _clear(self, slot: int, entry: tuple) -> None:
+        offset = self._entry_offset(slot)
+        seq = entry[0]
+        replaced = self._overflow_name(slot, entry)
+        struct.pack_into("<I", self._mm, offset, seq + 1)
+        _ENTRY.pack_into(self._mm, offset, seq + 2, _TOMBSTONE, 0, 0.0, 0.0, 0, 0, 0)
+        self._bump_header(records=-1, size=-entry[7])
+        if replaced is not None:
+            self._unlink_overflow(replaced)
+
+    def _bump_header(
+        self, records: int = 0, size: int = 0, evictions: int = 0, expirations: int = 0
+    ) -> None:
+        magic, capacity, block_size, *counters = _HEADER.unpack_from(self._mm, 0)
+        counters[0] += records
+        counters[1] += size
+        counters[2] += evictions
+        counters[3] += expirations
+        _HEADER.pack_into(self._mm, 0, magic, capacity, block_size, *counters)
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Tuple
+
+
+# ------------------------------------------------------------
+# Pipeline limits
+# ------------------------------------------------------------
+# Upper bound on nodes per pipeline (keeps validation + fan-out bounded)
+MAX_PIPELINE_NODES = 64
+
+# Reserved source name that refers to the pipeline-level input
+PIPELINE_INPUT = "input"
+
+
+class PipelineSpecError(ValueError):
+    """
+    Raised when a pipeline spec is invalid (unknown agent, cycle, bad
+    reference, ...). The message is safe to return to API clients.
+    """
+
+
+# ------------------------------------------------------------
+# Compiled structures (immutable, safe to cache and share)
+# ------------------------------------------------------------
+@dataclass(frozen=True)
+class InputBinding:
+    """
+    Copies a value from the pipeline input or an upstream node output
+    into one key of a node's input.
+
+    Example: target="goal", source="input", path=("goal",)
+    """
+    target: str
+    source: str
+    path: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PipelineNode:
+    """
+    One agent invocation inside a pipeline.
+    """
+    id: str
+    agent: str
+
+    # Literal input values (copied into every execution)
+    input: Mapping[str, Any]
+
+    # Values pulled from the pipeline input / upstream outputs
+    bindings: Tuple[InputBinding, ...]
+
+    # Upstream node ids that must finish first
+    depends_on: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class CompiledPipeline:
+    """
+    A validated, topologically sorted pipeline.
+
+    - order: a valid execution order (dependencies first)
+    - levels: nodes grouped by depth; nodes in the same level are independent
+    - sinks: nodes nothing depends on (the pipeline's final outputs)
+    """
+    key: str
+    nodes: Mapping[str, PipelineNode]
+    order: Tuple[str, ...]
+    levels: Tuple[Tuple[str, ...], ...]
+    sinks: Tuple[str, ...]
+
+
+# ------------------------------------------------------------
+# Spec handling
+# ------------------------------------------------------------
+def pipeline_key(spec: Mapping[str, Any]) -> str:
+    """
+    Stable hash of a pipeline spec (used as the compile cache key).
+    """
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _parse_reference(reference: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Split "node.key.sub" into ("node", ("key", "sub")).
+    """
+    parts = [part for part in str(reference).split(".") if part]
+    if not parts:
+        raise PipelineSpecError(f"Empty input reference: {reference!r}")
+    return parts[0], tuple(parts[1:])
+
+
+def compile_pipeline(
+    spec: Mapping[str, Any], known_agents: Iterable[str]
+) -> CompiledPipeline:
+    """
+    Validate a pipeline spec and sort it topologically.
+
+    Spec format:
+        {
+          "nodes": [
+            {"id": "plan", "agent": "orchestrator",
+             "map": {"goal": "input.goal"}},
+            {"id": "reliability", "agent": "deployment_reliability",
+             "input": {"constraints": []},
+             "map": {"goal": "input.goal"},
+             "after": ["plan"]}
+          ]
+        }
+
+    - "input": literal values for the node input
+    - "map": target key -> "input.<path>" or "<node_id>[.<path>]"
+    - "after": extra ordering dependencies (mapped nodes are implied)
+
+    Raises:
+        PipelineSpecError if the spec is not a valid DAG of known agents.
+    """
+    raw_nodes = spec.get("nodes") or []
+    if not raw_nodes:
+        raise PipelineSpecError("Pipeline has no nodes")
+    if len(raw_nodes) > MAX_PIPELINE_NODES:
+        raise PipelineSpecError(
+            f"Pipeline has {len(raw_nodes)} nodes (max {MAX_PIPELINE_NODES})"
+        )
+
+    agents = set(known_agents)
+    nodes: Dict[str, PipelineNode] = {}
+
+    # --------------------------------------------
+    # Parse nodes
+    # --------------------------------------------
+    for raw in raw_nodes:
+        node_id = str(raw.get("id") or "").strip()
+        agent = str(raw.get("agent") or "").strip()
+
+        if not node_id:
+            raise PipelineSpecError("Every node needs an id")
+        if node_id == PIPELINE_INPUT:
+            raise PipelineSpecError(f"Node id {PIPELINE_INPUT!r} is reserved")
+        if node_id in nodes:
+            raise PipelineSpecError(f"Duplicate node id: {node_id}")
+        if agent not in agents:
+            raise PipelineSpecError(f"Unknown agent: {agent} (node {node_id})")
+
+        bindings = []
+        depends_on = set(str(dep) for dep in raw.get("after") or [])
+        for target, reference in (raw.get("map") or {}).items():
+            source, path = _parse_reference(reference)
+            bindings.append(InputBinding(target=str(target), source=source, path=path))
+            if source != PIPELINE_INPUT:
+                depends_on.add(source)
+
+        nodes[node_id] = PipelineNode(
+            id=node_id,
+            agent=agent,
+            input=dict(raw.get("input") or {}),
+            bindings=tuple(bindings),
+            depends_on=frozenset(depends_on),
+        )
+
+    for node in nodes.values():
+        missing = sorted(dep for dep in node.depends_on if dep not in nodes)
+        if missing:
+            raise PipelineSpecError(
+                f"Node {node.id} depends on unknown node(s): {', '.join(missing)}"
+            )
+
+    # --------------------------------------------
+    # Topological sort (Kahn), grouped by level
+    # --------------------------------------------
+    remaining = {node_id: set(node.depends_on) for node_id, node in nodes.items()}
+    order: List[str] = []
+    levels: List[Tuple[str, ...]] = []
+
+    while remaining:
+        ready = tuple(node_id for node_id, deps in remaining.items() if not deps)
+        if not ready:
+            raise PipelineSpecError(
+                f"Pipeline has a cycle between: {', '.join(sorted(remaining))}"
+            )
+
+        levels.append(ready)
+        order.extend(ready)
+        for node_id in ready:
+            del remaining[node_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    depended_on = set().union(*(node.depends_on for node in nodes.values()))
+    sinks = tuple(node_id for node_id in order if node_id not in depended_on)
+
+    return CompiledPipeline(
+        key=pipeline_key(spec),
+        nodes=nodes,
+        order=tuple(order),
+        levels=tuple(levels),
+        sinks=sinks,
+    )
+
+
+def resolve_path(value: Any, path: Tuple[str, ...]) -> Any:
+    """
+    Walk a dotted path through dicts (by key) and lists (by index).
+
+    Raises:
+        KeyError if the path does not exist.
+    """
+    for part in path:
+        if isinstance(value, Mapping):
+            value = value[part]
+        elif isinstance(value, (list, tuple)) and part.lstrip("-").isdigit():
+            value = value[int(part)]
+        else:
+            raise KeyError(part)
+    return value
+
+
+def build_node_input(
+    node: PipelineNode,
+    pipeline_input: Mapping[str, Any],
+    outputs: Mapping[str, Mapping[str, Any]],
+) -> Dict[str, Any]:
+    """
+    Assemble a node's input from its literals and bindings.
+
+    Raises:
+        PipelineSpecError if a binding points at a missing value.
+    """
+    node_input = dict(node.input)
+    for binding in node.bindings:
+        source = (
+            pipeline_input if binding.source == PIPELINE_INPUT
+            else outputs[binding.source]
+        )
+        try:
+            node_input[binding.target] = resolve_path(source, binding.path)
+        except (KeyError, IndexError):
+            reference = ".".join((binding.source,) + binding.path)
+            raise PipelineSpecError(
+                f"Node {node.id}: input {binding.target!r} references missing value {reference!r}"
+            ) from None
+    return node_input
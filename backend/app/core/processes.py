@@ -0,0 +1,660 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.reduction import ForkingPickler
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from app.agents.base import AgentContext, BaseAgent
+
+
+logger = logging.getLogger("operatorx.core.processes")
+
+
+# ------------------------------------------------------------
+# Process pool defaults
+# ------------------------------------------------------------
+# Worker processes shared by every execution="process" agent.
+# Override with OPERATORX_PROCESS_WORKERS.
+DEFAULT_PROCESS_WORKERS = os.cpu_count() or 2
+
+# Executions sent to a worker in one round trip (see AgentProcessPool)
+MAX_CHUNK_SIZE = 32
+
+# Executions are only grouped once there are more of them than
+# workers * CHUNKS_PER_WORKER in one flush
+CHUNKS_PER_WORKER = 4
+
+# "spawn" children start from a fresh interpreter: no threads, locks or
+# sockets inherited from the server. Override with
+# OPERATORX_PROCESS_START_METHOD (fork / forkserver / spawn).
+DEFAULT_START_METHOD = "spawn"
+
+
+# ------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------
+PROCESS_WORKERS = int(os.getenv("OPERATORX_PROCESS_WORKERS", DEFAULT_PROCESS_WORKERS))
+
+START_METHOD = os.getenv("OPERATORX_PROCESS_START_METHOD", DEFAULT_START_METHOD)
+
+
+# ------------------------------------------------------------
+# Types
+# ------------------------------------------------------------
+# (target "module:Class", lifecycle) of a process agent
+AgentTarget = Tuple[str, str]
+
+# What a worker sends back per execution: (True, output) or
+# (False, (exception type, message, formatted traceback))
+Outcome = Tuple[bool, Any]
+
+# One execution sent to a worker: (target, lifecycle, input, ctx,
+# absolute time.monotonic() after which nobody waits for it anymore)
+_Task = Tuple[str, str, Dict[str, Any], AgentContext, Optional[float]]
+
+# Write end of a result channel and the lock its writers share
+_ResultWriter = Tuple[Any, Any]
+
+
+class ProcessAgentError(Exception):
+    """
+    An agent raised inside a worker process.
+
+    str() is the original message (what EngineResult.error reports);
+    the worker traceback is attached as __cause__ for the logs.
+    """
+
+    def __init__(self, message: str, remote_type: str) -> None:
+        super().__init__(message)
+        self.remote_type = remote_type
+
+
+class _RemoteTraceback(Exception):
+    def __init__(self, text: str) -> None:
+        self.text = text
+
+    def __str__(self) -> str:
+        return self.text
+
+
+def unwrap(outcome: Outcome) -> Any:
+    """
+    The output of a worker outcome, or its error raised as ProcessAgentError.
+    """
+    ok, value = outcome
+    if ok:
+        return value
+    remote_type, message, text = value
+    raise ProcessAgentError(message, remote_type) from _RemoteTraceback(text)
+
+
+# ============================================================
+# Worker side (runs in the child processes)
+# ============================================================
+# Shared instances of singleton / pooled agents, one set per worker.
+# A worker runs one execution at a time, so a pooled agent's instance
+# is never used concurrently.
+_instances: Dict[str, BaseAgent] = {}
+_classes: Dict[str, Type[BaseAgent]] = {}
+
+# Where chunked executions send their outcomes (see _ResultChannel)
+_results: Optional[_ResultWriter] = None
+
+
+def _agent_class(target: str) -> Type[BaseAgent]:
+    cls = _classes.get(target)
+    if cls is None:
+        module_name, _, attr = target.partition(":")
+        obj: Any = importlib.import_module(module_name)
+        for part in attr.split("."):
+            obj = getattr(obj, part)
+        if not (isinstance(obj, type) and issubclass(obj, BaseAgent)):
+            raise TypeError(f"{target} is not a BaseAgent subclass")
+        cls = _classes[target] = obj
+    return cls
+
+
+def _agent(target: str, lifecycle: str) -> BaseAgent:
+    """
+    Instance for one execution (same lifecycle rules as AgentRegistry).
+    """
+    if lifecycle == "per_request":
+        return _agent_class(target)()
+
+    agent = _instances.get(target)
+    if agent is None:
+        agent = _agent_class(target)()
+        asyncio.run(agent.startup())
+        _instances[target] = agent
+    return agent
+
+
+def _init_worker(warm: Sequence[AgentTarget], results: Optional[_ResultWriter] = None) -> None:
+    """
+    Process initializer: import the process agents and build the shared
+    ones up front, and run their shutdown() hooks when the worker exits.
+    """
+    global _results
+    _results = results
+    Finalize(None, _shutdown_worker, exitpriority=10)
+    for target, lifecycle in warm:
+        try:
+            if lifecycle == "per_request":
+                _agent_class(target)
+            else:
+                _agent(target, lifecycle)
+        except Exception:
+            logger.exception("processes.warmup failed target=%s", target)
+
+
+def _shutdown_worker() -> None:
+    for target, agent in list(_instances.items()):
+        try:
+            asyncio.run(agent.shutdown())
+        except Exception:
+            logger.exception("processes.shutdown failed target=%s", target)
+    _instances.clear()
+
+
+def _run_one(
+    target: str,
+    lifecycle: str,
+    input_data: Dict[str, Any],
+    ctx: AgentContext,
+    expires: Optional[float] = None,
+) -> Outcome:
+    # Queued behind slower executions of the same chunk past its
+    # deadline: the engine already reported a timeout, skip it
+    if expires is not None and time.monotonic() >= expires:
+        return False, ("TimeoutError", "expired before it started", "")
+    try:
+        agent = _agent(target, lifecycle)
+        if agent.is_async():
+            return True, asyncio.run(agent.arun(input_data, ctx))
+        return True, agent.run(input_data, ctx)
+    except Exception as e:
+        return False, (type(e).__name__, str(e), traceback.format_exc())
+
+
+def _send_result(task_id: int, outcome: Outcome) -> None:
+    try:
+        payload = ForkingPickler.dumps((task_id, outcome))
+    except Exception as e:
+        # Unpicklable output: fail this execution instead of the chunk
+        error = (type(e).__name__, f"output cannot be sent back: {e}", traceback.format_exc())
+        payload = ForkingPickler.dumps((task_id, (False, error)))
+    writer, lock = _results
+    with lock:
+        writer.send_bytes(payload)
+
+
+def _run_chunk(tasks: List[Tuple[int, _Task]]) -> None:
+    """
+    Run several executions in one round trip. Each outcome is sent back
+    as soon as it is ready (not with the chunk), and one failing
+    execution never fails the others.
+    """
+    for task_id, task in tasks:
+        _send_result(task_id, _run_one(*task))
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ============================================================
+# Server side
+# ============================================================
+class _ResultChannel:
+    """
+    Pipe the workers of one executor send chunked outcomes through, and
+    the thread that hands each one to its waiting future.
+
+    Every executor (the first one, and each rebuild after a recycle or a
+    crash) gets its own channel: a worker killed while writing cannot
+    leave a newer pool with a half-written message or a held lock.
+    """
+
+    def __init__(self, context: Any, dispatch: Callable[[int, Outcome], None]) -> None:
+        self._reader, writer = context.Pipe(duplex=False)
+        # Sent to the workers through the executor initargs
+        self.writer: _ResultWriter = (writer, context.Lock())
+        self._dispatch = dispatch
+        self._closing = threading.Event()
+
+        # Run once every outcome sent through the channel was dispatched
+        self._drained = False
+        self._on_drained: List[Callable[[], None]] = []
+        self._drained_lock = threading.Lock()
+
+        self._thread = threading.Thread(
+            target=self._run, name="operatorx-process-results", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """
+        Stop once everything already sent was delivered (call after the
+        executor's workers exited).
+        """
+        self._closing.set()
+        # No writer is left: a message cut short by a killed worker
+        # ends in EOFError instead of blocking the reader
+        self.writer[0].close()
+
+    def when_drained(self, callback: Callable[[], None]) -> None:
+        """
+        Call callback() once the channel is closed and every outcome
+        already sent was dispatched (right away if that already happened).
+        """
+        with self._drained_lock:
+            if not self._drained:
+                self._on_drained.append(callback)
+                return
+        callback()
+
+    def _run(self) -> None:
+        reader = self._reader
+        try:
+            while True:
+                if reader.poll(0.5):
+                    task_id, outcome = reader.recv()
+                    self._dispatch(task_id, outcome)
+                elif self._closing.is_set():
+                    return
+        except EOFError:
+            return
+        except Exception:
+            logger.exception("processes.result_channel failed")
+        finally:
+            reader.close()
+            self.writer[0].close()
+            with self._drained_lock:
+                self._drained = True
+                callbacks, self._on_drained = self._on_drained, []
+            for callback in callbacks:
+                callback()
+
+
+class AgentProcessPool:
+    """
+    Persistent process pool for agents registered with execution="process".
+
+    Why this exists:
+    - CPU-bound run() calls hold the GIL: on threads they serialize
+      every other sync agent in the worker. In child processes they use
+      every core
+    - Starting an interpreter and importing agents is slow, so workers
+      are started once (start(), FastAPI lifespan) and reused
+
+    Behavior:
+    - Executions submitted from the event loop in the same loop pass
+      (a batch, concurrent requests) are grouped into chunks of up to
+      MAX_CHUNK_SIZE, spread over the workers, so IPC is paid per chunk
+      rather than per execution (large batches of small executions)
+    - Each chunked execution's outcome comes back on its own as soon as
+      it finishes (_ResultChannel), so a slow execution never delays, or
+      turns into a timeout, the faster ones sharing its chunk
+    - A chunk whose executions were all abandoned (deadline, client
+      gone) before a worker picked it up is cancelled; executions that
+      expire while queued inside a running chunk are skipped
+    - Inputs, AgentContext and outputs are pickled; ctx.deadline stays
+      valid in workers (time.monotonic() is system-wide)
+    - A crashed worker breaks the pool: pending executions fail (once
+      the outcomes its workers already sent were delivered) and the
+      pool is rebuilt on next use
+    - Worker agents load tier profiles once; recycle() (tier profile
+      reload) replaces the workers
+    """
+
+    def __init__(
+        self,
+        warm: Callable[[], Iterable[AgentTarget]] = lambda: (),
+        workers: int = DEFAULT_PROCESS_WORKERS,
+        chunk_size: int = MAX_CHUNK_SIZE,
+        start_method: str = DEFAULT_START_METHOD,
+    ) -> None:
+        # Agents to build in every worker when it starts
+        self._warm = warm
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.start_method = start_method
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._channel: Optional[_ResultChannel] = None
+        self._lock = threading.Lock()
+
+        # Executions waiting for the next flush (event loop submissions)
+        self._pending: List[Tuple[_Task, "asyncio.Future[Any]"]] = []
+        self._flush_scheduled = False
+
+        # Chunked executions sent to a worker: task id -> submitter future
+        # (removed when the outcome arrives or the submitter gives up)
+        self._waiting: Dict[int, "asyncio.Future[Any]"] = {}
+        self._task_ids = itertools.count()
+
+        # Counters (exposed through stats())
+        self.executions = 0
+        self.chunks = 0
+        self.cancelled_chunks = 0
+        self.crashes = 0
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        The worker pool (created on first use).
+        """
+        executor = self._executor
+        if executor is None:
+            executor = self._pool()[0]
+        return executor
+
+    def _pool(self) -> Tuple[ProcessPoolExecutor, _ResultChannel]:
+        """
+        The worker pool and its result channel (created on first use).
+        """
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method)
+                channel = _ResultChannel(context, self._dispatch)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(list(self._warm()), channel.writer),
+                )
+                self._channel = channel
+            return self._executor, self._channel
+
+    async def start(self) -> None:
+        """
+        Start every worker now and wait until they are warm (FastAPI
+        lifespan). Does nothing when no agent runs in a process.
+        """
+        if not list(self._warm()):
+            return
+        executor = self.executor()
+        await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(_ping)) for _ in range(self.workers)
+        ))
+
+    def recycle(self) -> None:
+        """
+        Replace the workers (running executions finish on the old ones).
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            channel, self._channel = self._channel, None
+        if executor is not None:
+            self._retire(executor, channel)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the workers; queued executions are cancelled.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            channel, self._channel = self._channel, None
+        if executor is not None:
+            self._retire(executor, channel, wait=wait, cancel_futures=True)
+
+    # --------------------------------------------------------
+    # Submission
+    # --------------------------------------------------------
+    def run(
+        self,
+        agent: AgentTarget,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+        timeout: Optional[float] = None,
+    ) -> "Future[Outcome]":
+        """
+        Submit one execution from sync code (result: an Outcome, see unwrap).
+        """
+        future, _ = self._submit(_run_one, agent[0], agent[1], input_data, ctx, _expires(timeout))
+        future.add_done_callback(self._check_crash)
+        self.executions += 1
+        self.chunks += 1
+        return future
+
+    def submit(
+        self,
+        agent: AgentTarget,
+        input_data: Dict[str, Any],
+        ctx: AgentContext,
+        timeout: Optional[float] = None,
+    ) -> "asyncio.Future[Any]":
+        """
+        Queue one execution from the event loop.
+
+        Returns a future resolved with the output (or ProcessAgentError);
+        cancelling it abandons the execution. Past `timeout` seconds a
+        worker skips it if it has not started yet.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        task = (agent[0], agent[1], input_data, ctx, _expires(timeout))
+        with self._lock:
+            self._pending.append((task, future))
+            schedule = not self._flush_scheduled
+            self._flush_scheduled = True
+        if schedule:
+            loop.call_soon(self._flush)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "started": self.started,
+            "start_method": self.start_method,
+            "chunk_size": self.chunk_size,
+            "executions": self.executions,
+            "chunks": self.chunks,
+            "cancelled_chunks": self.cancelled_chunks,
+            "crashes": self.crashes,
+        }
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._flush_scheduled = False
+
+        live = [(task, future) for task, future in pending if not future.done()]
+        for chunk in self._split(live):
+            ids = [self._wait_for(future) for _, future in chunk]
+            try:
+                submitted, channel = self._submit(_run_chunk, list(zip(ids, (task for task, _ in chunk))))
+            except Exception as e:
+                # Shut down or broken between two flushes
+                self._fail_waiting(ids, e)
+                continue
+
+            self.executions += len(chunk)
+            self.chunks += 1
+            submitted.add_done_callback(
+                lambda done, ids=ids, channel=channel: self._deliver(ids, done, channel)
+            )
+            self._cancel_when_abandoned(chunk, submitted)
+
+    def _wait_for(self, future: "asyncio.Future[Any]") -> int:
+        """
+        Register a submitter future under a new task id.
+        """
+        task_id = next(self._task_ids)
+        self._waiting[task_id] = future
+        future.add_done_callback(lambda _: self._waiting.pop(task_id, None))
+        return task_id
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Tuple["Future[Any]", _ResultChannel]:
+        """
+        Submit to the pool, rebuilding it once if a worker crash broke it.
+        Returns the future and the channel its outcomes come back on.
+        """
+        try:
+            executor, channel = self._pool()
+            return executor.submit(fn, *args), channel
+        except BrokenProcessPool:
+            self._discard_broken()
+            executor, channel = self._pool()
+            return executor.submit(fn, *args), channel
+
+    def _check_crash(self, done: "Future[Any]") -> None:
+        """
+        Rebuild the pool when a worker died under this execution.
+        """
+        if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+            self._discard_broken()
+
+    def _discard_broken(self) -> None:
+        # Every future of a broken pool reports the crash: only the
+        # first one replaces it (not a newer, healthy pool)
+        with self._lock:
+            executor = self._executor
+            if executor is None or not getattr(executor, "_broken", False):
+                return
+            self._executor = None
+            channel, self._channel = self._channel, None
+        self.crashes += 1
+        logger.error("processes.worker_crashed workers=%s", self.workers)
+        self._retire(executor, channel)
+
+    @staticmethod
+    def _retire(
+        executor: ProcessPoolExecutor,
+        channel: Optional[_ResultChannel],
+        wait: bool = False,
+        cancel_futures: bool = False,
+    ) -> None:
+        """
+        Shut an executor down, then close its result channel once its
+        workers exited (in the background unless wait).
+        """
+        def retire() -> None:
+            executor.shutdown(wait=True, cancel_futures=cancel_futures)
+            if channel is not None:
+                channel.close()
+
+        if wait:
+            retire()
+        else:
+            threading.Thread(target=retire, name="operatorx-process-retire", daemon=True).start()
+
+    def _split(self, items: List[Any]) -> List[List[Any]]:
+        """
+        Chunks of at most chunk_size, but at least CHUNKS_PER_WORKER per
+        worker (while there are items): a chunk's executions run one
+        after the other, so small batches are not grouped at all and one
+        slow execution only delays the few queued behind it.
+        """
+        if not items:
+            return []
+        count = max(-(-len(items) // self.chunk_size), min(len(items), self.workers * CHUNKS_PER_WORKER))
+        size = -(-len(items) // count)
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    def _cancel_when_abandoned(
+        self, chunk: List[Tuple[_Task, "asyncio.Future[Any]"]], submitted: "Future[List[Outcome]]"
+    ) -> None:
+        remaining = [len(chunk)]
+
+        def abandoned(future: "asyncio.Future[Any]") -> None:
+            if not future.cancelled():
+                return
+            remaining[0] -= 1
+            if remaining[0] == 0 and submitted.cancel():
+                self.cancelled_chunks += 1
+
+        for _, future in chunk:
+            future.add_done_callback(abandoned)
+
+    def _dispatch(self, task_id: int, outcome: Outcome) -> None:
+        """
+        Hand one execution's outcome to its submitter's loop (called
+        from the result channel thread).
+        """
+        future = self._waiting.pop(task_id, None)
+        if future is not None:
+            _settle(future, outcome=outcome)
+
+    def _deliver(self, ids: List[int], done: "Future[None]", channel: _ResultChannel) -> None:
+        """
+        Fail what a chunk left unanswered when it did not complete (worker
+        crash, shutdown); completed chunks already sent every outcome
+        through the result channel. Called from the pool's management
+        thread.
+
+        After a crash, outcomes the chunk sent before its worker died may
+        still be in the channel: the rest of the chunk is failed only once
+        the retired channel has dispatched them.
+        """
+        if done.cancelled():
+            self._fail_waiting(ids, None)
+            return
+        error = done.exception()
+        if error is None:
+            return
+        if isinstance(error, BrokenProcessPool):
+            self._check_crash(done)
+            channel.when_drained(lambda: self._fail_waiting(ids, error))
+            return
+        self._fail_waiting(ids, error)
+
+    def _fail_waiting(self, ids: List[int], error: Optional[BaseException]) -> None:
+        """
+        Settle executions still waiting with error (None: cancel them).
+        """
+        for task_id in ids:
+            future = self._waiting.pop(task_id, None)
+            if future is not None:
+                _settle(future, error=error)
+
+
+def _expires(timeout: Optional[float]) -> Optional[float]:
+    return None if timeout is None else time.monotonic() + timeout
+
+
+def _settle(
+    future: "asyncio.Future[Any]",
+    outcome: Optional[Outcome] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    try:
+        if outcome is None and error is None:
+            future.get_loop().call_soon_threadsafe(future.cancel)
+        else:
+            future.get_loop().call_soon_threadsafe(_resolve, future, outcome, error)
+    except RuntimeError:
+        # The submitter's loop is closed: nobody is waiting
+        pass
+
+
+def _resolve(future: "asyncio.Future[Any]", outcome: Optional[Outcome], error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+        return
+    try:
+        future.set_result(unwrap(outcome))
+    except ProcessAgentError as e:
+        future.set_exception(e)
@@ -0,0 +1,394 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.admission import DEFAULT_ADMISSION_LIMITS, AdmissionLimits, compile_limits
+
+
+logger = logging.getLogger("operatorx.core.profiles")
+
+
+# ------------------------------------------------------------
+# Profile location + reload defaults
+# ------------------------------------------------------------
+# One profile per tier: <deployments>/<tier>/profile.json
+PROFILE_FILENAME = "profile.json"
+
+# Repository deployments/ directory (override with OPERATORX_DEPLOYMENTS_DIR)
+DEFAULT_DEPLOYMENTS_DIR = Path(__file__).resolve().parents[3] / "deployments"
+
+# Tier used when the header is missing or unknown
+DEFAULT_TIER = "personal"
+
+# How often the watcher checks profile files for changes
+DEFAULT_RELOAD_INTERVAL_SECONDS = 2.0
+
+# Distinct raw header values remembered by normalize()
+MAX_NORMALIZE_CACHE = 1024
+
+
+class ProfileError(ValueError):
+    """
+    A tier profile file is missing required fields or malformed.
+    """
+
+
+@dataclass(frozen=True)
+class TierProfile:
+    """
+    Compiled, immutable behavior of one deployment tier.
+
+    Why this exists:
+    - Tier behavior (plan steps, tier notes, logging, governance gates,
+      admission limits) lives in deployments/<tier>/profile.json instead of if/elif chains
+    - Compiled once (tuples, interned strings, read-only mappings) so
+      agents read it in O(1) on every call without building lists
+    - New tiers only need a new profile directory
+    """
+    name: str
+    description: str = ""
+    log_level: int = logging.INFO
+    # Share of requests whose INFO / DEBUG lines are kept (warnings and
+    # errors are always logged)
+    log_sample_rate: float = 1.0
+    # Executions are recorded in the audit log (app.core.audit)
+    audit: bool = False
+    governance_gates: Tuple[str, ...] = ()
+    aliases: Tuple[str, ...] = ()
+    admission: AdmissionLimits = DEFAULT_ADMISSION_LIMITS
+
+    # agent name -> section name -> tuple of strings
+    agents: Mapping[str, Mapping[str, Tuple[str, ...]]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def section(self, agent: str, key: str) -> Tuple[str, ...]:
+        """
+        Tier-specific strings for one agent (empty when not configured).
+        """
+        return self.agents.get(agent, _EMPTY_SECTION).get(key, ())
+
+    def logs(self, level: int, request_id: Optional[str] = None) -> bool:
+        """
+        True when messages at `level` should be logged for this tier.
+
+        Below WARNING, only a log_sample_rate share of requests is kept;
+        the decision hashes request_id, so a request keeps all of its
+        lines or none of them.
+        """
+        if level < self.log_level:
+            return False
+        if level >= logging.WARNING or self.log_sample_rate >= 1.0:
+            return True
+        if request_id is None:
+            return self.log_sample_rate > 0.0
+        return (hash(request_id) & 0xFFFF) < self.log_sample_rate * 0x10000
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "description": self.description,
+            "log_level": logging.getLevelName(self.log_level),
+            "log_sample_rate": self.log_sample_rate,
+            "audit": self.audit,
+            "governance_gates": list(self.governance_gates),
+            "aliases": list(self.aliases),
+            "admission": self.admission.describe(),
+            "agents": {
+                agent: {key: list(values) for key, values in sections.items()}
+                for agent, sections in self.agents.items()
+            },
+        }
+
+
+_EMPTY_SECTION: Mapping[str, Tuple[str, ...]] = MappingProxyType({})
+
+# Returned for tiers without a profile (no tier-specific behavior)
+EMPTY_PROFILE = TierProfile(name="")
+
+
+def _strings(value: Any, where: str) -> Tuple[str, ...]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ProfileError(f"{where} must be a list of strings")
+    return tuple(sys.intern(item) for item in value)
+
+
+def compile_profile(raw: Mapping[str, Any], default_name: str) -> TierProfile:
+    """
+    Validate one parsed profile.json and freeze it.
+
+    Raises:
+        ProfileError if a field has the wrong type.
+    """
+    name = raw.get("tier", default_name)
+    if not isinstance(name, str) or not name.strip():
+        raise ProfileError("tier must be a non-empty string")
+    name = sys.intern(name.strip().lower())
+
+    level_name = raw.get("log_level", "INFO")
+    log_level = logging.getLevelName(str(level_name).upper())
+    if not isinstance(log_level, int):
+        raise ProfileError(f"{name}: unknown log_level {level_name!r}")
+
+    sample_rate = raw.get("log_sample_rate", 1.0)
+    if isinstance(sample_rate, bool) or not isinstance(sample_rate, (int, float)) or not 0.0 <= sample_rate <= 1.0:
+        raise ProfileError(f"{name}: log_sample_rate must be a number between 0 and 1")
+
+    audit = raw.get("audit", False)
+    if not isinstance(audit, bool):
+        raise ProfileError(f"{name}: audit must be true or false")
+
+    admission = raw.get("admission") or {}
+    if not isinstance(admission, Mapping):
+        raise ProfileError(f"{name}: admission must be an object")
+    try:
+        admission_limits = compile_limits(admission, f"{name}: admission")
+    except ValueError as e:
+        raise ProfileError(str(e)) from None
+
+    agents: Dict[str, Mapping[str, Tuple[str, ...]]] = {}
+    for agent, sections in (raw.get("agents") or {}).items():
+        if not isinstance(sections, Mapping):
+            raise ProfileError(f"{name}: agents.{agent} must be an object")
+        agents[sys.intern(agent)] = MappingProxyType({
+            sys.intern(key): _strings(values, f"{name}: agents.{agent}.{key}")
+            for key, values in sections.items()
+        })
+
+    return TierProfile(
+        name=name,
+        description=str(raw.get("description", "")),
+        log_level=log_level,
+        log_sample_rate=float(sample_rate),
+        audit=audit,
+        governance_gates=_strings(raw.get("governance_gates", []), f"{name}: governance_gates"),
+        aliases=tuple(
+            sys.intern(alias.strip().lower())
+            for alias in _strings(raw.get("aliases", []), f"{name}: aliases")
+        ),
+        admission=admission_limits,
+        agents=MappingProxyType(agents),
+    )
+
+
+class TierProfiles:
+    """
+    Loaded tier profiles + header normalization, with hot reload.
+
+    Concurrency:
+    - Readers use whatever snapshot is current; a reload builds new
+      dicts and swaps them in one assignment (no locks on the read path)
+    - An invalid profile on reload is logged and the previous profiles
+      stay active
+
+    Listeners (add_listener) run after every successful reload, ex: the
+    engine clears its result cache because tier outputs changed.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        default_tier: str = DEFAULT_TIER,
+    ) -> None:
+        self.directory = Path(
+            directory or os.getenv("OPERATORX_DEPLOYMENTS_DIR") or DEFAULT_DEPLOYMENTS_DIR
+        )
+        self.default_tier = default_tier
+
+        self._profiles: Dict[str, TierProfile] = {}
+        self._aliases: Dict[str, str] = {}
+        self._normalized: Dict[str, str] = {}
+        self._fingerprint: Tuple[Tuple[str, int, int], ...] = ()
+        self._failed_fingerprint: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self._listeners: List[Callable[[], None]] = []
+        self._watcher: Optional[asyncio.Task] = None
+
+        self.loaded_at: Optional[float] = None
+        self.reloads = 0
+
+        self.load()
+
+    # --------------------------------------------------------
+    # Read path (hot)
+    # --------------------------------------------------------
+    def get(self, tier: str) -> TierProfile:
+        """
+        Profile for a tier (EMPTY_PROFILE when the tier is unknown).
+        """
+        return self._profiles.get(tier, EMPTY_PROFILE)
+
+    def normalize(self, value: Optional[str]) -> str:
+        """
+        Map a raw X-OperatorX-Tier header to a known tier.
+
+        Missing or unknown values fall back to the default tier. Results
+        are memoized per raw value, so the usual handful of header
+        spellings are a single dict lookup.
+        """
+        if not value:
+            return self.default_tier
+
+        tier = self._normalized.get(value)
+        if tier is not None:
+            return tier
+
+        cleaned = value.strip().lower()
+        tier = self._aliases.get(cleaned, self.default_tier)
+
+        normalized = self._normalized
+        if len(normalized) >= MAX_NORMALIZE_CACHE:
+            # Clients sending random values cannot grow this unbounded
+            normalized = {}
+            self._normalized = normalized
+        normalized[value] = tier
+        return tier
+
+    def tiers(self) -> List[str]:
+        return sorted(self._profiles)
+
+    def __contains__(self, tier: str) -> bool:
+        return tier in self._profiles
+
+    # --------------------------------------------------------
+    # Loading
+    # --------------------------------------------------------
+    def load(self) -> None:
+        """
+        (Re)load every <directory>/<tier>/profile.json and swap them in.
+
+        Raises:
+            ProfileError / OSError / ValueError if a profile is invalid or
+            the directory holds no profile at all.
+        """
+        fingerprint = self._scan()
+        profiles: Dict[str, TierProfile] = {}
+
+        for path, _, _ in fingerprint:
+            with open(path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+            profile = compile_profile(raw, Path(path).parent.name)
+            if profile.name in profiles:
+                raise ProfileError(f"duplicate tier {profile.name!r} in {path}")
+            profiles[profile.name] = profile
+
+        if not profiles:
+            # Every tier would silently fall back to an empty profile
+            # (no audit, no governance gates): refuse to start instead
+            raise ProfileError(
+                f"no {PROFILE_FILENAME} found under {self.directory} "
+                "(set OPERATORX_DEPLOYMENTS_DIR to the deployments directory)"
+            )
+
+        aliases: Dict[str, str] = {name: name for name in profiles}
+        for profile in profiles.values():
+            for alias in profile.aliases:
+                aliases.setdefault(alias, profile.name)
+
+        # Swap (readers see either the old or the new set, never a mix
+        # of profile versions)
+        self._profiles = profiles
+        self._aliases = aliases
+        self._normalized = {}
+        self._fingerprint = fingerprint
+        self.loaded_at = time.time()
+
+        logger.info(
+            "profiles.loaded directory=%s tiers=%s",
+            self.directory, ",".join(sorted(profiles)),
+        )
+
+        for listener in list(self._listeners):
+            try:
+                listener()
+            except Exception:
+                logger.exception("profiles.listener failed")
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reload when a profile file was added, removed or modified.
+
+        Returns True if profiles were reloaded. Errors are logged once per
+        broken version of the files and the current profiles are kept.
+        """
+        fingerprint: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        try:
+            fingerprint = self._scan()
+            if fingerprint in (self._fingerprint, self._failed_fingerprint):
+                return False
+            self.load()
+        except Exception:
+            self._failed_fingerprint = fingerprint
+            logger.exception("profiles.reload failed (keeping previous profiles)")
+            return False
+
+        self._failed_fingerprint = None
+
+        self.reloads += 1
+        return True
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Call listener() after every successful (re)load.
+        """
+        self._listeners.append(listener)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "directory": str(self.directory),
+            "default_tier": self.default_tier,
+            "loaded_at": self.loaded_at,
+            "reloads": self.reloads,
+            "tiers": {name: profile.describe() for name, profile in sorted(self._profiles.items())},
+        }
+
+    def _scan(self) -> Tuple[Tuple[str, int, int], ...]:
+        if not self.directory.is_dir():
+            return ()
+
+        entries = []
+        for path in sorted(self.directory.glob(f"*/{PROFILE_FILENAME}")):
+            stat = path.stat()
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(entries)
+
+    # --------------------------------------------------------
+    # Hot reload (FastAPI lifespan)
+    # --------------------------------------------------------
+    async def watch(self, interval: float = DEFAULT_RELOAD_INTERVAL_SECONDS) -> None:
+        """
+        Poll profile files until cancelled and reload on change.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.reload_if_changed()
+
+    def start(self, interval: float = DEFAULT_RELOAD_INTERVAL_SECONDS) -> asyncio.Task:
+        if self._watcher is None or self._watcher.done():
+            self._watcher = asyncio.create_task(self.watch(interval))
+        return self._watcher
+
+    async def stop(self) -> None:
+        task, self._watcher = self._watcher, None
+        if task is None:
+            return
+
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+
+# ------------------------------------------------------------
+# Singleton (shared across the backend process)
+# ------------------------------------------------------------
+tier_profiles = TierProfiles()
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Union
+
+from starlette.responses import Response
+
+try:  # Optional dependency: pip install orjson
+    import orjson
+except ImportError:  # pragma: no cover (depends on the environment)
+    orjson = None
+
+
+# ------------------------------------------------------------
+# Configuration
+# ------------------------------------------------------------
+# Opt-in fast response path: routes return engine outputs encoded once
+# as raw bytes instead of building pydantic models that FastAPI then
+# validates and re-encodes. Enable with OPERATORX_FAST_JSON=1.
+FAST_JSON = os.getenv("OPERATORX_FAST_JSON", "").strip().lower() in {"1", "true", "yes", "on"}
+
+# Encoder actually used ("orjson" when installed, else "json")
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+# ------------------------------------------------------------
+# Encoders (built once, reused for every call)
+# ------------------------------------------------------------
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Encode obj as compact UTF-8 JSON bytes.
+
+        Unknown types are encoded with str() (same as the stdlib path).
+        """
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """
+        Decode JSON; bytes-like input (ex: a memoryview over a mmap) is
+        parsed in place without copying.
+        """
+        return orjson.loads(data)
+
+else:
+    # Same output settings as FastAPI's JSONResponse, compiled once
+    # (json.dumps(**kwargs) builds a new encoder on every call)
+    _ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Encode obj as compact UTF-8 JSON bytes.
+
+        Unknown types are encoded with str() (same as the orjson path).
+        """
+        return _ENCODER.encode(obj).encode("utf-8")
+
+    def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """
+        Decode JSON (memoryviews are copied once: json needs bytes/str).
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class FastJSONResponse(Response):
+    """
+    JSONResponse that encodes with dumps() (orjson when available).
+
+    Content that is already bytes is sent as-is, so routes can return
+    pre-encoded engine outputs without a second encoding pass.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray)):
+            return bytes(content)
+        return dumps(content)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+
+# ------------------------------------------------------------
+# Environment
+# ------------------------------------------------------------
+# OPERATORX_COALESCE=0 disables request coalescing (every call runs
+# its own execution, as before)
+COALESCING_ENABLED = os.getenv("OPERATORX_COALESCE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class _Flight:
+    """
+    One shared execution and how many callers are waiting for it.
+    """
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Share one in-flight execution between identical concurrent calls.
+
+    Why this exists:
+    - A dashboard refresh sends dozens of identical requests within
+      milliseconds; before the first one finishes the result cache has
+      nothing to serve, so each of them ran the agent
+    - Coalescing needs no storage: a flight only lives while it runs
+
+    Behavior:
+    - The first caller for a key (leader) starts the work as a task;
+      callers arriving before it finishes (followers) await the same
+      task. Everyone gets the same output, or the same exception
+    - The work is shielded from any single caller: a caller that goes
+      away (cancelled) does not cancel it for the others; it is only
+      cancelled once every caller went away
+    - Flights are kept per event loop (a task cannot be awaited from
+      another loop)
+    """
+
+    def __init__(self) -> None:
+        # loop -> key -> flight
+        self._flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, _Flight]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+        # Counters (exposed through stats())
+        self.leaders = 0
+        self.followers = 0
+
+    async def run(self, key: Hashable, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run work() once for every concurrent caller with the same key.
+
+        Returns (output, shared): shared is True for followers.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flights = self._flights.get(loop)
+            if flights is None:
+                flights = self._flights[loop] = {}
+
+        flight = flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = _Flight(loop.create_task(work()))
+            flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._land(flights, key, flight))
+            self.leaders += 1
+        else:
+            self.followers += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Every caller went away
+                flight.task.cancel()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return sum(len(flights) for flights in self._flights.values())
+
+    def stats(self) -> Dict[str, Any]:
+        calls = self.leaders + self.followers
+        return {
+            "in_flight": self.in_flight(),
+            "executions": self.leaders,
+            "coalesced": self.followers,
+            "coalesce_ratio": round(self.followers / calls, 4) if calls else 0.0,
+        }
+
+    def collect(self) -> Iterable[Tuple[str, str, str, Dict[str, str], float]]:
+        """
+        Scrape-time coalescing counters (MetricsRegistry collector).
+        """
+        help_text = "Coalescable agent calls by role (leader runs the agent, follower shares it)."
+        yield ("operatorx_coalesced_calls_total", "counter", help_text, {"role": "leader"}, self.leaders)
+        yield ("operatorx_coalesced_calls_total", "counter", help_text, {"role": "follower"}, self.followers)
+        yield ("operatorx_coalesce_in_flight", "gauge", "Shared executions currently running.", {}, self.in_flight())
+
+    @staticmethod
+    def _land(flights: Dict[Hashable, _Flight], key: Hashable, flight: _Flight) -> None:
+        # Later calls start a new flight (results are not kept)
+        if flights.get(key) is flight:
+            del flights[key]
+        if not flight.task.cancelled():
+            # Retrieved here so a failure nobody awaited is not logged
+            flight.task.exception()
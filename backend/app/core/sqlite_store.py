@@ -0,0 +1,493 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from app.core.memory import (
+    Cursor,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_QUERY_LIMIT,
+    DEFAULT_MAX_RECORDS,
+    DEFAULT_TIER_TTLS,
+    DEFAULT_TTL_SECONDS,
+    MAX_QUERY_LIMIT,
+    InMemoryStore,
+    MemoryRecord,
+    MemoryStore,
+    record_summary,
+)
+from app.core.serialization import loads
+
+
+logger = logging.getLogger("operatorx.core.sqlite_store")
+
+
+# ------------------------------------------------------------
+# Write-behind defaults
+# ------------------------------------------------------------
+# Pending upserts are flushed at least this often (seconds) ...
+DEFAULT_FLUSH_INTERVAL_SECONDS = 0.05
+
+# ... or as soon as this many distinct records are waiting.
+DEFAULT_FLUSH_BATCH = 500
+
+# How long a writer waits on a locked database before failing
+BUSY_TIMEOUT_MS = 5000
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_records (
+    request_id TEXT PRIMARY KEY,
+    tier       TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data       TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memory_records_tier_updated
+    ON memory_records (tier, updated_at);
+"""
+
+_UPSERT = """
+INSERT INTO memory_records (request_id, tier, created_at, updated_at, data)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT(request_id) DO UPDATE SET
+    tier = excluded.tier,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+"""
+
+Row = Tuple[str, str, float, float, str]
+
+
+def _to_row(record: MemoryRecord) -> Row:
+    return (
+        record.request_id,
+        record.tier,
+        record.created_at,
+        record.updated_at,
+        record.payload_json().decode("utf-8"),
+    )
+
+
+def _from_row(row: Row) -> MemoryRecord:
+    request_id, tier, created_at, updated_at, data = row
+    return MemoryRecord(
+        request_id=request_id,
+        tier=tier,
+        created_at=created_at,
+        updated_at=updated_at,
+        data=loads(data),
+    )
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """
+    Memory store persisted in a local SQLite database (WAL mode).
+
+    Why this exists:
+    - `uvicorn --workers N` runs N processes; /memory must find a record
+      no matter which worker served the original request
+    - Survives restarts (unlike InMemoryStore)
+
+    How it stays fast:
+    - Records created by this worker stay in an in-process InMemoryStore
+      (hot cache); reads of those never touch the database. Records
+      created by other workers (or before a restart) are never cached:
+      every read and update loads the current row
+    - upsert/update only queue the serialized row; a background writer
+      coalesces rows per request_id and flushes them in one transaction
+      per batch, so request latency never includes an fsync
+    - WAL mode lets readers in every worker proceed while a writer commits
+
+    Trade-offs:
+    - Writes become visible to other workers after the next flush
+      (DEFAULT_FLUSH_INTERVAL_SECONDS)
+    - A record stays in the hot cache of the worker that created it:
+      while it is cached there, that worker does not see (and its next
+      update overwrites) changes other workers made to the record
+    - Rows still queued when the process is killed (not stopped) are lost
+    - query() reads the database (after flushing this worker's queue)
+      instead of the in-process indexes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_records: int = DEFAULT_MAX_RECORDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        tier_ttls: Optional[Mapping[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        flush_batch: int = DEFAULT_FLUSH_BATCH,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.tier_ttls: Dict[str, float] = dict(
+            DEFAULT_TIER_TTLS if tier_ttls is None else tier_ttls
+        )
+        self.default_ttl = default_ttl
+
+        # Hot records written by this worker
+        self._cache = InMemoryStore(
+            max_records=max_records,
+            max_bytes=max_bytes,
+            tier_ttls=self.tier_ttls,
+            default_ttl=default_ttl,
+        )
+
+        # Write-behind queue: request_id -> latest row (coalesced)
+        self._pending: Dict[str, Row] = {}
+        self._pending_lock = threading.Lock()
+
+        # Batch being committed (still readable until the commit is done)
+        self._flushing: Dict[str, Row] = {}
+        self._flush_lock = threading.Lock()
+
+        # Serializes updates of records this worker does not cache
+        self._remote_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._sweep_requested = threading.Event()
+        self._stopping = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+        # Reader connections (sqlite3 connections are per thread)
+        self._local = threading.local()
+
+        # Counters (exposed through stats())
+        self._flushes = 0
+        self._rows_written = 0
+        self._db_reads = 0
+        self._db_hits = 0
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+    def get(self, request_id: str) -> Optional[MemoryRecord]:
+        """
+        Hot cache first, then the database (records from other workers).
+        """
+        record = self._cache.get(request_id)
+        if record is not None:
+            return record
+        return self._load(request_id)
+
+    def upsert(self, record: MemoryRecord) -> MemoryRecord:
+        self._cache.upsert(record)
+        self._enqueue(_to_row(record))
+        return record
+
+    def get_or_create(self, request_id: str, tier: str) -> MemoryRecord:
+        record = self._cache.get(request_id)
+        if record is not None:
+            return record
+
+        # Another worker (or a previous run) may own this request_id:
+        # hand out the stored row without caching it (see update)
+        loaded = self._load(request_id)
+        if loaded is not None:
+            return loaded
+
+        created = self._cache.get_or_create(request_id, tier)
+        self._enqueue(_to_row(created))
+        return created
+
+    def update(
+        self,
+        request_id: str,
+        fn: Callable[[MemoryRecord], None],
+        tier: Optional[str] = None,
+    ) -> Optional[MemoryRecord]:
+        if self._cache.get(request_id) is None:
+            # Owned by another worker: update the stored row, uncached,
+            # so later reads here never see a copy that worker outdated
+            with self._remote_lock:
+                if self._cache.get(request_id) is None:
+                    loaded = self._load(request_id)
+                    if loaded is not None:
+                        fn(loaded)
+                        loaded.updated_at = time.time()
+                        self._enqueue(_to_row(loaded))
+                        return loaded
+
+        rows: List[Row] = []
+
+        def apply(record: MemoryRecord) -> None:
+            fn(record)
+            # Serialize under the record's lock so the row is consistent
+            # (packing first: packed values are encoded only once). The
+            # cache keeps this timestamp, so the row and the cached copy
+            # expire together
+            record.updated_at = time.time()
+            record.pack(self._cache.packed_keys)
+            rows.append(_to_row(record))
+
+        record = self._cache.update(request_id, apply, tier=tier, touch=False)
+        if rows:
+            self._enqueue(rows[-1])
+        return record
+
+    def snapshot(self, request_id: str) -> Optional[MemoryRecord]:
+        """
+        Copy of the record; records created by other workers are read
+        fresh from the database (they are never cached here).
+        """
+        record = self._cache.snapshot(request_id)
+        if record is not None:
+            return record
+        return self._load(request_id)
+
+    def snapshot_json(self, request_id: str) -> Optional[bytes]:
+        encoded = self._cache.snapshot_json(request_id)
+        if encoded is not None:
+            return encoded
+        return super().snapshot_json(request_id)
+
+    def query(
+        self,
+        tier: Optional[str] = None,
+        agent: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        min_duration_ms: Optional[float] = None,
+        limit: int = DEFAULT_QUERY_LIMIT,
+        cursor: Optional[Cursor] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Cursor]]:
+        """
+        Find executions of every worker, newest first (same filters and
+        paging as InMemoryStore.query).
+
+        Rows queued by this worker are flushed first, then the database
+        is queried (ordered by updated_at, rowid). Cursors are
+        (updated_at, 0, rowid).
+        """
+        limit = max(1, min(limit, MAX_QUERY_LIMIT))
+        self.flush()
+
+        where: List[str] = []
+        params: List[Any] = []
+
+        # Not expired: per-tier TTL, default TTL for other tiers
+        ttl = "?"
+        if self.tier_ttls:
+            ttl = "CASE tier " + "WHEN ? THEN ? " * len(self.tier_ttls) + "ELSE ? END"
+        where.append(f"updated_at >= ? - {ttl}")
+        params.append(time.time())
+        for name, seconds in self.tier_ttls.items():
+            params.extend((name, seconds))
+        params.append(self.default_ttl)
+
+        if tier:
+            where.append("tier = ?")
+            params.append(tier)
+        if agent:
+            where.append("json_extract(data, '$.last_agent') = ?")
+            params.append(agent)
+        if status:
+            where.append("json_extract(data, '$.last_ok') = ?")
+            params.append(1 if status == "ok" else 0)
+        if since is not None:
+            where.append("updated_at >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("updated_at <= ?")
+            params.append(until)
+        if min_duration_ms is not None:
+            where.append("coalesce(json_extract(data, '$.last_duration_ms'), 0) >= ?")
+            params.append(min_duration_ms)
+        if cursor is not None:
+            stamp, _, rowid = cursor
+            where.append("(updated_at, rowid) < (?, ?)")
+            params.extend((stamp, rowid))
+
+        self._db_reads += 1
+        rows = self._connection().execute(
+            "SELECT request_id, tier, created_at, updated_at, data, rowid "
+            "FROM memory_records WHERE " + " AND ".join(where)
+            + " ORDER BY updated_at DESC, rowid DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+
+        page = rows[:limit]
+        items = [record_summary(_from_row(row[:5])) for row in page]
+        if len(rows) > limit:
+            last = page[-1]
+            return items, (last[3], 0, last[5])
+        return items, None
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Drop expired hot records now; expired rows are deleted by the
+        writer thread on its next pass.
+        """
+        removed = self._cache.sweep(now)
+        self._sweep_requested.set()
+        self._wake.set()
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        cache = self._cache.stats()
+        with self._pending_lock:
+            pending = len(self._pending)
+        return {
+            **cache,
+            "backend": "sqlite",
+            "path": self.path,
+            "pending_writes": pending,
+            "flushes": self._flushes,
+            "rows_written": self._rows_written,
+            "db_reads": self._db_reads,
+            "db_hits": self._db_hits,
+        }
+
+    def flush(self) -> None:
+        """
+        Write every pending row now (from the calling thread).
+        """
+        self._flush_pending(self._connection())
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+    def start(self) -> None:
+        """
+        Start the sweeper and the background writer thread.
+        """
+        super().start()
+        if self._writer is None or not self._writer.is_alive():
+            self._stopping.clear()
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                name="operatorx-sqlite-writer",
+                daemon=True,
+            )
+            self._writer.start()
+
+    async def stop(self) -> None:
+        """
+        Stop the sweeper, then drain and stop the writer.
+        """
+        await super().stop()
+
+        writer, self._writer = self._writer, None
+        if writer is not None:
+            self._stopping.set()
+            self._wake.set()
+            writer.join()
+
+        # Anything queued without a running writer (or after it exited)
+        self.flush()
+
+    # --------------------------------------------------------
+    # Internals
+    # --------------------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commits are durable across process crashes and
+        # only fsync at checkpoints
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _load(self, request_id: str) -> Optional[MemoryRecord]:
+        # Rows queued by this worker but not committed yet
+        with self._pending_lock:
+            row = self._pending.get(request_id) or self._flushing.get(request_id)
+
+        if row is None:
+            self._db_reads += 1
+            row = self._connection().execute(
+                "SELECT request_id, tier, created_at, updated_at, data "
+                "FROM memory_records WHERE request_id = ?",
+                (request_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db_hits += 1
+
+        record = _from_row(row)
+        ttl = self.tier_ttls.get(record.tier, self.default_ttl)
+        if time.time() - record.updated_at > ttl:
+            return None
+        return record
+
+    def _enqueue(self, row: Row) -> None:
+        with self._pending_lock:
+            self._pending[row[0]] = row
+            full = len(self._pending) >= self.flush_batch
+        if full:
+            self._wake.set()
+
+    def _run_writer(self) -> None:
+        conn = self._connect()
+        try:
+            while True:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+
+                try:
+                    self._flush_pending(conn)
+                    if self._sweep_requested.is_set():
+                        self._sweep_requested.clear()
+                        self._delete_expired(conn)
+                except Exception:
+                    logger.exception("sqlite_store.writer flush failed")
+
+                if self._stopping.is_set():
+                    return
+        finally:
+            conn.close()
+
+    def _flush_pending(self, conn: sqlite3.Connection) -> None:
+        with self._flush_lock:
+            with self._pending_lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, {}
+
+            try:
+                with conn:
+                    conn.executemany(_UPSERT, list(self._flushing.values()))
+            except Exception:
+                # Put rows back unless a newer version was queued meanwhile
+                with self._pending_lock:
+                    for row in self._flushing.values():
+                        self._pending.setdefault(row[0], row)
+                    self._flushing = {}
+                raise
+
+            with self._pending_lock:
+                batch, self._flushing = self._flushing, {}
+
+        self._flushes += 1
+        self._rows_written += len(batch)
+
+    def _delete_expired(self, conn: sqlite3.Connection) -> None:
+        now = time.time()
+        with conn:
+            for tier, ttl in self.tier_ttls.items():
+                conn.execute(
+                    "DELETE FROM memory_records WHERE tier = ? AND updated_at < ?",
+                    (tier, now - ttl),
+                )
+            placeholders = ",".join("?" for _ in self.tier_ttls)
+            conn.execute(
+                "DELETE FROM memory_records WHERE updated_at < ?"
+                + (f" AND tier NOT IN ({placeholders})" if self.tier_ttls else ""),
+                (now - self.default_ttl, *self.tier_ttls),
+            )
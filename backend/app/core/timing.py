@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+
+class ServerTiming:
+    """
+    Per-request timing spans, rendered as a Server-Timing header.
+
+    Why this exists:
+    - Shows where a request spent its time (engine, agent, memory, ...)
+      directly in browser devtools / curl output
+    - Costs one perf_counter() pair per span; no global state
+
+    Spans with the same name accumulate (ex: every node of a pipeline
+    adds to "agent"), so values are cumulative, not wall-clock.
+    """
+
+    __slots__ = ("started", "spans")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.spans: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def header_value(self) -> str:
+        """
+        Render "routing;dur=0.3, engine;dur=1.2, ..., total;dur=1.6" (ms).
+
+        routing is everything outside the engine: routing, validation,
+        dependency resolution and serialization.
+        """
+        total = time.perf_counter() - self.started
+        routing = max(total - self.spans.get("engine", 0.0), 0.0)
+
+        parts = [f"routing;dur={routing * 1000:.3f}"]
+        parts += [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.spans.items()]
+        parts.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(parts)
+
+
+# ------------------------------------------------------------
+# Current request timing
+# ------------------------------------------------------------
+# Set by RequestIdMiddleware for every HTTP request. Code outside a
+# request (scripts, benchmarks) sees None and records nothing.
+current_timing: ContextVar[Optional[ServerTiming]] = ContextVar(
+    "operatorx_server_timing", default=None
+)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time a block and add it to the current request's Server-Timing.
+    """
+    timing = current_timing.get()
+    if timing is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started)
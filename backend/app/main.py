@@ -1,5 +1,8 @@
-import logging
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 # ------------------------------------------------------------
 # API Route Groups
@@ -16,6 +19,30 @@ from app.tier_routes import router as tier_router
 # Memory inspection/debug routes (Phase 2)
 from app.memory_routes import router as memory_router
 
+# Audit log lookups + hash chain verification
+from app.audit_routes import router as audit_router
+
+# Shared memory store (sweeper / writer threads run for the app lifetime)
+from app.core.memory import memory_store
+
+# Shared engine (owns the executor used for sync-only agents)
+from app.core.engine import engine
+
+# Agent registry (singleton / pooled agents are warmed at startup)
+from app.agents.registry import registry
+
+# Tier profiles (deployments/<tier>/profile.json, hot reloaded)
+from app.core.profiles import tier_profiles
+
+# Admission control rejections (saturated tier -> 429 / 503)
+from app.core.admission import AdmissionRejected
+
+# Response encoding (opt-in fast path, see app.core.serialization)
+from app.core.serialization import FAST_JSON, FastJSONResponse
+
+# Queue-based structured logging (writer thread runs for the app lifetime)
+from app.core.logs import log_pipeline
+
 # ------------------------------------------------------------
 # Middleware
 # ------------------------------------------------------------
@@ -24,13 +51,47 @@ from app.middleware import RequestIdMiddleware
 
 
 # ------------------------------------------------------------
-# Logging Configuration
+# Lifespan (startup / shutdown)
 # ------------------------------------------------------------
-# Configure basic logging so CoreEngine, middleware, and route logs
-# are visible during local development and testing.
-# In later phases, this can be replaced with structured logging
-# or external log aggregation (ELK, Azure Monitor, etc.).
-logging.basicConfig(level=logging.INFO)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start and stop background work tied to the process lifetime.
+
+    - Memory store: sweeper drops expired MemoryRecords so the store stays
+      bounded; persistent backends also flush pending writes on shutdown
+    - Agents: singleton and pooled agents are built and warmed once per
+      worker (startup hooks), and their shutdown hooks run on exit
+    - Tier profiles: reloaded when deployments/<tier>/profile.json changes
+    - Engine bulkheads: per-agent worker threads for sync-only agents
+    - Engine worker processes: started and warmed up front when agents
+      are registered with execution="process"
+    - Audit log: opened at startup when a tier is audited; queued entries
+      are committed on shutdown
+    - Log pipeline: installed first, so startup lines already go through
+      the queue to its writer thread (JSON lines by default,
+      OPERATORX_LOG_FORMAT=text for local development; see
+      app.core.logs); the writer drains queued records on shutdown.
+      Importing the app leaves the root logger untouched
+
+    Shutdown runs in reverse dependency order: the engine goes first and
+    waits for in-flight bulkhead / process work (which still writes to
+    memory and uses agents), then agents, profiles and the memory store
+    are stopped, and the log pipeline last.
+    """
+    log_pipeline.install()
+    memory_store.start()
+    tier_profiles.start()
+    await registry.startup()
+    await engine.start()
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(engine.shutdown, wait=True)
+        await registry.shutdown()
+        await tier_profiles.stop()
+        await memory_store.stop()
+        log_pipeline.stop()
 
 
 # ------------------------------------------------------------
@@ -38,7 +99,13 @@ logging.basicConfig(level=logging.INFO)
 # ------------------------------------------------------------
 # Create the FastAPI application instance.
 # This is the central entry point for the backend service.
-app = FastAPI(title="OperatorX AI Backend")
+# OPERATORX_FAST_JSON=1 also encodes every other JSON response with
+# the fast serializer (orjson when installed)
+app = FastAPI(
+    title="OperatorX AI Backend",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse if FAST_JSON else JSONResponse,
+)
 
 
 # ------------------------------------------------------------
@@ -47,9 +114,29 @@ app = FastAPI(title="OperatorX AI Backend")
 # Adds a unique X-Request-Id header to every request/response.
 # The request_id is stored on request.state and propagated
 # through the Core Engine, agents, and memory layer.
+# Also reports a Server-Timing breakdown (routing/engine/agent/memory).
 app.add_middleware(RequestIdMiddleware)
 
 
+# ------------------------------------------------------------
+# Error Handlers
+# ------------------------------------------------------------
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected(request: Request, exc: AdmissionRejected):
+    """
+    Fast rejection when a tier is saturated.
+
+    - 429: the tier queue is full
+    - 503: the request waited the tier's queue timeout without a slot
+    Retry-After tells clients when the queue should have drained.
+    """
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "tier": exc.tier, "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # ------------------------------------------------------------
 # Root Endpoint
 # ------------------------------------------------------------
@@ -83,3 +170,6 @@ app.include_router(tier_router, prefix="/api/v1")
 
 # Request-scoped memory inspection routes (Phase 2)
 app.include_router(memory_router, prefix="/api/v1")
+
+# Audit trail lookup and verification routes
+app.include_router(audit_router, prefix="/api/v1")
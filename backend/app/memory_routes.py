@@ -1,45 +1,118 @@
-from fastapi import APIRouter, Request
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
 
 # Shared in-memory store used by the Core Engine
-from app.core.memory import memory_store
+from app.core.memory import (
+    DEFAULT_QUERY_LIMIT,
+    MAX_QUERY_LIMIT,
+    decode_cursor,
+    encode_cursor,
+    memory_store,
+    record_fields,
+)
+
+# Opt-in fast JSON path (OPERATORX_FAST_JSON=1)
+from app.core.serialization import FAST_JSON, FastJSONResponse
+
+# Conditional GET (ETag from MemoryRecord.updated_at)
+from app.core.http_cache import REVALIDATE_PRIVATE, not_modified, version_etag
 
 # Router grouping all memory-related endpoints
 router = APIRouter(prefix="/memory", tags=["memory"])
 
 
 @router.get("")
-def get_memory(request: Request):
+async def get_memory(
+    request: Request,
+    response: Response,
+    request_id: Optional[str] = Query(None, description="Fetch this request's memory"),
+    tier: Optional[str] = Query(None, description="List executions of this tier"),
+    agent: Optional[str] = Query(None, description="List executions of this agent"),
+    status: Optional[str] = Query(None, description="List executions by outcome: ok | error"),
+    since: Optional[float] = Query(None, description="Updated at or after (epoch seconds)"),
+    until: Optional[float] = Query(None, description="Updated at or before (epoch seconds)"),
+    min_duration_ms: Optional[float] = Query(None, ge=0, description="Only executions at least this slow"),
+    limit: int = Query(DEFAULT_QUERY_LIMIT, ge=1, le=MAX_QUERY_LIMIT),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+):
     """
-    Retrieve request-scoped memory for the current request.
+    Retrieve request-scoped memory, or list stored executions.
 
     How this endpoint is intended to be used:
-    1. Call any API endpoint (e.g., /agents/orchestrate)
-    2. That request generates a request_id via middleware
-    3. Call /api/v1/memory using the SAME request context
-    4. Inspect what the engine and agents stored during execution
+    - ?request_id=<id>: full memory of that request (ex: an
+      X-Request-Id returned by /agents/orchestrate)
+    - ?tier= / ?agent= / ?status= / ?since= / ?until= / ?min_duration_ms=:
+      newest executions matching every filter, one page at a time
+      (pass next_cursor back as ?cursor= for the next page)
+    - no parameters: memory of the current request context
+
+    A single record is sent with an ETag derived from its updated_at;
+    If-None-Match with that ETag gets a 304 while the record is unchanged.
 
     This endpoint is primarily for:
     - Debugging
-    - Observability
+    - Observability (finding slow or failing executions)
     - Verifying context propagation (Phase 2)
     """
 
     # --------------------------------------------------------
-    # Extract request_id from request.state
+    # List executions (indexed query)
+    # --------------------------------------------------------
+    filters = (tier, agent, status, since, until, min_duration_ms, cursor)
+    if request_id is None and any(value is not None for value in filters):
+        return _list_executions(
+            tier=tier, agent=agent, status=status, since=since, until=until,
+            min_duration_ms=min_duration_ms, limit=limit, cursor=cursor,
+        )
+
+    # --------------------------------------------------------
+    # Extract request_id from the query or request.state
     # --------------------------------------------------------
     # The request_id is injected by RequestIdMiddleware.
     # If it does not exist, memory cannot be retrieved.
-    request_id = getattr(request.state, "request_id", None)
+    request_id = request_id or getattr(request.state, "request_id", None)
     if not request_id:
         return {
             "ok": False,
             "error": "No request_id found on request"
         }
 
+    # --------------------------------------------------------
+    # Conditional GET: unchanged record -> 304
+    # --------------------------------------------------------
+    # Checked before the record is copied or encoded. The ETag is read
+    # first, so the body sent below is never older than its ETag.
+    headers = {}
+    current = memory_store.get(request_id)
+    if current is not None:
+        headers = {"ETag": version_etag(current.updated_at), "Cache-Control": REVALIDATE_PRIVATE}
+        unchanged = not_modified(request, headers["ETag"], headers)
+        if unchanged is not None:
+            return unchanged
+        response.headers.update(headers)
+
+    # --------------------------------------------------------
+    # Fast path: encode the record straight from the store
+    # --------------------------------------------------------
+    # snapshot_json() serializes under the store lock, so there is no
+    # deep copy and no second encoding pass. The record is a JSON
+    # object: splice "ok" in front of its first key.
+    if FAST_JSON:
+        encoded = memory_store.snapshot_json(request_id)
+        if encoded is not None:
+            return FastJSONResponse(b'{"ok":true,' + encoded[1:], headers=headers)
+        return FastJSONResponse({
+            "ok": False,
+            "error": "No memory found for this request_id"
+        })
+
     # --------------------------------------------------------
     # Fetch memory record from the in-memory store
     # --------------------------------------------------------
-    record = memory_store.get(request_id)
+    # snapshot() copies the record so serialization never races with
+    # requests that are still writing to it.
+    record = memory_store.snapshot(request_id)
     if not record:
         return {
             "ok": False,
@@ -51,11 +124,61 @@ def get_memory(request: Request):
     # --------------------------------------------------------
     # This exposes only high-level diagnostic data.
     # Sensitive or internal-only data can be filtered later.
-    return {
+    return {"ok": True, **record_fields(record)}
+
+
+def _list_executions(
+    tier: Optional[str],
+    agent: Optional[str],
+    status: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+    min_duration_ms: Optional[float],
+    limit: int,
+    cursor: Optional[str],
+):
+    """
+    One page of execution summaries (see MemoryStore.query).
+    """
+    if status is not None and status not in ("ok", "error"):
+        return {"ok": False, "error": "status must be 'ok' or 'error'"}
+
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return {"ok": False, "error": "Invalid cursor"}
+
+    try:
+        items, next_position = memory_store.query(
+            tier=tier.strip().lower() if tier else None,
+            agent=agent,
+            status=status,
+            since=since,
+            until=until,
+            min_duration_ms=min_duration_ms,
+            limit=limit,
+            cursor=position,
+        )
+    except NotImplementedError as e:
+        return {"ok": False, "error": str(e)}
+
+    body = {
         "ok": True,
-        "request_id": record.request_id,
-        "tier": record.tier,
-        "created_at": record.created_at,
-        "updated_at": record.updated_at,
-        "data": record.data,
+        "items": items,
+        "next_cursor": encode_cursor(next_position) if next_position else None,
     }
+    return FastJSONResponse(body) if FAST_JSON else body
+
+
+@router.get("/stats")
+async def get_memory_stats():
+    """
+    Size and eviction counters for the shared memory store.
+
+    Useful for sizing max_records / max_bytes / tier TTLs:
+    - records / bytes: current occupancy
+    - hits / misses: lookup effectiveness
+    - evictions: records dropped because the store was full
+    - expirations: records dropped because their TTL elapsed
+    """
+    return memory_store.stats()
@@ -1,16 +1,86 @@
 from __future__ import annotations
 
+import time
 import uuid
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-class RequestIdMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        request_id = request.headers.get("X-Request-Id") or str(uuid.uuid4())
+from app.core.timing import ServerTiming, current_timing
 
-        request.state.request_id = request_id
-        response = await call_next(request)
 
-        response.headers["X-Request-Id"] = request_id
-        return response
+REQUEST_ID_HEADER = b"x-request-id"
+SERVER_TIMING_HEADER = b"server-timing"
+DEADLINE_HEADER = b"x-operatorx-deadline-ms"
+
+
+def parse_deadline(value: bytes, now: float) -> float | None:
+    """
+    Absolute time.monotonic() deadline from an X-OperatorX-Deadline-Ms
+    budget (milliseconds from now); invalid values are ignored.
+    """
+    try:
+        budget_ms = float(value)
+    except ValueError:
+        return None
+    if budget_ms != budget_ms or budget_ms < 0:  # NaN / negative
+        return None
+    return now + budget_ms / 1000
+
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware that propagates X-Request-Id and adds Server-Timing.
+
+    - Reuses the client's X-Request-Id or mints a new UUID
+    - Stores it on request.state.request_id (scope["state"])
+    - Turns an X-OperatorX-Deadline-Ms budget into request.state.deadline
+      (absolute time.monotonic(), measured from when the request arrived)
+    - Rewrites the http.response.start headers; the response body is
+      passed through untouched, so streaming and background tasks keep
+      their normal semantics
+    - Collects engine/agent/memory spans (app.core.timing) and reports
+      them in a Server-Timing header
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        deadline = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER and request_id is None:
+                request_id = value.decode("latin-1")
+            elif name == DEADLINE_HEADER:
+                deadline = parse_deadline(value, time.monotonic())
+        if not request_id:
+            request_id = str(uuid.uuid4())
+
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["deadline"] = deadline
+
+        timing = ServerTiming()
+        token = current_timing.set(timing)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    (name, value)
+                    for name, value in message.get("headers", [])
+                    if name.lower() != REQUEST_ID_HEADER
+                ]
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                headers.append((SERVER_TIMING_HEADER, timing.header_value().encode("latin-1")))
+                message = {**message, "headers": headers}
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            current_timing.reset(token)
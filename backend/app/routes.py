@@ -1,13 +1,39 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse, Response
+
+# Importing the engine registers its scrape-time collectors
+from app.core.engine import engine  # noqa: F401
+from app.core.metrics import metrics
+
+# Precomputed bodies + ETags for polled endpoints
+from app.core.http_cache import precomputed
 
 router = APIRouter()
 
 
 @router.get("/health")
-def health() -> dict:
-    return {"status": "ok"}
+async def health(request: Request) -> Response:
+    return precomputed.respond(request, "health", 0, lambda: {"status": "ok"})
 
 
 @router.get("/meta")
-def meta() -> dict:
-    return {"service": "operatorx-ai-backend", "version": "0.1.0"}
+async def meta(request: Request) -> Response:
+    return precomputed.respond(
+        request, "meta", 0, lambda: {"service": "operatorx-ai-backend", "version": "0.1.0"}
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics() -> PlainTextResponse:
+    """
+    Engine metrics in Prometheus text exposition format.
+
+    - operatorx_agent_duration_seconds: latency histogram per agent + tier
+    - operatorx_agent_runs_total: executions per agent + tier + outcome
+    - operatorx_agent_in_flight: executions currently running
+    - operatorx_memory_* / operatorx_result_cache_*: store sizes
+    """
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -2,21 +2,20 @@ from __future__ import annotations
 
 from typing import Literal
 
+from app.core.profiles import DEFAULT_TIER as _DEFAULT_TIER, tier_profiles
+
+# Built-in tiers (more can be added with a deployments/<tier>/profile.json)
 Tier = Literal["personal", "business", "government"]
 
-DEFAULT_TIER: Tier = "personal"
-ALLOWED_TIERS = {"personal", "business", "government"}
+DEFAULT_TIER: Tier = _DEFAULT_TIER  # type: ignore[assignment]
 
 
-def normalize_tier(value: str | None) -> Tier:
+def normalize_tier(value: str | None) -> str:
     """
     Normalize and validate the incoming tier.
-    """
-    if not value:
-        return DEFAULT_TIER
 
-    v = value.strip().lower()
-    if v not in ALLOWED_TIERS:
-        return DEFAULT_TIER
-
-    return v  # type: ignore[return-value]
+    Known tiers come from the loaded tier profiles (see
+    app.core.profiles); missing or unknown values fall back to
+    DEFAULT_TIER.
+    """
+    return tier_profiles.normalize(value)
@@ -1,12 +1,42 @@
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import Response
+from app.core.http_cache import REVALIDATE_PRIVATE, precomputed
+from app.core.profiles import tier_profiles
 from app.tier import normalize_tier
 
 router = APIRouter(prefix="/tier", tags=["tier"])
 
 
 @router.get("")
-def get_tier(x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier")):
-    return {
-        "received_header": x_operatorx_tier,
-        "normalized_tier": normalize_tier(x_operatorx_tier),
-    }
\ No newline at end of file
+async def get_tier(
+    request: Request,
+    x_operatorx_tier: str | None = Header(default=None, alias="X-OperatorX-Tier"),
+) -> Response:
+    """
+    How the X-OperatorX-Tier header is interpreted (precomputed per raw
+    header value until the tier profiles reload).
+    """
+    def build() -> dict:
+        tier = normalize_tier(x_operatorx_tier)
+        return {
+            "received_header": x_operatorx_tier,
+            "normalized_tier": tier,
+            "governance_gates": list(tier_profiles.get(tier).governance_gates),
+        }
+
+    return precomputed.respond(
+        request,
+        ("tier", x_operatorx_tier),
+        tier_profiles.reloads,
+        build,
+        cache_control=REVALIDATE_PRIVATE,
+        vary="X-OperatorX-Tier",
+    )
+
+
+@router.get("/profiles")
+async def get_profiles():
+    """
+    Loaded tier profiles (deployments/<tier>/profile.json) and reload status.
+    """
+    return tier_profiles.describe()
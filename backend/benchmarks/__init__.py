@@ -0,0 +1,14 @@
+"""
+OperatorX AI benchmark + load-test suite.
+
+Run from the backend/ directory:
+
+    python -m benchmarks run --out benchmarks/results/latest.json
+    python -m benchmarks compare benchmarks/baseline.json benchmarks/results/latest.json
+
+Suites:
+- micro:  CoreEngine.run_agent, AgentRegistry.get, InMemoryStore, agent.run
+- load:   in-process ASGI load against /api/v1/agents/orchestrate (all tiers)
+- memory: memory growth over N engine executions
+- startup: worker cold start (import app.main) + per-agent import times
+"""
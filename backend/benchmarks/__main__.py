@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+import benchmarks
+from benchmarks.report import (
+    compare_reports,
+    format_comparison,
+    load_report,
+    write_report,
+)
+
+
+DEFAULT_OUT = Path("benchmarks/results/latest.json")
+DEFAULT_BASELINE = Path("benchmarks/baseline.json")
+SUITES = ("micro", "load", "memory", "startup")
+
+
+def _run(args: argparse.Namespace) -> int:
+    if not args.with_logging:
+        # Engine INFO lines would dominate the numbers and flood stderr
+        logging.disable(logging.INFO)
+
+    suites = [suite.strip() for suite in args.suites.split(",") if suite.strip()]
+    unknown = sorted(set(suites) - set(SUITES))
+    if unknown:
+        print(f"Unknown suite(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results: Dict[str, Any] = {}
+    details: Dict[str, Any] = {}
+
+    if "micro" in suites:
+        from benchmarks.micro import run_micro
+        print("running micro benchmarks ...", file=sys.stderr)
+        results.update(run_micro(min_time=args.min_time))
+
+    if "load" in suites:
+        from benchmarks.load import run_load
+        print("running load test ...", file=sys.stderr)
+        results.update(run_load(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            unique_goals=not args.cached,
+        ))
+
+    if "memory" in suites:
+        from benchmarks.memory_growth import run_memory_growth
+        print(f"running memory growth ({args.memory_requests} requests) ...", file=sys.stderr)
+        memory_results, samples = run_memory_growth(requests=args.memory_requests)
+        results.update(memory_results)
+        details["memory_samples"] = samples
+
+    if "startup" in suites:
+        from benchmarks.startup import format_import_report, run_startup
+        print("measuring worker cold start ...", file=sys.stderr)
+        startup_results, probe = run_startup(repeats=args.startup_repeats)
+        results.update(startup_results)
+        details["agent_imports"] = probe["agents"]
+        print(format_import_report(probe["agents"]), file=sys.stderr)
+        for name, error in sorted(probe["errors"].items()):
+            print(f"agent {name} failed to load: {error}", file=sys.stderr)
+
+    config = {
+        key: str(value) if isinstance(value, Path) else value
+        for key, value in vars(args).items()
+        if key != "func"
+    }
+    config["details"] = details
+    write_report(args.out, results, config)
+
+    for name, entry in sorted(results.items()):
+        print(f"{name:60} {entry['value']:>14.4f} {entry['unit']}")
+    print(f"\nwrote {args.out}", file=sys.stderr)
+
+    if args.save_baseline:
+        write_report(args.baseline, results, config)
+        print(f"saved baseline {args.baseline}", file=sys.stderr)
+
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    rows = compare_reports(load_report(args.baseline), load_report(args.current), args.threshold)
+    print(format_comparison(rows))
+
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description=benchmarks.__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run benchmark suites and write a JSON report")
+    run.add_argument("--suites", default=",".join(SUITES), help="comma-separated: micro,load,memory,startup")
+    run.add_argument("--out", type=Path, default=DEFAULT_OUT)
+    run.add_argument("--min-time", type=float, default=1.0, help="seconds per micro-benchmark")
+    run.add_argument("--requests", type=int, default=5000, help="load-test requests per tier")
+    run.add_argument("--concurrency", type=int, default=64, help="load-test concurrent clients")
+    run.add_argument("--cached", action="store_true", help="repeat one goal (result cache hits)")
+    run.add_argument("--memory-requests", type=int, default=1_000_000)
+    run.add_argument("--startup-repeats", type=int, default=5, help="fresh interpreters per startup measurement")
+    run.add_argument("--with-logging", action="store_true", help="keep engine INFO logging enabled")
+    run.add_argument("--save-baseline", action="store_true", help="also write the report to --baseline")
+    run.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    run.set_defaults(func=_run)
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline report")
+    compare.add_argument("baseline", type=Path, nargs="?", default=DEFAULT_BASELINE)
+    compare.add_argument("current", type=Path, nargs="?", default=DEFAULT_OUT)
+    compare.add_argument("--threshold", type=float, default=0.10, help="relative change that counts as a regression")
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
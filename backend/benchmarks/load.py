@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.report import Results, latency_summary
+
+
+TIERS = ("personal", "business", "government")
+
+
+class ASGIClient:
+    """
+    Minimal in-process ASGI client (no sockets, no extra dependencies).
+
+    Drives the app exactly like a server would: lifespan startup/shutdown
+    and one http scope per request. Only what the load test needs.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self._lifespan_task: Optional[asyncio.Task] = None
+        self._lifespan_in: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._lifespan_out: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    async def startup(self) -> None:
+        scope = {"type": "lifespan", "asgi": {"version": "3.0"}, "state": {}}
+        self._lifespan_task = asyncio.create_task(
+            self.app(scope, self._lifespan_in.get, self._lifespan_out.put)
+        )
+        await self._lifespan_in.put({"type": "lifespan.startup"})
+        message = await self._lifespan_out.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"lifespan startup failed: {message}")
+
+    async def shutdown(self) -> None:
+        if self._lifespan_task is None:
+            return
+        await self._lifespan_in.put({"type": "lifespan.shutdown"})
+        await self._lifespan_out.get()
+        await self._lifespan_task
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        headers: Optional[Dict[str, str]] = None,
+        body: bytes = b"",
+    ) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        raw_headers = [(b"host", b"bench")]
+        raw_headers += [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in (headers or {}).items()]
+        if body:
+            raw_headers.append((b"content-length", str(len(body)).encode()))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "state": {},
+        }
+
+        request_sent = False
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # Nothing else to send: wait like an idle client would
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}  # pragma: no cover
+
+        status = 0
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: List[bytes] = []
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, response_headers, b"".join(chunks)
+
+
+async def _run_tier(
+    client: ASGIClient,
+    tier: str,
+    requests: int,
+    concurrency: int,
+    unique_goals: bool,
+) -> Tuple[List[float], float, int]:
+    """
+    Fire `requests` orchestrate calls for one tier with bounded concurrency.
+    """
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            goal = f"Improve reliability #{index}" if unique_goals else "Improve reliability"
+            body = json.dumps({"goal": goal, "constraints": ["budget"]}).encode()
+            started = time.perf_counter()
+            status, _, _ = await client.request(
+                "POST",
+                "/api/v1/agents/orchestrate",
+                headers={"content-type": "application/json", "x-operatorx-tier": tier},
+                body=body,
+            )
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - started, errors
+
+
+async def _run_load(requests: int, concurrency: int, unique_goals: bool) -> Results:
+    from app.main import app
+
+    client = ASGIClient(app)
+    await client.startup()
+    try:
+        results: Results = {}
+        for tier in TIERS:
+            # Warmup (imports, caches, executor threads)
+            await _run_tier(client, tier, min(200, requests), concurrency, unique_goals)
+
+            latencies, elapsed, errors = await _run_tier(
+                client, tier, requests, concurrency, unique_goals
+            )
+            prefix = f"load.orchestrate.{tier}"
+            results.update(latency_summary(prefix, latencies, elapsed))
+            results[f"{prefix}.errors"] = {"value": errors, "unit": "count", "better": "lower"}
+        return results
+    finally:
+        await client.shutdown()
+
+
+def run_load(requests: int = 5000, concurrency: int = 64, unique_goals: bool = True) -> Results:
+    """
+    In-process load test of POST /api/v1/agents/orchestrate for every tier.
+
+    unique_goals=True defeats the result cache so the full engine path
+    is measured; pass False to measure the cached (dashboard) path.
+    """
+    return asyncio.run(_run_load(requests, concurrency, unique_goals))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import gc
+import os
+import resource
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from app.agents.base import AgentContext
+from app.core.engine import engine
+from app.core.memory import memory_store
+
+from benchmarks.report import Results, metric
+
+
+TIERS = ("personal", "business", "government")
+
+
+def _rss_mb() -> float:
+    """
+    Resident set size of this process in MB.
+
+    Uses /proc (current RSS) on Linux and falls back to peak RSS
+    (ru_maxrss) elsewhere.
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def run_memory_growth(
+    requests: int = 1_000_000, checkpoints: int = 10
+) -> Tuple[Results, List[Dict[str, float]]]:
+    """
+    Run `requests` engine executions with unique request_ids and track
+    memory at evenly spaced checkpoints.
+
+    A bounded memory store should plateau: RSS growth between the middle
+    and the end of the run should be close to zero.
+
+    Returns (results, checkpoint samples).
+    """
+    step = max(1, requests // checkpoints)
+    samples: List[Dict[str, float]] = []
+
+    gc.collect()
+    rss_start = _rss_mb()
+    started = time.perf_counter()
+
+    for index in range(requests):
+        ctx = AgentContext(tier=TIERS[index % 3], request_id=f"mem-{index}")
+        engine.run_agent("orchestrator", {"goal": f"goal {index % 1000}"}, ctx)
+
+        if (index + 1) % step == 0:
+            stats = memory_store.stats()
+            samples.append({
+                "requests": index + 1,
+                "rss_mb": _rss_mb(),
+                "records": stats["records"],
+                "store_bytes": stats["bytes"],
+            })
+
+    elapsed = time.perf_counter() - started
+    rss_end = _rss_mb()
+
+    # Growth over the second half of the run (after the store fills up)
+    midpoint = samples[len(samples) // 2] if samples else {"rss_mb": rss_start}
+    late_growth = rss_end - midpoint["rss_mb"]
+
+    results: Results = {
+        "memory.throughput": metric(requests / elapsed if elapsed else 0.0, "req/s", "higher"),
+        "memory.rss_start_mb": metric(rss_start, "MB", "lower"),
+        "memory.rss_end_mb": metric(rss_end, "MB", "lower"),
+        "memory.rss_growth_second_half_mb": metric(late_growth, "MB", "lower"),
+        "memory.store_records": metric(memory_store.stats()["records"], "count", "lower"),
+        "memory.store_bytes": metric(memory_store.stats()["bytes"], "bytes", "lower"),
+    }
+    return results, samples
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import itertools
+import time
+from typing import Callable
+
+from app.agents.base import AgentContext
+from app.agents.registry import registry
+from app.core.engine import CoreEngine, engine
+from app.core.memory import InMemoryStore
+
+from benchmarks.report import Results, metric
+
+
+SAMPLE_INPUT = {"goal": "Improve deployment reliability", "constraints": ["budget", "no downtime"]}
+TIERS = ("personal", "business", "government")
+
+
+def _bench(name: str, fn: Callable[[], object], min_time: float) -> Results:
+    """
+    Call fn repeatedly for at least min_time seconds (after a short warmup).
+    """
+    for _ in range(100):
+        fn()
+
+    calls = 0
+    batch = 1000
+    started = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+
+    return {
+        f"micro.{name}.ops_per_sec": metric(calls / elapsed, "ops/s", "higher"),
+        f"micro.{name}.mean_us": metric(elapsed / calls * 1e6, "us", "lower"),
+    }
+
+
+def run_micro(min_time: float = 1.0) -> Results:
+    """
+    Micro-benchmarks for the hot-path building blocks.
+    """
+    results: Results = {}
+
+    # --------------------------------------------
+    # Registry
+    # --------------------------------------------
+    results.update(_bench("registry_get", lambda: registry.get("orchestrator"), min_time))
+
+    # --------------------------------------------
+    # Memory store (fresh store so other suites do not interfere)
+    # --------------------------------------------
+    store = InMemoryStore()
+    ids = itertools.count()
+    results.update(_bench(
+        "memory_ensure_new",
+        lambda: store.ensure(f"bench-{next(ids)}", "business"),
+        min_time,
+    ))
+
+    record = store.ensure("bench-hot", "business")
+    record.data["last_output"] = {"plan": ["step"] * 10}
+    results.update(_bench("memory_ensure_existing", lambda: store.ensure("bench-hot", "business"), min_time))
+    results.update(_bench("memory_upsert", lambda: store.upsert(record), min_time))
+
+    # --------------------------------------------
+    # Agents (direct run, no engine)
+    # --------------------------------------------
+    for agent_name in sorted(registry.list()):
+        agent = registry.get(agent_name)
+        for tier in TIERS:
+            ctx = AgentContext(tier=tier)
+            results.update(_bench(
+                f"agent_run.{agent_name}.{tier}",
+                lambda agent=agent, ctx=ctx: agent.run(SAMPLE_INPUT, ctx),
+                min_time,
+            ))
+
+    # --------------------------------------------
+    # Engine (with and without the result cache)
+    # --------------------------------------------
+    uncached = CoreEngine()
+    for label, target in (("cached", engine), ("uncached", uncached)):
+        for tier in TIERS:
+            ctx = AgentContext(tier=tier)
+            results.update(_bench(
+                f"engine_run_agent.{label}.{tier}",
+                lambda target=target, ctx=ctx: target.run_agent("orchestrator", SAMPLE_INPUT, ctx),
+                min_time,
+            ))
+
+    return results
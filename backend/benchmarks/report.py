@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+
+# ------------------------------------------------------------
+# Result format
+# ------------------------------------------------------------
+# Every suite returns a flat mapping:
+#   "<suite>.<benchmark>.<metric>" -> {"value": float, "unit": str, "better": "higher"|"lower"}
+# which keeps comparison generic across suites.
+Results = Dict[str, Dict[str, Any]]
+
+
+def metric(value: float, unit: str, better: str) -> Dict[str, Any]:
+    """
+    Build one result entry ("better" is "higher" or "lower").
+    """
+    return {"value": round(float(value), 6), "unit": unit, "better": better}
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted sequence (q in [0, 100]).
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(prefix: str, latencies: List[float], elapsed: float) -> Results:
+    """
+    Throughput + p50/p95/p99 (milliseconds) for a list of latencies in seconds.
+    """
+    ordered = sorted(latencies)
+    return {
+        f"{prefix}.throughput": metric(len(ordered) / elapsed if elapsed else 0.0, "req/s", "higher"),
+        f"{prefix}.p50_ms": metric(percentile(ordered, 50) * 1000, "ms", "lower"),
+        f"{prefix}.p95_ms": metric(percentile(ordered, 95) * 1000, "ms", "lower"),
+        f"{prefix}.p99_ms": metric(percentile(ordered, 99) * 1000, "ms", "lower"),
+    }
+
+
+def write_report(path: Path, results: Results, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Write results plus environment metadata as JSON.
+    """
+    report = {
+        "created_at": time.time(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return report
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_reports(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare every metric present in both reports.
+
+    A metric regresses when it is worse than the baseline by more than
+    `threshold` (relative, ex: 0.10 = 10%).
+    """
+    rows = []
+    base_results = baseline.get("results", {})
+    for name, entry in sorted(current.get("results", {}).items()):
+        base = base_results.get(name)
+        if base is None:
+            continue
+
+        before, after = float(base["value"]), float(entry["value"])
+        if before == 0:
+            change = 0.0 if after == 0 else float("inf")
+        else:
+            change = (after - before) / abs(before)
+
+        # Positive "worse" means the metric moved in the bad direction
+        worse = -change if entry.get("better") == "higher" else change
+        rows.append({
+            "name": name,
+            "baseline": before,
+            "current": after,
+            "unit": entry.get("unit", ""),
+            "change": change,
+            "regression": worse > threshold,
+        })
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'metric':60} {'baseline':>14} {'current':>14} {'change':>9}"]
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['name']:60} {row['baseline']:>14.4f} {row['current']:>14.4f} "
+            f"{row['change'] * 100:>8.1f}%{flag}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.report import Results, metric
+
+
+# Runs in a fresh interpreter so nothing is imported yet
+_PROBE = r"""
+import json, time
+started = time.perf_counter()
+import app.main
+import_app_ms = (time.perf_counter() - started) * 1000
+
+from app.agents.registry import registry
+loaded_before = sorted(row["agent"] for row in registry.import_report() if row["loaded"])
+errors = registry.load_all()
+print(json.dumps({
+    "import_app_ms": import_app_ms,
+    "loaded_at_import": loaded_before,
+    "agents": registry.import_report(),
+    "errors": errors,
+}))
+"""
+
+
+def _probe() -> Dict[str, Any]:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def format_import_report(rows: List[Dict[str, Any]]) -> str:
+    """
+    Per-agent import table, slowest first (python -X importtime style).
+    """
+    lines = [f"{'import ms':>10} | {'agent':30} | {'source':11} | target"]
+    for row in rows:
+        import_ms = row["import_ms"]
+        shown = f"{import_ms:10.2f}" if import_ms is not None else f"{'-':>10}"
+        lines.append(f"{shown} | {row['agent']:30} | {row['source']:11} | {row['target']}")
+    return "\n".join(lines)
+
+
+def run_startup(repeats: int = 5) -> Tuple[Results, Dict[str, Any]]:
+    """
+    Cold-start cost of a worker, measured in fresh interpreters.
+
+    - startup.import_app_ms: importing app.main (what every worker pays)
+    - startup.agent.<name>.import_ms: importing one agent class on first
+      use (lazy; not part of import_app_ms unless loaded at import)
+
+    Median over `repeats` runs. Returns (results, last probe) so the
+    per-agent table can be printed.
+    """
+    probes = [_probe() for _ in range(max(1, repeats))]
+
+    def median(values: List[float]) -> float:
+        ordered = sorted(values)
+        return ordered[len(ordered) // 2]
+
+    results: Results = {
+        "startup.import_app_ms": metric(
+            median([probe["import_app_ms"] for probe in probes]), "ms", "lower"
+        ),
+        "startup.agents_loaded_at_import": metric(
+            len(probes[-1]["loaded_at_import"]), "count", "lower"
+        ),
+    }
+
+    for row in probes[-1]["agents"]:
+        times = [
+            agent["import_ms"]
+            for probe in probes
+            for agent in probe["agents"]
+            if agent["agent"] == row["agent"] and agent["import_ms"] is not None
+        ]
+        if times:
+            results[f"startup.agent.{row['agent']}.import_ms"] = metric(median(times), "ms", "lower")
+
+    return results, probes[-1]
@@ -0,0 +1,70 @@
+import asyncio
+import uuid
+
+from app.agents.base import AgentContext, BaseAgent
+from app.agents.registry import registry
+from app.core.admission import AdmissionController, AdmissionLimits
+from app.core.engine import CoreEngine
+
+
+class EchoAgent(BaseAgent):
+    name = "test_echo"
+
+    async def arun(self, input_data, ctx):
+        return {"echo": input_data}
+
+
+class BoomAgent(BaseAgent):
+    name = "test_boom"
+
+    def run(self, input_data, ctx):
+        raise RuntimeError("boom")
+
+
+class SlowAgent(BaseAgent):
+    name = "test_slow"
+
+    async def arun(self, input_data, ctx):
+        await asyncio.sleep(input_data.get("seconds", 1.0))
+        return {"slept": True}
+
+
+class CountingAgent(BaseAgent):
+    name = "test_counting"
+    running = 0
+    peak = 0
+
+    async def arun(self, input_data, ctx):
+        cls = type(self)
+        cls.running += 1
+        cls.peak = max(cls.peak, cls.running)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            cls.running -= 1
+        return {"index": input_data["index"]}
+
+
+def register_test_agents(monkeypatch):
+    """
+    Register the agents above on a copy of the shared registry (restored
+    by monkeypatch after the test). test_slow times out after 50 ms.
+    """
+    monkeypatch.setattr(registry, "_agents", dict(registry._agents))
+    for agent_cls in (EchoAgent, BoomAgent, CountingAgent):
+        registry.register(agent_cls.name, agent_cls)
+    registry.register(SlowAgent.name, SlowAgent, timeout=0.05)
+
+
+def make_ctx(tier="personal"):
+    return AgentContext(tier=tier, request_id=f"test-{uuid.uuid4()}")
+
+
+def make_engine(**limits):
+    """
+    Fresh engine; admission limits (same for every tier) when given.
+    """
+    admission = None
+    if limits:
+        admission = AdmissionController(limits=lambda tier: AdmissionLimits(**limits))
+    return CoreEngine(admission=admission)
@@ -0,0 +1,18 @@
+import os
+import threading
+import time
+
+from app.agents.base import BaseAgent
+
+
+class SleepAgent(BaseAgent):
+    def run(self, input_data, ctx):
+        time.sleep(input_data.get("seconds", 0))
+        if input_data.get("exit"):
+            # A worker crash: the process dies without answering
+            os._exit(1)
+        if input_data.get("fail"):
+            raise ValueError("failed on purpose")
+        if input_data.get("unpicklable"):
+            return {"lock": threading.Lock()}
+        return {"seconds": input_data.get("seconds", 0)}
@@ -0,0 +1,209 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.admission import DEADLINE_REASON, AdmissionController, AdmissionLimits, AdmissionRejected
+from tests.agents import make_ctx, make_engine, register_test_agents
+
+
+def _controller(max_concurrency=1, **tiers):
+    """
+    Controller over fixed per-tier limits (tiers not given get defaults).
+    """
+    return AdmissionController(
+        limits=lambda tier: tiers.get(tier, AdmissionLimits()),
+        max_concurrency=max_concurrency,
+    )
+
+
+def test_freed_slots_follow_tier_weights_and_fifo_order():
+    limits = dict(max_concurrency=10, max_queue=100, queue_timeout=5.0)
+    controller = _controller(
+        gold=AdmissionLimits(weight=4, **limits),
+        bronze=AdmissionLimits(weight=1, **limits),
+    )
+
+    # One slot for the whole worker, held by bronze while both tiers queue
+    assert controller._acquire_or_enqueue("bronze", lambda: None) is None
+    granted = []
+    waiting = {"gold": 12, "bronze": 4}
+    for tier, count in waiting.items():
+        for i in range(count):
+            waiter = controller._acquire_or_enqueue(tier, lambda tier=tier, i=i: granted.append((tier, i)))
+            assert waiter is not None
+
+    holder = "bronze"
+    for _ in range(16):
+        controller.release(holder, 0.01)
+        holder = granted[-1][0]
+
+    assert [tier for tier, _ in granted[:10]] == ["gold"] * 4 + ["bronze"] + ["gold"] * 4 + ["bronze"]
+    for tier, count in waiting.items():
+        assert [i for name, i in granted if name == tier] == list(range(count))
+
+    controller.release(holder)
+    stats = controller.stats()
+    assert stats["running"] == 0
+    assert stats["tiers"]["gold"]["admitted"] == 12
+    assert stats["tiers"]["bronze"]["admitted"] == 5
+
+
+def test_full_queue_is_rejected_with_429_and_retry_after():
+    controller = _controller(personal=AdmissionLimits(max_concurrency=1, max_queue=1, queue_timeout=5.0))
+
+    # One 10 s execution: the average (EWMA) becomes 2 s
+    assert controller._acquire_or_enqueue("personal", lambda: None) is None
+    controller.release("personal", 10.0)
+
+    assert controller._acquire_or_enqueue("personal", lambda: None) is None
+    assert controller._acquire_or_enqueue("personal", lambda: None) is not None
+    with pytest.raises(AdmissionRejected) as rejected:
+        with controller.admit("personal"):
+            pass
+
+    assert rejected.value.status_code == 429
+    assert rejected.value.tier == "personal"
+    # 2 s average x (1 queued + this one) / 1 slot
+    assert rejected.value.retry_after == 4
+    assert controller.stats()["tiers"]["personal"]["rejected"] == 1
+
+
+def test_queue_timeout_is_rejected_with_503():
+    controller = _controller(personal=AdmissionLimits(max_concurrency=1, max_queue=4, queue_timeout=0.05))
+    assert controller._acquire_or_enqueue("personal", lambda: None) is None
+
+    async def wait_for_slot():
+        async with controller.aadmit("personal"):
+            pass
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        asyncio.run(wait_for_slot())
+    assert rejected.value.status_code == 503
+    assert 1 <= rejected.value.retry_after <= 60
+
+    tier = controller.stats()["tiers"]["personal"]
+    assert tier["timed_out"] == 1
+    assert tier["queued"] == 0
+    assert tier["running"] == 1
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_queue_wait_stops_at_the_callers_budget(mode):
+    controller = _controller(personal=AdmissionLimits(max_concurrency=1, max_queue=4, queue_timeout=5.0))
+    assert controller._acquire_or_enqueue("personal", lambda: None) is None
+
+    async def wait_for_slot():
+        async with controller.aadmit("personal", budget=0.05):
+            pass
+
+    started = time.perf_counter()
+    with pytest.raises(AdmissionRejected) as rejected:
+        if mode == "sync":
+            with controller.admit("personal", budget=0.05):
+                pass
+        else:
+            asyncio.run(wait_for_slot())
+    assert time.perf_counter() - started < 1.0
+    assert rejected.value.status_code == 503
+    assert rejected.value.reason == DEADLINE_REASON
+
+    # No budget left: rejected without waiting
+    with pytest.raises(AdmissionRejected):
+        with controller.admit("personal", budget=-1.0):
+            pass
+    assert controller.stats()["tiers"]["personal"]["queued"] == 0
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+def test_engine_reports_a_deadline_reached_in_the_queue_as_a_timeout(monkeypatch, mode):
+    register_test_agents(monkeypatch)
+    engine = make_engine(max_concurrency=1, max_queue=4, queue_timeout=5.0)
+    ctx = make_ctx()
+    ctx.deadline = time.monotonic() + 0.05
+
+    started = time.perf_counter()
+    with engine.admission.admit("personal"):
+        if mode == "sync":
+            result = engine.run_agent("test_echo", {}, ctx)
+        else:
+            result = asyncio.run(engine.arun_agent("test_echo", {}, ctx))
+    assert time.perf_counter() - started < 1.0
+    assert result.ok is False
+    assert result.error == "timeout: request deadline passed before test_echo started"
+
+
+def test_waiters_are_granted_across_threads_and_cancellation_frees_the_slot():
+    controller = _controller(personal=AdmissionLimits(max_concurrency=1, max_queue=4, queue_timeout=5.0))
+    assert controller._acquire_or_enqueue("personal", lambda: None) is None
+
+    ran = threading.Event()
+
+    def blocking_caller():
+        with controller.admit("personal"):
+            ran.set()
+
+    thread = threading.Thread(target=blocking_caller)
+    thread.start()
+
+    async def wait_for_slot():
+        async with controller.aadmit("personal"):
+            pass
+
+    async def cancelled_caller():
+        task = asyncio.ensure_future(wait_for_slot())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancelled_caller())
+    controller.release("personal", 0.01)
+    thread.join(5)
+    assert ran.is_set()
+
+    stats = controller.stats()
+    assert stats["running"] == 0
+    assert stats["tiers"]["personal"]["queued"] == 0
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    from app.core.engine import engine
+    from app.main import app
+
+    def install(**limits):
+        controller = _controller(max_concurrency=8, personal=AdmissionLimits(**limits))
+        monkeypatch.setattr(engine, "admission", controller)
+        return controller
+
+    return TestClient(app), install
+
+
+@pytest.mark.parametrize(
+    "limits, status",
+    [
+        ({"max_concurrency": 1, "max_queue": 0}, 429),
+        ({"max_concurrency": 1, "max_queue": 1, "queue_timeout": 0.05}, 503),
+    ],
+)
+def test_saturated_tier_gets_status_and_retry_after_header(client, limits, status):
+    http, install = client
+    controller = install(**limits)
+
+    with controller.admit("personal"):
+        response = http.post(
+            "/api/v1/agents/orchestrate",
+            json={"goal": f"admission {uuid.uuid4()}"},
+            headers={"X-OperatorX-Tier": "personal"},
+        )
+    assert response.status_code == status
+    assert response.headers["Retry-After"] == str(response.json()["retry_after"])
+    assert response.json()["tier"] == "personal"
+
+    response = http.post("/api/v1/agents/orchestrate", json={"goal": f"admission {uuid.uuid4()}"})
+    assert response.status_code == 200
+    assert controller.stats()["running"] == 0
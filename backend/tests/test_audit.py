@@ -0,0 +1,188 @@
+import os
+
+import pytest
+
+from app.core.audit import AuditLog
+
+
+def _entry(request_id, **fields):
+    return {"request_id": request_id, "tier": "business", "agent": "planner", "outcome": "ok", **fields}
+
+
+def test_unencodable_entry_does_not_lose_its_batch(tmp_path):
+    log = AuditLog(str(tmp_path))
+    try:
+        log.append(_entry("before", input={"goal": "a"}))
+        log.append(_entry("big", input={"n": 2 ** 70}))
+        log.append(_entry("nan", output={"score": float("nan")}, input={"n": 2 ** 70}))
+        log.append(_entry("after", input={"goal": "b"}))
+        assert log.flush(timeout=5)
+
+        for request_id in ("before", "big", "nan", "after"):
+            assert [entry["request_id"] for entry in log.find(request_id=request_id)] == [request_id]
+        assert log.find(request_id="big")[0]["input"] == {"n": 2 ** 70}
+
+        quarantined = log.find(request_id="nan")[0]
+        assert "output" not in quarantined
+        assert quarantined["agent"] == "planner"
+        assert "unencodable" in quarantined
+
+        stats = log.stats()
+        assert stats["committed"] == 4
+        assert stats["unencodable"] == 1
+        assert stats["errors"] == 0
+        assert log.verify() == {"ok": True, "records": 4, "segments": 1}
+    finally:
+        log.stop()
+
+
+def _write(directory, request_ids, **kwargs):
+    log = AuditLog(str(directory), **kwargs)
+    for request_id in request_ids:
+        log.append(_entry(request_id, input={"goal": f"goal of {request_id}"}))
+    assert log.flush(timeout=5)
+    log.stop()
+
+
+def _lines(path):
+    return path.read_bytes().splitlines(keepends=True)
+
+
+def test_chain_continues_across_restarts(tmp_path):
+    _write(tmp_path, ["a", "b", "c"])
+    _write(tmp_path, ["d", "e"])
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.start()
+        assert log.verify() == {"ok": True, "records": 5, "segments": 3}
+        entries = log.find(since=0)
+        assert [entry["seq"] for entry in entries] == [1, 2, 3, 4, 5]
+        assert [entry["request_id"] for entry in entries] == ["a", "b", "c", "d", "e"]
+        assert entries[3]["prev"] == entries[2]["hash"]
+    finally:
+        log.stop()
+
+
+def test_recovery_cuts_a_torn_line_and_rebuilds_the_index(tmp_path):
+    _write(tmp_path, ["a", "b", "c"])
+    segment = tmp_path / "segment-000001.log"
+    with open(segment, "ab") as f:
+        f.write(b'{"seq":4,"ts":1.0,"request_id":"torn"')
+    (tmp_path / "segment-000001.idx").write_bytes(b"")
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.append(_entry("d"))
+        assert log.flush(timeout=5)
+        assert segment.read_bytes().endswith(b"}\n")
+        assert [entry["request_id"] for entry in log.find(request_id="b")] == ["b"]
+        assert log.find(request_id="torn") == []
+        assert log.find(request_id="d")[0]["seq"] == 4
+        assert log.verify()["ok"] is True
+    finally:
+        log.stop()
+
+
+def test_rotation_keeps_one_chain(tmp_path):
+    _write(tmp_path, [f"r{i}" for i in range(20)], segment_bytes=600, commit_batch=3)
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.start()
+        result = log.verify()
+        assert result["ok"] is True
+        assert result["records"] == 20
+        assert result["segments"] > 3
+        assert [entry["request_id"] for entry in log.find(request_id="r17")] == ["r17"]
+    finally:
+        log.stop()
+
+
+@pytest.mark.parametrize("tamper", ["modify", "remove", "reorder"])
+def test_verify_reports_the_first_tampered_line(tmp_path, tamper):
+    _write(tmp_path, ["a", "b", "c", "d"])
+    segment = tmp_path / "segment-000001.log"
+    lines = _lines(segment)
+    if tamper == "modify":
+        lines[1] = lines[1].replace(b"goal of b", b"goal of x")
+    elif tamper == "remove":
+        del lines[1]
+    else:
+        lines[1], lines[2] = lines[2], lines[1]
+    segment.write_bytes(b"".join(lines))
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.start()
+        result = log.verify()
+        assert result["ok"] is False
+        assert result["records"] == 1
+        assert result["error"]["segment"] == "segment-000001.log"
+        assert result["error"]["line"] == 2
+        expected = "hash mismatch (line modified)" if tamper == "modify" else "prev does not match the previous line"
+        assert result["error"]["reason"] == expected
+    finally:
+        log.stop()
+
+
+def test_second_writer_keeps_its_own_chain(tmp_path):
+    first = AuditLog(str(tmp_path))
+    second = AuditLog(str(tmp_path))
+    try:
+        first.append(_entry("a"))
+        second.append(_entry("b"))
+        assert first.flush(timeout=5) and second.flush(timeout=5)
+        assert second.directory == str(tmp_path / f"worker-{os.getpid()}")
+        assert first.verify() == {"ok": True, "records": 1, "segments": 1}
+        assert second.verify() == {"ok": True, "records": 1, "segments": 1}
+        assert second.find(request_id="a") == []
+    finally:
+        first.stop()
+        second.stop()
+
+
+@pytest.mark.parametrize("position", ["middle", "last"])
+def test_recovery_survives_a_corrupt_line(tmp_path, position):
+    _write(tmp_path, ["a", "b", "c", "d"])
+    segment = tmp_path / "segment-000001.log"
+    lines = _lines(segment)
+    broken = 1 if position == "middle" else 3
+    lines[broken] = b'{"seq":' + b"\xff" * 20 + b"}\n"
+    segment.write_bytes(b"".join(lines))
+    (tmp_path / "segment-000001.idx").write_bytes(b"")
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.start()
+        log.append(_entry("e"))
+        assert log.flush(timeout=5)
+
+        lost = "b" if position == "middle" else "d"
+        found = [entry["request_id"] for entry in log.find(since=0)]
+        assert found == [request_id for request_id in "abcde" if request_id != lost]
+        # The chain resumes after the last line that still decodes
+        assert log.find(request_id="e")[0]["seq"] == (5 if position == "middle" else 4)
+        assert log.stats()["corrupt_lines"] == 1
+
+        result = log.verify()
+        assert result["ok"] is False
+        assert result["error"]["line"] == broken + 1
+        assert result["error"]["reason"] == "malformed line"
+    finally:
+        log.stop()
+
+
+def test_lookups_skip_lines_corrupted_after_indexing(tmp_path):
+    _write(tmp_path, ["a", "b", "c"])
+    segment = tmp_path / "segment-000001.log"
+    lines = _lines(segment)
+    lines[1] = b"\xff" * (len(lines[1]) - 1) + b"\n"
+    segment.write_bytes(b"".join(lines))
+
+    log = AuditLog(str(tmp_path))
+    try:
+        log.start()
+        assert [entry["request_id"] for entry in log.find(since=0)] == ["a", "c"]
+    finally:
+        log.stop()
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.agents import CountingAgent, make_ctx, make_engine, register_test_agents
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+
+
+def test_batch_reports_each_failure_in_place():
+    items = [
+        ("test_echo", {"n": 1}, make_ctx()),
+        ("test_boom", {}, make_ctx()),
+        ("missing_agent", {}, make_ctx()),
+        ("test_slow", {"seconds": 1.0}, make_ctx()),
+        ("test_echo", {"n": 2}, make_ctx()),
+    ]
+    results = asyncio.run(make_engine().arun_batch(items, concurrency=2))
+
+    assert [result.agent for result in results] == [item[0] for item in items]
+    assert [result.request_id for result in results] == [item[2].request_id for item in items]
+    assert [result.ok for result in results] == [True, False, False, False, True]
+    assert results[0].output == {"echo": {"n": 1}}
+    assert "boom" in results[1].error
+    assert results[2].error == "Unknown agent: missing_agent"
+    assert results[3].error.startswith("timeout: test_slow")
+    assert results[4].output == {"echo": {"n": 2}}
+
+
+def test_batch_never_exceeds_its_concurrency():
+    CountingAgent.peak = 0
+    items = [("test_counting", {"index": i}, make_ctx()) for i in range(20)]
+    results = asyncio.run(make_engine().arun_batch(items, concurrency=3))
+
+    assert [result.output["index"] for result in results] == list(range(20))
+    assert CountingAgent.peak <= 3
+
+
+def test_batch_items_rejected_by_admission_become_error_results():
+    engine = make_engine(max_concurrency=1, max_queue=0)
+    items = [("test_slow", {"seconds": 0.02}, make_ctx()) for _ in range(3)]
+    results = asyncio.run(engine.arun_batch(items, concurrency=3))
+
+    assert sum(result.ok for result in results) == 1
+    rejected = [result for result in results if not result.ok]
+    assert len(rejected) == 2
+    assert all("saturated" in result.error for result in rejected)
+
+
+def test_batch_turns_engine_errors_into_results(monkeypatch):
+    engine = make_engine()
+    run_agent = engine.arun_agent
+
+    async def flaky(agent_name, input_data, ctx):
+        if input_data.get("fail"):
+            raise RuntimeError("memory store unavailable")
+        return await run_agent(agent_name, input_data, ctx)
+
+    monkeypatch.setattr(engine, "arun_agent", flaky)
+    items = [("test_echo", {"fail": True}, make_ctx()), ("test_echo", {}, make_ctx())]
+    results = asyncio.run(engine.arun_batch(items))
+
+    assert results[0].ok is False
+    assert results[0].error == "memory store unavailable"
+    assert results[1].ok is True
+
+
+def test_batch_route_reports_item_errors_with_200():
+    from app.main import app
+
+    http = TestClient(app)
+    response = http.post(
+        "/api/v1/agents/batch",
+        json={"items": [{"agent": "test_echo", "input": {"n": 1}}, {"agent": "missing_agent"}]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["ok"] for item in body["results"]] == [True, False]
+    assert body["summary"]["failed"] == 1
+    assert body["results"][1]["request_id"].endswith(":1")
+
+    assert http.post("/api/v1/agents/batch", json={"items": []}).status_code == 422
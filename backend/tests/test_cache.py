@@ -0,0 +1,165 @@
+import asyncio
+
+import pytest
+
+from app.agents.base import BaseAgent
+from app.agents.registry import registry
+from app.core.cache import ResultCache
+from app.core.engine import CoreEngine
+from tests.agents import make_ctx, register_test_agents
+
+
+class CachedAgent(BaseAgent):
+    name = "test_cached"
+    cacheable = True
+    calls = 0
+
+    async def arun(self, input_data, ctx):
+        type(self).calls += 1
+        return {"items": list(input_data.get("items", [])), "nested": {"count": type(self).calls}}
+
+
+class UncachedAgent(CachedAgent):
+    name = "test_uncached"
+    cacheable = False
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+    registry.register(CachedAgent.name, CachedAgent)
+    registry.register(UncachedAgent.name, UncachedAgent)
+    CachedAgent.calls = 0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now[0])
+    return now
+
+
+def _key(n):
+    return ResultCache.make_key("agent", "personal", {"n": n})
+
+
+# ------------------------------------------------------------
+# ResultCache
+# ------------------------------------------------------------
+def test_hit_miss_and_key_canonicalization():
+    cache = ResultCache()
+    assert cache.get(_key(1)) is None
+
+    cache.put(_key(1), {"answer": 1})
+    assert cache.get(ResultCache.make_key("agent", "personal", {"n": 1})) == {"answer": 1}
+    assert ResultCache.make_key("a", "t", {"x": 1, "y": 2}) == ResultCache.make_key("a", "t", {"y": 2, "x": 1})
+    assert ResultCache.make_key("a", "business", {"x": 1}) != ResultCache.make_key("a", "personal", {"x": 1})
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = ResultCache(ttl=10)
+    cache.put(_key(1), {"answer": 1})
+
+    clock[0] += 9.9
+    assert cache.get(_key(1)) == {"answer": 1}
+    clock[0] += 0.1
+    assert cache.get(_key(1)) is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put(_key(1), {"answer": 1})
+    cache.put(_key(2), {"answer": 2})
+    cache.get(_key(1))
+    cache.put(_key(3), {"answer": 3})
+
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) == {"answer": 1}
+    assert cache.get(_key(3)) == {"answer": 3}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_hits_never_share_objects_with_callers():
+    cache = ResultCache()
+    output = {"items": ["a"], "nested": {"count": 1}}
+    cache.put(_key(1), output)
+    output["items"].append("changed after put")
+
+    first = cache.get(_key(1))
+    first["items"].append("changed by a caller")
+    first["nested"]["count"] = 99
+
+    assert cache.get(_key(1)) == {"items": ["a"], "nested": {"count": 1}}
+    assert cache.get(_key(1)) is not cache.get(_key(1))
+
+
+def test_outputs_that_cannot_be_encoded_are_not_cached():
+    cache = ResultCache()
+    cache.put(_key(1), {"too_big": 2 ** 70})
+    assert cache.get(_key(1)) is None
+    assert len(cache) == 0
+
+
+def test_clear_drops_every_entry():
+    cache = ResultCache()
+    cache.put(_key(1), {"answer": 1})
+    cache.clear()
+    assert cache.get(_key(1)) is None
+
+
+# ------------------------------------------------------------
+# Engine integration
+# ------------------------------------------------------------
+def test_engine_serves_cacheable_agents_from_the_cache():
+    engine = CoreEngine(result_cache=ResultCache())
+
+    async def run():
+        first = await engine.arun_agent("test_cached", {"items": ["a"]}, make_ctx())
+        first.output["items"].append("mutated downstream")
+        second = await engine.arun_agent("test_cached", {"items": ["a"]}, make_ctx())
+        other_tier = await engine.arun_agent("test_cached", {"items": ["a"]}, make_ctx("business"))
+        return first, second, other_tier
+
+    first, second, other_tier = asyncio.run(run())
+    assert (first.cache, second.cache, other_tier.cache) == ("miss", "hit", "miss")
+    assert second.output == {"items": ["a"], "nested": {"count": 1}}
+    assert CachedAgent.calls == 2
+
+
+def test_non_cacheable_agents_bypass_the_cache():
+    engine = CoreEngine(result_cache=ResultCache())
+
+    async def run():
+        return [await engine.arun_agent("test_uncached", {}, make_ctx()) for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert [result.cache for result in results] == [None, None, None]
+    assert [result.output["nested"]["count"] for result in results] == [1, 2, 3]
+    assert engine.result_cache.stats()["hits"] + engine.result_cache.stats()["misses"] == 0
+
+
+def test_reliability_output_does_not_alias_the_request_input():
+    engine = CoreEngine(result_cache=ResultCache())
+    constraints = ["budget"]
+
+    result = engine.run_agent("deployment_reliability", {"goal": "uptime", "constraints": constraints}, make_ctx())
+    result.output["constraints"].append("mutated downstream")
+
+    assert constraints == ["budget"]
+    hit = engine.run_agent("deployment_reliability", {"goal": "uptime", "constraints": ["budget"]}, make_ctx())
+    assert hit.cache == "hit"
+    assert hit.output["constraints"] == ["budget"]
+
+
+def test_profile_reload_clears_the_shared_cache():
+    from app.core.engine import engine
+    from app.core.profiles import tier_profiles
+
+    engine.result_cache.put(_key(1), {"answer": 1})
+    tier_profiles.load()
+    assert engine.result_cache.get(_key(1)) is None
@@ -0,0 +1,60 @@
+import asyncio
+import time
+
+import pytest
+
+from app.agents.base import AgentContext, BaseAgent
+from app.agents.registry import registry
+from app.core.engine import CoreEngine
+from app.core.singleflight import SingleFlight
+
+
+class SharedAgent(BaseAgent):
+    name = "test_shared"
+    coalesce = True
+    calls = 0
+
+    async def arun(self, input_data, ctx):
+        type(self).calls += 1
+        await asyncio.sleep(input_data["seconds"])
+        return {"done": True}
+
+
+@pytest.fixture(autouse=True)
+def shared_agent(monkeypatch):
+    monkeypatch.setattr(registry, "_agents", dict(registry._agents))
+    registry.register(SharedAgent.name, SharedAgent, timeout=5)
+    SharedAgent.calls = 0
+
+
+def _run_together(*contexts, seconds=0.1):
+    engine = CoreEngine(coalescer=SingleFlight())
+
+    async def run():
+        return await asyncio.gather(*(
+            engine.arun_agent(SharedAgent.name, {"seconds": seconds}, ctx) for ctx in contexts
+        ))
+
+    return asyncio.run(run())
+
+
+def test_identical_calls_without_deadline_share_one_execution():
+    results = _run_together(AgentContext(request_id="a"), AgentContext(request_id="b"))
+
+    assert SharedAgent.calls == 1
+    assert all(result.ok for result in results)
+    assert [result.cache for result in results] == [None, "coalesced"]
+
+
+def test_calls_with_a_deadline_run_under_their_own():
+    now = time.monotonic()
+    tight = AgentContext(request_id="tight", deadline=now + 0.03)
+    loose = AgentContext(request_id="loose", deadline=now + 2.0)
+    unbounded = AgentContext(request_id="unbounded")
+
+    results = _run_together(tight, loose, unbounded)
+
+    assert SharedAgent.calls == 3
+    assert results[0].ok is False and results[0].error.startswith("timeout:")
+    assert results[1].ok is True and results[1].cache is None
+    assert results[2].ok is True and results[2].cache is None
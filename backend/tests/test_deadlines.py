@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.base import AgentContext, BaseAgent
+from app.agents.registry import registry
+from tests.agents import make_ctx, make_engine, register_test_agents
+
+
+class PatientAgent(BaseAgent):
+    """
+    Async agent with a long agent timeout: only a request deadline stops it.
+    """
+
+    name = "test_patient"
+    cancelled = threading.Event()
+
+    async def arun(self, input_data, ctx):
+        try:
+            await asyncio.sleep(input_data.get("seconds", 1.0))
+        except asyncio.CancelledError:
+            type(self).cancelled.set()
+            raise
+        return {"slept": True}
+
+
+class BlockingAgent(BaseAgent):
+    """
+    Sync agent that holds its bulkhead thread until released.
+    """
+
+    name = "test_blocking"
+    release = threading.Event()
+    finished = []
+
+    def run(self, input_data, ctx):
+        type(self).release.wait(input_data.get("seconds", 1.0))
+        type(self).finished.append(input_data.get("index"))
+        return {"index": input_data.get("index")}
+
+
+class QuickSyncAgent(BaseAgent):
+    name = "test_quick_sync"
+
+    def run(self, input_data, ctx):
+        return {"ok": True}
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+    registry.register(PatientAgent.name, PatientAgent, timeout=5)
+    registry.register(BlockingAgent.name, BlockingAgent, timeout=5, bulkhead=1)
+    registry.register(QuickSyncAgent.name, QuickSyncAgent, timeout=5)
+    PatientAgent.cancelled.clear()
+    BlockingAgent.release.clear()
+    BlockingAgent.finished = []
+    yield
+    BlockingAgent.release.set()
+
+
+def _deadline_ctx(seconds):
+    return AgentContext(tier="personal", request_id=None, deadline=time.monotonic() + seconds)
+
+
+# ------------------------------------------------------------
+# Request deadlines
+# ------------------------------------------------------------
+def test_deadline_header_shortens_the_agent_timeout():
+    from app.main import app
+
+    started = time.monotonic()
+    response = TestClient(app).post(
+        "/api/v1/agents/batch",
+        json={"items": [{"agent": "test_patient", "input": {"seconds": 2}}, {"agent": "test_echo"}]},
+        headers={"X-OperatorX-Deadline-Ms": "100"},
+    )
+    results = response.json()["results"]
+
+    assert time.monotonic() - started < 1.0
+    assert results[0]["ok"] is False
+    assert results[0]["error"].startswith("timeout: test_patient did not finish within")
+    assert results[1]["ok"] is True
+
+
+def test_deadline_cancels_async_agents():
+    result = asyncio.run(make_engine().arun_agent("test_patient", {"seconds": 2}, _deadline_ctx(0.05)))
+
+    assert result.error.startswith("timeout: test_patient did not finish within")
+    assert PatientAgent.cancelled.wait(1)
+
+
+def test_agent_timeout_applies_without_a_deadline():
+    result = asyncio.run(make_engine().arun_agent("test_slow", {"seconds": 1}, make_ctx()))
+    assert result.error == "timeout: test_slow did not finish within 50 ms"
+
+
+def test_an_expired_deadline_never_starts_the_agent():
+    ctx = _deadline_ctx(-1)
+
+    assert make_engine().run_agent("test_blocking", {}, ctx).error == (
+        "timeout: request deadline passed before test_blocking started"
+    )
+    assert asyncio.run(make_engine().arun_agent("test_patient", {}, ctx)).error == (
+        "timeout: request deadline passed before test_patient started"
+    )
+    assert BlockingAgent.finished == []
+
+
+def test_sync_callers_stop_waiting_at_the_deadline():
+    engine = make_engine()
+    started = time.monotonic()
+    result = engine.run_agent("test_blocking", {"index": 1}, _deadline_ctx(0.05))
+
+    assert time.monotonic() - started < 0.5
+    assert result.error.startswith("timeout: test_blocking")
+
+    # The abandoned thread finishes run() on its own
+    BlockingAgent.release.set()
+    engine.shutdown(wait=True)
+    assert BlockingAgent.finished == [1]
+
+
+# ------------------------------------------------------------
+# Bulkheads
+# ------------------------------------------------------------
+def test_saturated_bulkhead_times_out_queued_executions():
+    engine = make_engine()
+
+    async def run():
+        return await asyncio.gather(
+            engine.arun_agent("test_blocking", {"index": 1, "seconds": 0.3}, make_ctx()),
+            engine.arun_agent("test_blocking", {"index": 2}, _deadline_ctx(0.1)),
+        )
+
+    first, second = asyncio.run(run())
+    assert first.ok is True
+    assert second.error.startswith("timeout: test_blocking")
+    engine.shutdown(wait=True)
+
+    # Cancelled while still queued on the bulkhead: it never ran
+    assert BlockingAgent.finished == [1]
+
+
+def test_saturated_bulkhead_does_not_block_other_agents():
+    engine = make_engine()
+    assert engine.bulkhead("test_blocking")._max_workers == 1
+
+    async def run():
+        blocked = asyncio.ensure_future(engine.arun_agent("test_blocking", {"index": 1}, make_ctx()))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        other = await engine.arun_agent("test_quick_sync", {}, make_ctx())
+        elapsed = time.monotonic() - started
+        BlockingAgent.release.set()
+        return other, elapsed, await blocked
+
+    other, elapsed, blocked = asyncio.run(run())
+    assert other.ok is True and elapsed < 0.5
+    assert blocked.ok is True
+    assert engine.bulkhead("test_blocking") is not engine.bulkhead("test_quick_sync")
+    engine.shutdown(wait=True)
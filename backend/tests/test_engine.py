@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.agents.base import BaseAgent
+from app.agents.registry import INLINE, registry
+from tests.agents import make_ctx, make_engine, register_test_agents
+
+
+class ThreadAsyncAgent(BaseAgent):
+    name = "test_thread_async"
+
+    async def arun(self, input_data, ctx):
+        await asyncio.sleep(0)
+        return {"thread": threading.current_thread().name, "tier": ctx.tier}
+
+
+class ThreadSyncAgent(BaseAgent):
+    name = "test_thread_sync"
+
+    def run(self, input_data, ctx):
+        time.sleep(input_data.get("seconds", 0))
+        return {"thread": threading.current_thread().name, "tier": ctx.tier}
+
+
+class InlineAgent(ThreadSyncAgent):
+    name = "test_thread_inline"
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+    registry.register(ThreadAsyncAgent.name, ThreadAsyncAgent)
+    registry.register(ThreadSyncAgent.name, ThreadSyncAgent)
+    registry.register(InlineAgent.name, InlineAgent, execution=INLINE)
+
+
+def _arun(engine, agent_name, input_data=None, ctx=None):
+    # (result, name of the event loop's thread)
+    async def run():
+        result = await engine.arun_agent(agent_name, input_data or {}, ctx or make_ctx())
+        return result, threading.current_thread().name
+
+    return asyncio.run(run())
+
+
+def test_async_agents_are_awaited_on_the_event_loop():
+    result, loop_thread = _arun(make_engine(), "test_thread_async", ctx=make_ctx("business"))
+
+    assert result.ok is True
+    assert result.output == {"thread": loop_thread, "tier": "business"}
+
+
+def test_sync_agents_run_on_their_bulkhead():
+    result, loop_thread = _arun(make_engine(), "test_thread_sync")
+
+    assert result.ok is True
+    assert result.output["thread"] != loop_thread
+    assert result.output["thread"].startswith("operatorx-test_thread_sync")
+
+
+def test_inline_sync_agents_run_on_the_event_loop():
+    result, loop_thread = _arun(make_engine(), "test_thread_inline")
+    assert result.output["thread"] == loop_thread
+
+
+def test_blocking_sync_agents_do_not_stall_the_event_loop():
+    engine = make_engine()
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        ticker = asyncio.ensure_future(tick())
+        result = await engine.arun_agent("test_thread_sync", {"seconds": 0.2}, make_ctx())
+        ticker.cancel()
+        return result
+
+    assert asyncio.run(run()).ok is True
+    assert len(ticks) >= 5
+
+
+def test_sync_and_async_paths_return_the_same_results():
+    engine = make_engine()
+    sync_result = engine.run_agent("test_echo", {"n": 1}, make_ctx())
+    async_result, _ = _arun(engine, "test_echo", {"n": 1})
+    assert (sync_result.ok, sync_result.output) == (async_result.ok, async_result.output) == (True, {"echo": {"n": 1}})
+
+    sync_error = engine.run_agent("test_boom", {}, make_ctx())
+    async_error, _ = _arun(engine, "test_boom")
+    assert (sync_error.ok, async_error.ok) == (False, False)
+    assert "boom" in sync_error.error and "boom" in async_error.error
+
+    unknown, _ = _arun(engine, "missing_agent")
+    assert (unknown.ok, unknown.error) == (False, "Unknown agent: missing_agent")
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app import agent_routes, memory_routes
+from app.core.serialization import FastJSONResponse, dumps, loads
+from tests.agents import register_test_agents
+
+# Non-ASCII text, nesting, nulls, booleans and floats
+PAYLOAD = {
+    "text": "déploiement ✓ 日本",
+    "nested": {"items": [1, 2.5, -0.125, None, True, False], "empty": {}},
+    "quote": 'a "quoted" \\ value\n',
+    "ratio": 1234.5678,
+}
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+
+
+@pytest.fixture
+def http():
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def both_paths(monkeypatch, http):
+    """
+    post(path, body, **kwargs) -> (pydantic path bytes, fast path bytes).
+
+    perf_counter is frozen so elapsed/duration fields are identical.
+    """
+    monkeypatch.setattr(time, "perf_counter", lambda: 100.0)
+
+    def send(method, path, **kwargs):
+        bodies = []
+        for fast in (False, True):
+            monkeypatch.setattr(agent_routes, "FAST_JSON", fast)
+            monkeypatch.setattr(memory_routes, "FAST_JSON", fast)
+            response = http.request(method, path, **kwargs)
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            bodies.append(response.content)
+        return bodies
+
+    return send
+
+
+def test_fast_encoder_matches_the_default_response_encoding():
+    assert FastJSONResponse(PAYLOAD).body == JSONResponse(PAYLOAD).body
+    assert dumps(PAYLOAD) == JSONResponse(PAYLOAD).body
+    assert loads(memoryview(dumps(PAYLOAD))) == PAYLOAD
+    assert FastJSONResponse(b'{"raw":true}').body == b'{"raw":true}'
+
+
+def test_orchestrate_bodies_are_byte_identical(both_paths):
+    body = {"goal": "déployer ✓", "constraints": ["budget"]}
+    slow, fast = both_paths("POST", "/api/v1/agents/orchestrate", json=body)
+    assert slow == fast
+    assert loads(fast)["plan"]
+
+
+def test_batch_bodies_are_byte_identical(both_paths):
+    items = [
+        {"agent": "test_echo", "input": PAYLOAD},
+        {"agent": "test_boom"},
+        {"agent": "missing_agent", "tier": "business"},
+    ]
+    slow, fast = both_paths("POST", "/api/v1/agents/batch", json={"items": items}, headers={"X-Request-Id": "b1"})
+    assert slow == fast
+
+
+def test_pipeline_bodies_are_byte_identical(both_paths):
+    spec = {
+        "nodes": [
+            {"id": "first", "agent": "test_echo", "map": {"value": "input.value"}},
+            {"id": "second", "agent": "test_echo", "map": {"upstream": "first"}},
+            {"id": "broken", "agent": "test_boom", "after": ["first"]},
+        ],
+        "input": {"value": PAYLOAD},
+    }
+    slow, fast = both_paths("POST", "/api/v1/agents/pipeline", json=spec, headers={"X-Request-Id": "p1"})
+    assert slow == fast
+    assert sorted(loads(fast)["nodes"]) == ["broken", "first", "second"]
+
+
+def test_memory_bodies_are_byte_identical(both_paths, http):
+    http.post(
+        "/api/v1/agents/batch",
+        json={"items": [{"agent": "test_echo", "input": PAYLOAD}]},
+        headers={"X-Request-Id": "m1"},
+    )
+
+    slow, fast = both_paths("GET", "/api/v1/memory", headers={"X-Request-Id": "m1:0"})
+    assert slow == fast
+    assert loads(fast)["ok"] is True
+
+    missing_slow, missing_fast = both_paths("GET", "/api/v1/memory", headers={"X-Request-Id": "nothing"})
+    assert missing_slow == missing_fast
@@ -0,0 +1,143 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.registry import registry
+from app.core.http_cache import PrecomputedResponses, etag_matches
+from app.core.memory import memory_store
+from tests.agents import EchoAgent, register_test_agents
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+
+
+@pytest.fixture
+def http():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _revalidate(http, path, etag, **headers):
+    return http.get(path, headers={"If-None-Match": etag, **headers})
+
+
+# ------------------------------------------------------------
+# Precomputed GET endpoints
+# ------------------------------------------------------------
+@pytest.mark.parametrize("path", ["/api/v1/health", "/api/v1/meta", "/api/v1/agents"])
+def test_matching_etags_get_an_empty_304(http, path):
+    first = http.get(path)
+    etag = first.headers["etag"]
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+
+    unchanged = _revalidate(http, path, etag)
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+    assert unchanged.headers["cache-control"] == "no-cache"
+
+    assert _revalidate(http, path, '"stale"').status_code == 200
+
+
+def test_agents_etag_changes_when_an_agent_is_registered(http):
+    first = http.get("/api/v1/agents")
+    registry.register("test_echo_again", EchoAgent)
+
+    changed = _revalidate(http, "/api/v1/agents", first.headers["etag"])
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
+    assert "test_echo_again" in changed.json()["agents"]
+    assert _revalidate(http, "/api/v1/agents", changed.headers["etag"]).status_code == 304
+
+
+def test_tier_responses_are_cached_per_header_value(http):
+    personal = http.get("/api/v1/tier", headers={"X-OperatorX-Tier": "personal"})
+    business = http.get("/api/v1/tier", headers={"X-OperatorX-Tier": "business"})
+
+    assert personal.headers["etag"] != business.headers["etag"]
+    assert personal.headers["cache-control"] == "private, no-cache"
+    assert personal.headers["vary"] == "X-OperatorX-Tier"
+
+    # Another tier's ETag does not match
+    other = _revalidate(http, "/api/v1/tier", business.headers["etag"], **{"X-OperatorX-Tier": "personal"})
+    assert other.status_code == 200
+
+    unchanged = _revalidate(http, "/api/v1/tier", personal.headers["etag"], **{"X-OperatorX-Tier": "personal"})
+    assert (unchanged.status_code, unchanged.headers["vary"]) == (304, "X-OperatorX-Tier")
+
+
+def test_tier_etag_survives_a_reload_with_the_same_profiles(http):
+    from app.core.profiles import tier_profiles
+
+    first = http.get("/api/v1/tier", headers={"X-OperatorX-Tier": "personal"})
+    tier_profiles.load()
+
+    again = _revalidate(http, "/api/v1/tier", first.headers["etag"], **{"X-OperatorX-Tier": "personal"})
+    assert again.status_code == 304
+
+
+# ------------------------------------------------------------
+# Memory records
+# ------------------------------------------------------------
+def test_memory_etag_round_trip_and_change_after_an_update(http):
+    http.post("/api/v1/agents/batch", json={"items": [{"agent": "test_echo"}]}, headers={"X-Request-Id": "etag"})
+    path = "/api/v1/memory?request_id=etag:0"
+
+    first = http.get(path)
+    etag = first.headers["etag"]
+    assert (first.status_code, first.json()["ok"]) == (200, True)
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    unchanged = _revalidate(http, path, etag)
+    assert (unchanged.status_code, unchanged.content) == (304, b"")
+
+    memory_store.update("etag:0", lambda record: record.data.update(note="changed"))
+    changed = _revalidate(http, path, etag)
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["data"]["note"] == "changed"
+    assert _revalidate(http, path, changed.headers["etag"]).status_code == 304
+
+
+def test_missing_memory_records_have_no_etag(http):
+    response = _revalidate(http, "/api/v1/memory?request_id=nothing", "*")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.json()["ok"] is False
+
+
+# ------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+def test_precomputed_bodies_are_rebuilt_only_for_new_versions():
+    responses = PrecomputedResponses(max_entries=2)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return {"count": len(builds)}
+
+    body, etag = responses.get("key", 1, build)
+    assert responses.get("key", 1, build) == (body, etag)
+    assert len(builds) == 1
+
+    new_body, new_etag = responses.get("key", 2, build)
+    assert (new_body, len(builds)) == (b'{"count":2}', 2)
+    assert new_etag != etag
+
+    responses.get("other", 1, build)
+    responses.get("third", 1, build)
+    assert list(responses._entries) == ["other", "third"]
@@ -0,0 +1,42 @@
+import io
+import json
+import logging
+
+from app.core.logs import LogPipeline
+
+
+def test_importing_the_app_does_not_touch_the_root_logger():
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+
+    from app.core.logs import log_pipeline
+    import app.main  # noqa: F401
+
+    assert log_pipeline.started_at is None
+    assert log_pipeline.handler not in root.handlers
+    assert root.handlers == handlers
+
+
+def test_pipeline_writes_json_lines_until_stopped():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream=stream, level="INFO")
+    try:
+        pipeline.install()
+        pipeline.install()
+        assert root.handlers == [pipeline.handler]
+
+        logging.getLogger("operatorx.test").info("test.event", extra={"request_id": "r1"})
+        logging.getLogger("operatorx.test").debug("test.hidden")
+        pipeline.stop()
+    finally:
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["event"], line["request_id"]) for line in lines] == [("test.event", "r1")]
+    assert pipeline.handler.dropped == 0
@@ -0,0 +1,278 @@
+import asyncio
+import threading
+import time
+
+from app.core.memory import InMemoryStore, MemoryRecord, packed_size, record_size
+
+
+def _store(**kwargs):
+    kwargs.setdefault("tier_ttls", {})
+    kwargs.setdefault("default_ttl", 1e9)
+    return InMemoryStore(**kwargs)
+
+
+def _record(request_id, tier="personal", age=0.0, **data):
+    # A record last updated `age` seconds ago (store it with touch=False)
+    return MemoryRecord(request_id, tier, updated_at=time.time() - age, data=data)
+
+
+def _resident(store):
+    # Bytes recomputed from the records themselves
+    return sum(record.size for shard in store._shards for record in shard.records.values())
+
+
+def _ids_in_distinct_shards(store, count):
+    ids, shards = [], set()
+    for i in range(1000):
+        shard = id(store._shard(f"r{i}"))
+        if shard not in shards:
+            shards.add(shard)
+            ids.append(f"r{i}")
+            if len(ids) == count:
+                return ids
+    raise AssertionError("not enough shards")
+
+
+# ------------------------------------------------------------
+# TTL expiry
+# ------------------------------------------------------------
+def test_records_expire_after_their_tier_ttl():
+    store = _store(tier_ttls={"personal": 60, "government": 3600}, default_ttl=600)
+    store.upsert(_record("personal", age=61), touch=False)
+    store.upsert(_record("government", "government", age=61), touch=False)
+    store.upsert(_record("custom", "custom", age=601), touch=False)
+    store.upsert(_record("fresh", age=59), touch=False)
+
+    assert store.get("personal") is None
+    assert store.get("government") is not None
+    assert store.get("custom") is None
+    assert store.snapshot("fresh") is not None
+    assert store.stats()["expirations"] == 2
+    assert len(store) == 2
+
+
+def test_updates_restart_the_ttl():
+    store = _store(tier_ttls={"personal": 60})
+    store.upsert(_record("r1", age=59), touch=False)
+    store.update("r1", lambda record: record.data.update(step=2))
+
+    assert store.sweep(now=time.time() + 30) == 0
+    assert store.get("r1").data == {"step": 2}
+
+
+def test_update_does_not_resurrect_an_expired_record():
+    store = _store(tier_ttls={"personal": 60})
+    store.upsert(_record("r1", age=61, step=1), touch=False)
+
+    assert store.update("r1", lambda record: record.data.update(step=2)) is None
+    assert store.update("r1", lambda record: record.data.update(step=2), tier="personal").data == {"step": 2}
+
+
+# ------------------------------------------------------------
+# Sweeper
+# ------------------------------------------------------------
+def test_sweep_drops_only_expired_records():
+    store = _store(tier_ttls={"personal": 60}, shards=4)
+    for i in range(10):
+        store.upsert(_record(f"old{i}", age=120), touch=False)
+        store.upsert(_record(f"new{i}"), touch=False)
+
+    assert store.sweep() == 10
+    assert sorted(r for shard in store._shards for r in shard.records) == sorted(f"new{i}" for i in range(10))
+    assert store.stats()["bytes"] == _resident(store)
+    assert store.sweep() == 0
+
+
+def test_background_sweeper_runs_until_stopped():
+    store = _store(tier_ttls={"personal": 0.05})
+
+    async def run():
+        store.start_sweeper(interval=0.01)
+        assert store.start_sweeper(interval=0.01) is store._sweeper
+        store.upsert(_record("r1"))
+        await asyncio.sleep(0.2)
+        swept = len(store)
+        await store.stop_sweeper()
+        store.upsert(_record("r2"))
+        await asyncio.sleep(0.1)
+        return swept
+
+    assert asyncio.run(run()) == 0
+    assert store._sweeper is None
+    assert "r2" in store._shard("r2").records
+
+
+def test_sweeper_survives_a_failing_sweep(monkeypatch):
+    store = _store()
+    calls = []
+
+    def sweep(now=None):
+        calls.append(now)
+        if len(calls) == 1:
+            raise RuntimeError("sweep failed")
+        return 0
+
+    monkeypatch.setattr(store, "sweep", sweep)
+
+    async def run():
+        store.start_sweeper(interval=0.01)
+        await asyncio.sleep(0.1)
+        await store.stop()
+
+    asyncio.run(run())
+    assert len(calls) >= 2
+
+
+# ------------------------------------------------------------
+# LRU eviction
+# ------------------------------------------------------------
+def test_least_recently_used_records_are_evicted_past_max_records():
+    store = _store(max_records=3, shards=1)
+    for request_id in ("a", "b", "c"):
+        store.upsert(_record(request_id))
+    store.get("a")
+    store.upsert(_record("d"))
+
+    assert store.get("b") is None
+    assert [request_id for request_id in store._shards[0].records] == ["c", "a", "d"]
+    assert store.stats()["evictions"] == 1
+
+
+def test_max_records_is_split_across_shards_and_keeps_the_latest_record():
+    store = _store(max_records=4, shards=4)
+    assert store._shard_max_records == 1
+
+    first, second = [r for r in (f"r{i}" for i in range(1000)) if store._shard(r) is store._shard("r0")][:2]
+    store.upsert(_record(first))
+    store.upsert(_record(second))
+
+    assert store.get(first) is None
+    assert store.get(second) is not None
+
+
+# ------------------------------------------------------------
+# Lock striping
+# ------------------------------------------------------------
+def test_records_are_spread_over_independent_shards():
+    store = _store(shards=8)
+    for i in range(200):
+        store.upsert(_record(f"r{i}"))
+
+    assert all(shard.records for shard in store._shards)
+    assert store.stats()["records"] == len(store) == 200
+    assert store.stats()["shards"] == 8
+
+
+def test_a_held_shard_does_not_block_the_others():
+    store = _store(shards=4)
+    busy, free = _ids_in_distinct_shards(store, 2)
+    store.upsert(_record(free, step=1))
+
+    done = threading.Event()
+
+    def work():
+        store.update(free, lambda record: record.data.update(step=2))
+        done.set()
+
+    with store._shard(busy).lock:
+        thread = threading.Thread(target=work)
+        thread.start()
+        assert done.wait(1)
+    thread.join()
+    assert store.get(free).data == {"step": 2}
+
+
+def test_concurrent_updates_and_upserts_are_not_lost():
+    store = _store(shards=4)
+    threads, per_thread = 8, 300
+
+    def count(record):
+        record.data["count"] = record.data.get("count", 0) + 1
+
+    def work(n):
+        for i in range(per_thread):
+            store.update(f"shared{i % 4}", count, tier="personal")
+            store.upsert(_record(f"t{n}-{i}"))
+            if i % 50 == 0:
+                store.stats()
+                store.snapshot(f"shared{i % 4}")
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sum(store.get(f"shared{i}").data["count"] for i in range(4)) == threads * per_thread
+    assert len(store) == threads * per_thread + 4
+    assert store.stats()["bytes"] == _resident(store)
+
+
+# ------------------------------------------------------------
+# Byte accounting / global budget
+# ------------------------------------------------------------
+def test_record_size_follows_the_payload():
+    small, large = _record("r1"), _record("r1", goal="g" * 1000)
+    assert record_size(large) >= record_size(small) + 1000
+    assert record_size(_record("r1", "government")) == record_size(small)
+
+    packed = _record("r1", last_output={"text": "x" * 1000})
+    unpacked_size = record_size(packed)
+    packed.pack()
+    assert packed_size(packed) == len(packed.packed["last_output"])
+    assert record_size(packed) < unpacked_size
+
+
+def test_byte_accounting_follows_replacements_and_removals():
+    store = _store(tier_ttls={"personal": 60}, shards=2)
+    store.upsert(_record("r1", goal="g" * 1000))
+    big = store.stats()["bytes"]
+    assert big == record_size(store.get("r1"))
+
+    store.update("r1", lambda record: record.data.update(goal="small"))
+    assert store.stats()["bytes"] == record_size(store.get("r1")) < big
+
+    store.sweep(now=time.time() + 120)
+    assert store.stats()["bytes"] == 0
+
+
+def test_byte_budget_evicts_the_oldest_records_across_shards():
+    size = record_size(_record("r0", blob="x" * 1000))
+    store = _store(max_bytes=int(3.5 * size), shards=4)
+    for i in range(6):
+        # Distinct ages: r0 is the least recently updated
+        store.upsert(_record(f"r{i}", age=100 - i, blob="x" * 1000), touch=False)
+
+    assert [store.get(f"r{i}") is not None for i in range(6)] == [False] * 3 + [True] * 3
+    assert store.stats()["evictions"] == 3
+    assert store.resident_bytes() <= store.max_bytes
+
+
+def test_byte_budget_keeps_the_record_just_written():
+    store = _store(max_bytes=10, shards=4)
+    store.upsert(_record("first", blob="x" * 100))
+    assert store.get("first") is not None
+
+    store.update("second", lambda record: record.data.update(blob="x" * 100), tier="personal")
+    assert store.get("first") is None
+    assert store.get("second") is not None
+    assert len(store) == 1
+
+
+def test_byte_budget_holds_under_concurrent_writes():
+    size = record_size(_record("t0-0", blob="x" * 500))
+    store = _store(max_bytes=20 * size, shards=8)
+
+    def work(n):
+        for i in range(200):
+            store.upsert(_record(f"t{n}-{i}", blob="x" * 500))
+
+    workers = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    stats = store.stats()
+    assert stats["bytes"] == _resident(store) <= store.max_bytes
+    assert stats["records"] + stats["evictions"] == 8 * 200
@@ -0,0 +1,187 @@
+import itertools
+import time
+
+import pytest
+
+from app import memory_routes
+from app.core.memory import InMemoryStore, MemoryRecord, decode_cursor, encode_cursor
+
+AGENTS = ("orchestrator", "planner", "reliability")
+TIERS = ("personal", "business", "government")
+
+
+def _store(**kwargs):
+    kwargs.setdefault("shards", 8)
+    return InMemoryStore(tier_ttls={}, default_ttl=1e9, **kwargs)
+
+
+def _fill(store, count, start=None):
+    """
+    Store `count` executions, oldest first, 10 ms apart.
+    """
+    start = time.time() - 3600 if start is None else start
+    for i in range(count):
+        record = MemoryRecord(
+            request_id=f"req-{i:04d}",
+            tier=TIERS[i % 3],
+            updated_at=start + i * 0.01,
+            data={
+                "last_agent": AGENTS[i % 5 % 3],
+                "last_ok": i % 4 != 0,
+                "last_duration_ms": float(i % 100),
+            },
+        )
+        store.upsert(record, touch=False)
+
+
+def _pages(store, limit, **filters):
+    items, cursor, pages = [], None, 0
+    while True:
+        page, cursor = store.query(limit=limit, cursor=cursor, **filters)
+        assert len(page) <= limit
+        items.extend(page)
+        pages += 1
+        assert pages < 10_000
+        if cursor is None:
+            return items
+
+
+def _expected(store, tier=None, agent=None, status=None, since=None, until=None, min_duration_ms=None):
+    records = [record for shard in store._shards for record in shard.records.values()]
+    keep = [
+        record for record in records
+        if (tier is None or record.tier == tier)
+        and (agent is None or record.data["last_agent"] == agent)
+        and (status is None or record.data["last_ok"] is (status == "ok"))
+        and (since is None or record.updated_at >= since)
+        and (until is None or record.updated_at <= until)
+        and (min_duration_ms is None or record.data["last_duration_ms"] >= min_duration_ms)
+    ]
+    keep.sort(key=lambda record: record.updated_at, reverse=True)
+    return [record.request_id for record in keep]
+
+
+def test_pages_cover_every_shard_without_duplicates_or_gaps():
+    store = _store()
+    _fill(store, 500)
+
+    for limit in (1, 7, 50, 500):
+        items = _pages(store, limit)
+        ids = [item["request_id"] for item in items]
+        assert ids == _expected(store)
+        assert len(set(ids)) == 500
+
+
+def test_short_pages_still_reach_sparse_matches():
+    # 1 in 100 records is this slow: most pages run out of scan budget
+    # (limit * QUERY_SCAN_FACTOR per shard) and come back short
+    store = _store(shards=2)
+    _fill(store, 2000)
+
+    items = _pages(store, 1, min_duration_ms=99)
+    assert [item["request_id"] for item in items] == _expected(store, min_duration_ms=99)
+    assert len(items) == 20
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"tier": tier, "agent": agent, "status": status}
+        for tier, agent, status in itertools.product((None, *TIERS), (None, *AGENTS), (None, "ok", "error"))
+    ],
+)
+def test_filter_combinations_match_a_full_scan(filters):
+    store = _store()
+    _fill(store, 300)
+
+    items = _pages(store, 9, **filters)
+    assert [item["request_id"] for item in items] == _expected(store, **filters)
+    for item in items:
+        assert filters.get("tier") in (None, item["tier"])
+        assert filters.get("agent") in (None, item["agent"])
+        assert filters.get("status") in (None, "ok" if item["ok"] else "error")
+
+
+def test_time_range_and_duration_filters():
+    store = _store()
+    start = time.time() - 3600
+    _fill(store, 300, start=start)
+    since, until = start + 0.5, start + 2.0
+
+    for filters in (
+        {"since": since},
+        {"until": until},
+        {"since": since, "until": until},
+        {"since": since, "until": until, "tier": "business", "min_duration_ms": 30},
+        {"agent": "planner", "status": "error", "min_duration_ms": 10},
+    ):
+        items = _pages(store, 13, **filters)
+        assert [item["request_id"] for item in items] == _expected(store, **filters)
+
+
+def test_cursor_is_stable_while_records_are_updated_and_evicted():
+    store = _store(max_records=400)
+    _fill(store, 400)
+
+    first, cursor = store.query(limit=100)
+    seen = {item["request_id"] for item in first}
+    stamp = decode_cursor(encode_cursor(cursor))[0]
+
+    # Updates move records above the cursor (a seen one and an unseen
+    # one); new records evict the least recently used ones per shard
+    unseen = next(request_id for request_id in _expected(store) if request_id not in seen)
+    touched = {first[0]["request_id"], unseen}
+    for request_id in touched:
+        assert store.update(request_id, lambda record: record.data.update(last_duration_ms=1.0))
+    before = {request_id for shard in store._shards for request_id in shard.records}
+    now = time.time()
+    for i in range(40):
+        store.upsert(MemoryRecord(request_id=f"new-{i}", tier="personal", updated_at=now + i), touch=False)
+
+    rest = []
+    while cursor is not None:
+        page, cursor = store.query(limit=100, cursor=cursor)
+        rest.extend(item["request_id"] for item in page)
+
+    assert len(rest) == len(set(rest))
+    assert not seen & set(rest)
+    assert not touched & set(rest)
+    assert not any(request_id.startswith("new-") for request_id in rest)
+
+    # Everything still stored below the first page comes back, in order
+    remaining = [
+        request_id for request_id in _expected(store)
+        if request_id not in seen and request_id not in touched and not request_id.startswith("new-")
+    ]
+    assert rest == remaining
+    evicted = before - {request_id for shard in store._shards for request_id in shard.records}
+    assert evicted
+    assert not evicted & set(rest)
+    assert all(store.get(request_id).updated_at < stamp for request_id in remaining)
+
+
+def test_list_executions_route_helper(monkeypatch):
+    store = _store()
+    _fill(store, 30)
+    monkeypatch.setattr(memory_routes, "memory_store", store)
+
+    def list_executions(**overrides):
+        params = dict(
+            tier=None, agent=None, status=None, since=None, until=None,
+            min_duration_ms=None, limit=10, cursor=None,
+        )
+        params.update(overrides)
+        return memory_routes._list_executions(**params)
+
+    assert list_executions(status="failed") == {"ok": False, "error": "status must be 'ok' or 'error'"}
+    assert list_executions(cursor="not-a-cursor") == {"ok": False, "error": "Invalid cursor"}
+
+    ids, cursor = [], None
+    while True:
+        body = list_executions(tier=" Business ", cursor=cursor)
+        assert body["ok"] is True
+        ids.extend(item["request_id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == _expected(store, tier="business")
@@ -0,0 +1,109 @@
+import time
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.timing import ServerTiming, current_timing, span
+from app.middleware import parse_deadline
+from tests.agents import register_test_agents
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+
+
+@pytest.fixture
+def http():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _spans(response):
+    # "name;dur=1.234, ..." -> {name: milliseconds}, in header order
+    spans = {}
+    for part in response.headers["server-timing"].split(", "):
+        name, duration = part.split(";dur=")
+        spans[name] = float(duration)
+    return spans
+
+
+# ------------------------------------------------------------
+# X-Request-Id
+# ------------------------------------------------------------
+def test_request_ids_are_minted_when_missing(http):
+    first, second = http.get("/api/v1/health"), http.get("/api/v1/health")
+
+    assert uuid.UUID(first.headers["x-request-id"])
+    assert first.headers["x-request-id"] != second.headers["x-request-id"]
+
+
+def test_client_request_ids_are_reused_end_to_end(http):
+    response = http.post(
+        "/api/v1/agents/batch",
+        json={"items": [{"agent": "test_echo"}, {"agent": "test_echo"}]},
+        headers={"X-Request-Id": "trace-123"},
+    )
+
+    assert response.headers.get_list("x-request-id") == ["trace-123"]
+    assert [item["request_id"] for item in response.json()["results"]] == ["trace-123:0", "trace-123:1"]
+
+
+def test_errors_and_streams_carry_both_headers(http):
+    missing = http.get("/api/v1/does-not-exist", headers={"X-Request-Id": "trace-404"})
+    stream = http.post("/api/v1/agents/test_echo/stream", json={}, headers={"X-Request-Id": "trace-stream"})
+
+    assert (missing.status_code, missing.headers["x-request-id"]) == (404, "trace-404")
+    assert stream.headers["x-request-id"] == "trace-stream"
+    assert "total" in _spans(missing) and "total" in _spans(stream)
+
+
+# ------------------------------------------------------------
+# Server-Timing
+# ------------------------------------------------------------
+def test_agent_requests_report_engine_and_agent_spans(http):
+    spans = _spans(http.post("/api/v1/agents/batch", json={"items": [{"agent": "test_echo"}]}))
+
+    assert list(spans)[0] == "routing" and list(spans)[-1] == "total"
+    assert {"engine", "agent"} <= set(spans)
+    assert spans["agent"] <= spans["engine"] <= spans["total"]
+    assert spans["routing"] == pytest.approx(spans["total"] - spans["engine"], abs=0.01)
+
+
+def test_requests_outside_the_engine_report_routing_and_total_only(http):
+    spans = _spans(http.get("/api/v1/health"))
+    assert list(spans) == ["routing", "total"]
+
+
+def test_spans_with_the_same_name_accumulate():
+    timing = ServerTiming()
+    token = current_timing.set(timing)
+    try:
+        for _ in range(2):
+            with span("agent"):
+                time.sleep(0.01)
+    finally:
+        current_timing.reset(token)
+
+    assert timing.spans["agent"] >= 0.02
+    assert "agent;dur=" in timing.header_value()
+
+
+def test_spans_outside_a_request_record_nothing():
+    with span("agent"):
+        pass
+    assert current_timing.get() is None
+
+
+# ------------------------------------------------------------
+# X-OperatorX-Deadline-Ms
+# ------------------------------------------------------------
+@pytest.mark.parametrize("value", [b"abc", b"-1", b"nan", b""])
+def test_invalid_deadlines_are_ignored(value):
+    assert parse_deadline(value, 100.0) is None
+
+
+def test_deadlines_are_measured_from_arrival():
+    assert parse_deadline(b"250", 100.0) == 100.25
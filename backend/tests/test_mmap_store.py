@@ -0,0 +1,201 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+
+import pytest
+
+from app.core.memory import MemoryRecord
+from app.core.mmap_store import _ENTRY, _USED, MmapMemoryStore, StoreClosed, _key_hash
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "memory.mmap")
+
+
+@pytest.fixture
+def store(path):
+    store = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    yield store
+    store.close()
+
+
+def _slot(store, request_id):
+    # Slot currently holding request_id
+    key = request_id.encode("utf-8")
+    for slot in store._probe(_key_hash(key)):
+        entry = _ENTRY.unpack_from(store._mm, store._entry_offset(slot))
+        if entry[1] == _USED and store._decode_key_matches(slot, entry, key):
+            return slot
+    raise AssertionError(f"{request_id} not stored")
+
+
+# ------------------------------------------------------------
+# Seqlock read path
+# ------------------------------------------------------------
+def test_read_retries_when_a_write_lands_during_decode(store):
+    store.upsert(MemoryRecord("r1", "personal", data={"v": 1}))
+    decode = store._decode
+    calls = []
+
+    def racing_decode(slot, entry, key):
+        record = decode(slot, entry, key)
+        if not calls:
+            # A writer commits between the read and the seq re-check
+            store.upsert(MemoryRecord("r1", "personal", data={"v": 2}))
+        calls.append(record.data)
+        return record
+
+    store._decode = racing_decode
+    assert store.get("r1").data == {"v": 2}
+    assert calls == [{"v": 1}, {"v": 2}]
+
+
+def test_read_never_returns_a_slot_that_is_being_written(store):
+    store.upsert(MemoryRecord("r1", "personal", data={"v": 1}))
+    offset = store._entry_offset(_slot(store, "r1"))
+    (seq,) = struct.unpack_from("<I", store._mm, offset)
+
+    struct.pack_into("<I", store._mm, offset, seq + 1)
+    assert store.get("r1") is None
+
+    struct.pack_into("<I", store._mm, offset, seq)
+    assert store.get("r1").data == {"v": 1}
+
+
+def test_concurrent_readers_never_see_torn_records(store):
+    store.upsert(MemoryRecord("r1", "personal", data={"n": 0, "twice": 0, "pad": ""}))
+    stop = threading.Event()
+    seen = []
+
+    def write():
+        for n in range(1, 2000):
+            store.update("r1", lambda record, n=n: record.data.update(n=n, twice=2 * n, pad="x" * (n % 300)))
+        stop.set()
+
+    def read():
+        while not stop.is_set():
+            record = store.get("r1")
+            if record is not None:
+                seen.append(record.data)
+
+    threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen
+    assert all(data["twice"] == 2 * data["n"] and len(data["pad"]) == data["n"] % 300 for data in seen)
+
+
+# ------------------------------------------------------------
+# Overflow files
+# ------------------------------------------------------------
+def test_oversized_payloads_spill_to_an_overflow_file(store, path):
+    goal = "g" * (4 * store.block_size)
+    store.upsert(MemoryRecord("big", "personal", data={"goal": goal}))
+
+    assert store.get("big").data == {"goal": goal}
+    assert store.stats()["overflows"] == 1
+    assert len(os.listdir(path + ".overflow")) == 1
+
+    # Another worker mapping the same file follows the overflow file too
+    other = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    try:
+        assert other.get("big").data == {"goal": goal}
+    finally:
+        other.close()
+
+
+def test_overflow_files_are_removed_when_the_slot_is_rewritten_or_expires(path):
+    store = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024, tier_ttls={"personal": 60})
+    try:
+        big = {"goal": "g" * (4 * store.block_size)}
+        store.upsert(MemoryRecord("big", "personal", data=dict(big)))
+        store.upsert(MemoryRecord("big", "personal", data=dict(big)))
+        assert len(os.listdir(path + ".overflow")) == 1
+
+        store.update("big", lambda record: record.data.update(goal="small"))
+        assert store.get("big").data == {"goal": "small"}
+        assert os.listdir(path + ".overflow") == []
+
+        store.upsert(MemoryRecord("big", "personal", data=dict(big)))
+        assert store.sweep(now=time.time() + 120) == 1
+        assert store.get("big") is None
+        assert os.listdir(path + ".overflow") == []
+    finally:
+        store.close()
+
+
+# ------------------------------------------------------------
+# Close / shutdown ordering
+# ------------------------------------------------------------
+def test_close_is_idempotent_and_later_calls_fail_cleanly(path):
+    store = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    store.upsert(MemoryRecord("r1", "personal"))
+    store.close()
+    store.close()
+    asyncio.run(store.stop())
+
+    with pytest.raises(StoreClosed):
+        store.get("r1")
+    with pytest.raises(StoreClosed):
+        store.upsert(MemoryRecord("r2", "personal"))
+    with pytest.raises(StoreClosed):
+        store.update("r1", lambda record: None)
+    with pytest.raises(StoreClosed):
+        store.stats()
+
+
+def test_close_waits_for_a_writer_in_progress(path):
+    store = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    entered = threading.Event()
+
+    def slow_fn(record):
+        entered.set()
+        time.sleep(0.1)
+        record.data["done"] = True
+
+    writer = threading.Thread(target=store.update, args=("r1", slow_fn), kwargs={"tier": "personal"})
+    writer.start()
+    entered.wait(1)
+    store.close()
+    writer.join()
+
+    reopened = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    try:
+        assert reopened.get("r1").data == {"done": True}
+    finally:
+        reopened.close()
+
+
+def test_lifespan_stops_the_engine_before_the_memory_store(monkeypatch, path):
+    from fastapi.testclient import TestClient
+
+    import app.main as main
+
+    store = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    finished = threading.Event()
+
+    def in_flight():
+        # Bulkhead work that is still writing when shutdown starts
+        time.sleep(0.2)
+        store.update("r1", lambda record: record.data.update(done=True), tier="personal")
+        finished.set()
+
+    monkeypatch.setattr(main, "memory_store", store)
+    with TestClient(main.app):
+        main.engine.bulkhead("test_shutdown").submit(in_flight)
+
+    assert finished.is_set()
+    with pytest.raises(StoreClosed):
+        store.get("r1")
+
+    reopened = MmapMemoryStore(path, max_records=64, max_bytes=64 * 1024)
+    try:
+        assert reopened.get("r1").data == {"done": True}
+    finally:
+        reopened.close()
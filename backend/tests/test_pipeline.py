@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.memory import memory_store
+from tests.agents import make_ctx, make_engine, register_test_agents
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+
+
+@pytest.mark.parametrize(
+    "nodes, error",
+    [
+        ([], "Pipeline has no nodes"),
+        ([{"id": "a", "agent": "missing_agent"}], "Unknown agent: missing_agent (node a)"),
+        ([{"id": "input", "agent": "test_echo"}], "Node id 'input' is reserved"),
+        ([{"id": "a", "agent": "test_echo"}, {"id": "a", "agent": "test_echo"}], "Duplicate node id: a"),
+        ([{"id": "a", "agent": "test_echo", "after": ["b"]}], "Node a depends on unknown node(s): b"),
+        (
+            [{"id": "a", "agent": "test_echo", "map": {"x": "b"}}, {"id": "b", "agent": "test_echo", "after": ["a"]}],
+            "Pipeline has a cycle between: a, b",
+        ),
+    ],
+)
+def test_invalid_pipeline_specs_are_reported(nodes, error):
+    result = asyncio.run(make_engine().arun_pipeline({"nodes": nodes}, {}, make_ctx()))
+    assert result.ok is False
+    assert result.error == error
+    assert result.nodes == {}
+
+
+def test_failed_node_skips_its_dependents_only():
+    spec = {
+        "nodes": [
+            {"id": "boom", "agent": "test_boom"},
+            {"id": "after_boom", "agent": "test_echo", "map": {"x": "boom.value"}},
+            {"id": "echo", "agent": "test_echo", "map": {"goal": "input.goal"}},
+            {"id": "after_echo", "agent": "test_echo", "map": {"goal": "echo.echo.goal"}},
+        ]
+    }
+    ctx = make_ctx()
+    result = asyncio.run(make_engine().arun_pipeline(spec, {"goal": "ship"}, ctx))
+
+    assert result.ok is False
+    assert result.error == "failed nodes: boom, after_boom"
+    assert result.nodes["after_boom"].error == "skipped: upstream node failed (boom)"
+    assert result.nodes["after_echo"].output == {"echo": {"goal": "ship"}}
+    assert result.outputs == {"after_echo": {"echo": {"goal": "ship"}}}
+
+    recorded = memory_store.get(ctx.request_id).data["pipeline"]["nodes"]
+    assert recorded["boom"]["ok"] is False
+    assert recorded["after_boom"]["error"].startswith("skipped")
+    assert recorded["after_echo"]["ok"] is True
+
+
+def test_skip_error_names_only_the_failed_dependencies():
+    spec = {
+        "nodes": [
+            {"id": "ok", "agent": "test_echo"},
+            {"id": "zz_boom", "agent": "test_boom"},
+            {"id": "aa_boom", "agent": "test_boom"},
+            {"id": "join", "agent": "test_echo", "after": ["ok", "zz_boom", "aa_boom"]},
+        ]
+    }
+    result = asyncio.run(make_engine().arun_pipeline(spec, {}, make_ctx()))
+
+    assert result.nodes["join"].agent == "test_echo"
+    assert result.nodes["join"].error == "skipped: upstream node failed (aa_boom, zz_boom)"
+
+
+def test_missing_mapped_value_fails_the_node():
+    spec = {
+        "nodes": [
+            {"id": "echo", "agent": "test_echo", "map": {"goal": "input.goal"}},
+            {"id": "next", "agent": "test_echo", "map": {"x": "echo.echo.missing"}},
+            {"id": "last", "agent": "test_echo", "after": ["next"]},
+        ]
+    }
+    result = asyncio.run(make_engine().arun_pipeline(spec, {}, make_ctx()))
+
+    assert result.nodes["echo"].ok is False
+    assert "references missing value 'input.goal'" in result.nodes["echo"].error
+    assert result.nodes["next"].error == "skipped: upstream node failed (echo)"
+    assert result.nodes["last"].error == "skipped: upstream node failed (next)"
+
+
+def test_pipeline_node_timeout_and_rejection_are_node_results():
+    spec = {
+        "nodes": [
+            {"id": "slow", "agent": "test_slow", "input": {"seconds": 1.0}},
+            {"id": "a", "agent": "test_slow", "input": {"seconds": 0.02}},
+            {"id": "b", "agent": "test_slow", "input": {"seconds": 0.03}},
+        ]
+    }
+    engine = make_engine(max_concurrency=2, max_queue=0)
+    result = asyncio.run(engine.arun_pipeline(spec, {}, make_ctx()))
+
+    assert result.ok is False
+    errors = {node_id: node.error or "" for node_id, node in result.nodes.items()}
+    assert errors["slow"].startswith("timeout: test_slow")
+    assert sum("saturated" in error for error in errors.values()) == 1
+
+
+def test_pipeline_route_reports_spec_errors_with_200():
+    from app.main import app
+
+    http = TestClient(app)
+    response = http.post("/api/v1/agents/pipeline", json={"nodes": [{"id": "a", "agent": "missing_agent"}]})
+    assert response.status_code == 200
+    assert response.json()["ok"] is False
+    assert response.json()["error"] == "Unknown agent: missing_agent (node a)"
+
+    assert http.post("/api/v1/agents/pipeline", json={"nodes": []}).status_code == 422
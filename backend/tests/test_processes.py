@@ -0,0 +1,76 @@
+import asyncio
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.agents.base import AgentContext
+from app.core.processes import AgentProcessPool, ProcessAgentError
+
+AGENT = ("tests.process_agents:SleepAgent", "per_request")
+
+
+@pytest.fixture()
+def pool():
+    # One worker and five executions: the flush sends chunks of two
+    pool = AgentProcessPool(warm=lambda: [AGENT], workers=1, start_method="spawn")
+    yield pool
+    pool.shutdown()
+
+
+def _submit_together(pool, inputs, timeout=5.0):
+    async def run():
+        await pool.start()
+        started = time.monotonic()
+        futures = [pool.submit(AGENT, input_data, AgentContext(), timeout) for input_data in inputs]
+
+        async def timed(future):
+            try:
+                return await future, time.monotonic() - started
+            except Exception as e:
+                return e, time.monotonic() - started
+
+        return await asyncio.gather(*(timed(future) for future in futures))
+
+    return asyncio.run(run())
+
+
+def test_fast_execution_is_not_held_back_by_a_slow_one_in_its_chunk(pool):
+    results = _submit_together(pool, [{"seconds": 0}, {"seconds": 1.0}, {}, {}, {}])
+
+    assert pool.stats()["chunks"] == 3
+    (output, elapsed), (slow_output, slow_elapsed) = results[0], results[1]
+    assert output == {"seconds": 0}
+    assert slow_output == {"seconds": 1.0}
+    assert elapsed < 0.5 <= 1.0 <= slow_elapsed
+
+
+def test_chunk_siblings_get_their_own_errors(pool):
+    results = _submit_together(pool, [{"fail": True}, {"unpicklable": True}, {}, {}, {}])
+    outcomes = [outcome for outcome, _ in results]
+
+    assert isinstance(outcomes[0], ProcessAgentError)
+    assert str(outcomes[0]) == "failed on purpose"
+    assert isinstance(outcomes[1], ProcessAgentError)
+    assert str(outcomes[1]).startswith("output cannot be sent back")
+    assert outcomes[2:] == [{"seconds": 0}] * 3
+
+
+def test_outcomes_sent_before_a_crash_are_delivered(pool):
+    dispatch = pool._dispatch
+
+    def slow_dispatch(task_id, outcome):
+        # The crash is noticed while this outcome is still in the channel
+        time.sleep(0.3)
+        dispatch(task_id, outcome)
+
+    pool._dispatch = slow_dispatch
+    results = _submit_together(pool, [{"seconds": 0}, {"exit": True}, {}, {}, {}])
+    outcomes = [outcome for outcome, _ in results]
+
+    assert outcomes[0] == {"seconds": 0}
+    assert isinstance(outcomes[1], BrokenProcessPool)
+    assert pool.stats()["crashes"] == 1
+
+    # The pool is rebuilt for the next executions
+    assert [outcome for outcome, _ in _submit_together(pool, [{}])] == [{"seconds": 0}]
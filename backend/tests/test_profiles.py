@@ -0,0 +1,31 @@
+import json
+import shutil
+
+import pytest
+
+from app.core.profiles import ProfileError, TierProfiles
+
+
+def _write_profile(directory, tier):
+    (directory / tier).mkdir()
+    (directory / tier / "profile.json").write_text(json.dumps({"tier": tier}), encoding="utf-8")
+
+
+def test_missing_profiles_fail_startup(tmp_path):
+    with pytest.raises(ProfileError):
+        TierProfiles(tmp_path / "missing")
+    with pytest.raises(ProfileError):
+        TierProfiles(tmp_path)
+
+
+def test_reload_without_profiles_keeps_current(tmp_path):
+    _write_profile(tmp_path, "personal")
+    _write_profile(tmp_path, "business")
+    profiles = TierProfiles(tmp_path)
+    assert profiles.tiers() == ["business", "personal"]
+
+    shutil.rmtree(tmp_path / "personal")
+    shutil.rmtree(tmp_path / "business")
+    assert profiles.reload_if_changed() is False
+    assert profiles.tiers() == ["business", "personal"]
+    assert profiles.normalize("Business") == "business"
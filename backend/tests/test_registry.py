@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.agents.base import BaseAgent
+from app.agents.registry import POOL, PROCESS, SINGLETON, AgentRegistry, LoopRunningError
+
+
+class LifecycleAgent(BaseAgent):
+    """
+    Records every instance's startup()/shutdown() (startup_delay widens
+    cold start races).
+    """
+
+    started = []
+    stopped = []
+    startup_delay = 0.0
+
+    async def startup(self):
+        await asyncio.sleep(type(self).startup_delay)
+        type(self).started.append(self)
+
+    async def shutdown(self):
+        type(self).stopped.append(self)
+
+    def run(self, input_data, ctx):
+        return {}
+
+
+class BrokenShutdownAgent(LifecycleAgent):
+    async def shutdown(self):
+        raise RuntimeError("shutdown failed")
+
+
+@pytest.fixture(autouse=True)
+def reset_agents():
+    LifecycleAgent.started, LifecycleAgent.stopped = [], []
+    LifecycleAgent.startup_delay = 0.0
+
+
+@pytest.fixture
+def registry():
+    return AgentRegistry()
+
+
+# ------------------------------------------------------------
+# Singletons
+# ------------------------------------------------------------
+def test_singleton_is_built_once_and_shared(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON, warmup=False)
+
+    first = registry.get("single")
+    assert registry.get("single") is first
+
+    async def lease():
+        return await registry.alease("single")
+
+    leased, release = asyncio.run(lease())
+    release()
+    assert leased is first
+    assert LifecycleAgent.started == [first]
+    assert registry.stats()["single"]["started"] is True
+
+
+def test_concurrent_cold_starts_keep_one_instance_and_shut_the_other_down(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON, warmup=False)
+    LifecycleAgent.startup_delay = 0.05
+
+    async def run():
+        return await asyncio.gather(*(registry.alease("single") for _ in range(2)))
+
+    (first, _), (second, _) = asyncio.run(run())
+    assert first is second
+    assert len(LifecycleAgent.started) == 2
+    assert LifecycleAgent.stopped == [a for a in LifecycleAgent.started if a is not first]
+
+
+def test_concurrent_sync_cold_starts_keep_one_instance(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON, warmup=False)
+    LifecycleAgent.startup_delay = 0.05
+    seen = []
+
+    threads = [threading.Thread(target=lambda: seen.append(registry.get("single"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(map(id, seen))) == 1
+    assert len(LifecycleAgent.stopped) == len(LifecycleAgent.started) - 1
+    assert seen[0] not in LifecycleAgent.stopped
+
+
+# ------------------------------------------------------------
+# Pools
+# ------------------------------------------------------------
+def test_pool_reuses_returned_instances(registry):
+    registry.register("pooled", LifecycleAgent, lifecycle=POOL, pool_size=2, warmup=False)
+
+    with pytest.raises(ValueError):
+        registry.get("pooled")
+
+    with registry.checkout("pooled") as first:
+        pass
+    with registry.checkout("pooled") as second:
+        pass
+
+    assert first is second
+    stats = registry.stats()["pooled"]
+    assert (stats["created"], stats["idle"], stats["checkouts"]) == (1, 1, 2)
+
+
+def test_exhausted_pool_hands_instances_to_waiters(registry):
+    registry.register("pooled", LifecycleAgent, lifecycle=POOL, pool_size=1, warmup=False)
+    handed = []
+
+    with registry.checkout("pooled") as held:
+        def wait():
+            with registry.checkout("pooled") as agent:
+                handed.append(agent)
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        while registry.stats()["pooled"]["waiting"] == 0:
+            time.sleep(0.01)
+
+    waiter.join(1)
+    assert handed == [held]
+    assert registry.stats()["pooled"]["waits"] == 1
+
+
+# ------------------------------------------------------------
+# Warmup / shutdown
+# ------------------------------------------------------------
+def test_startup_warms_only_agents_registered_with_warmup(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON)
+    registry.register("pooled", LifecycleAgent, lifecycle=POOL, pool_size=3)
+    registry.register("lazy", LifecycleAgent, lifecycle=SINGLETON, warmup=False)
+    registry.register("in_process", LifecycleAgent, lifecycle=SINGLETON, execution=PROCESS)
+
+    asyncio.run(registry.startup())
+
+    stats = registry.stats()
+    assert stats["single"]["started"] is True
+    assert (stats["pooled"]["created"], stats["pooled"]["idle"], stats["pooled"]["checkouts"]) == (3, 3, 0)
+    assert stats["lazy"]["started"] is False
+    assert stats["in_process"]["started"] is False
+    assert len(LifecycleAgent.started) == 4
+
+
+def test_shutdown_stops_every_instance_and_forgets_them(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON)
+    registry.register("pooled", LifecycleAgent, lifecycle=POOL, pool_size=2)
+    registry.register("broken", BrokenShutdownAgent, lifecycle=SINGLETON)
+
+    async def run():
+        await registry.startup()
+        await registry.shutdown()
+
+    asyncio.run(run())
+
+    # A failing shutdown() hook does not keep the others from running
+    assert len(LifecycleAgent.stopped) == 3
+    stats = registry.stats()
+    assert stats["single"]["started"] is False and stats["broken"]["started"] is False
+    assert stats["pooled"]["created"] == 0
+
+    # Built again on next use
+    assert registry.get("single") not in LifecycleAgent.stopped
+
+
+# ------------------------------------------------------------
+# Sync checkout from a running event loop
+# ------------------------------------------------------------
+def test_sync_checkout_cannot_start_instances_on_a_running_loop(registry):
+    registry.register("single", LifecycleAgent, lifecycle=SINGLETON, warmup=False)
+    registry.register("pooled", LifecycleAgent, lifecycle=POOL, pool_size=1, warmup=False)
+
+    async def run():
+        with pytest.raises(LoopRunningError, match="alease"):
+            registry.get("single")
+        with pytest.raises(LoopRunningError):
+            with registry.checkout("pooled"):
+                pass
+        assert LifecycleAgent.started == []
+
+        # Started instances are handed out to sync code as usual
+        agent, release = await registry.alease("single")
+        release()
+        assert registry.get("single") is agent
+
+        async with registry.acheckout("pooled") as pooled:
+            pass
+        with registry.checkout("pooled") as again:
+            assert again is pooled
+
+    asyncio.run(run())
+    assert registry.stats()["pooled"]["created"] == 1
@@ -0,0 +1,155 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from app.core.memory import MemoryRecord
+from app.core.sqlite_store import SQLiteMemoryStore
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "memory.db")
+
+
+def _store(path, **kwargs):
+    # Long flush interval: rows reach the database on flush()/stop() only
+    kwargs.setdefault("flush_interval", 60)
+    return SQLiteMemoryStore(path, **kwargs)
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT request_id, updated_at FROM memory_records").fetchall())
+
+
+def _execution(record, agent="orchestrator", ok=True, duration_ms=1.0):
+    record.data.update(last_agent=agent, last_ok=ok, last_duration_ms=duration_ms)
+
+
+def test_stop_flushes_every_queued_write(path):
+    async def run():
+        store = _store(path)
+        store.start()
+        for i in range(10):
+            store.update(f"r{i}", _execution, tier="personal")
+        assert store.stats()["pending_writes"] == 10
+        await store.stop()
+        return store
+
+    store = asyncio.run(run())
+    assert store.stats()["pending_writes"] == 0
+    assert sorted(_rows(path)) == sorted(f"r{i}" for i in range(10))
+
+
+def test_records_survive_a_restart(path):
+    first = _store(path)
+    first.update("r1", lambda record: record.data.update(goal="ship it"), tier="business")
+    first.flush()
+
+    restarted = _store(path)
+    record = restarted.get("r1")
+    assert (record.tier, record.data) == ("business", {"goal": "ship it"})
+    assert restarted.stats()["db_hits"] == 1
+
+
+def test_row_and_cached_record_share_one_timestamp(path):
+    store = _store(path)
+    record = store.update("r1", _execution, tier="personal")
+    store.flush()
+
+    assert _rows(path)["r1"] == record.updated_at == store.get("r1").updated_at
+
+
+def test_sweep_deletes_expired_rows(path):
+    store = _store(path, tier_ttls={"personal": 60}, default_ttl=60)
+    store.update("old", _execution, tier="personal")
+    store.update("other", _execution, tier="custom")
+    store.update("new", _execution, tier="personal")
+    store.flush()
+
+    stale = time.time() - 120
+    with sqlite3.connect(path) as conn:
+        conn.execute("UPDATE memory_records SET updated_at = ? WHERE request_id != 'new'", (stale,))
+    store._delete_expired(store._connection())
+
+    assert sorted(_rows(path)) == ["new"]
+    assert _store(path).get("old") is None
+
+
+def test_other_workers_see_flushed_records(path):
+    writer, reader = _store(path), _store(path)
+    writer.update("r1", lambda record: record.data.update(step=1), tier="personal")
+    assert reader.get("r1") is None
+
+    writer.flush()
+    assert reader.get("r1").data == {"step": 1}
+    assert reader.snapshot("r1").data == {"step": 1}
+
+
+def test_records_of_other_workers_are_never_served_stale(path):
+    owner, other = _store(path), _store(path)
+    owner.update("r1", lambda record: record.data.update(step=1), tier="personal")
+    owner.flush()
+
+    # `other` updates a record it did not create, then the owner moves on
+    other.update("r1", lambda record: record.data.update(seen_by_other=True))
+    other.flush()
+    owner.update("r1", lambda record: record.data.update(step=2))
+    owner.flush()
+
+    assert other.get("r1").data["step"] == 2
+    assert other.snapshot("r1").data["step"] == 2
+    assert other.stats()["records"] == 0
+
+
+def test_updates_of_uncached_records_read_rows_being_committed(path):
+    owner, other = _store(path), _store(path)
+    owner.update("r1", lambda record: record.data.update(count=0), tier="personal")
+    owner.flush()
+
+    other.update("r1", lambda record: record.data.update(count=1))
+    # The writer has taken the batch but not committed it yet
+    other._flushing, other._pending = other._pending, {}
+    other.update("r1", lambda record: record.data.update(count=record.data["count"] + 1))
+    other._flushing = {}
+    other.flush()
+
+    assert _store(path).get("r1").data == {"count": 2}
+
+
+def test_query_lists_every_workers_executions(path):
+    first, second = _store(path), _store(path)
+    first.update("a", lambda record: _execution(record, "orchestrator", True, 5.0), tier="personal")
+    second.update("b", lambda record: _execution(record, "reliability", False, 50.0), tier="business")
+    first.update("c", lambda record: _execution(record, "orchestrator", False, 500.0), tier="business")
+
+    # Rows queued by the answering worker are included, other workers'
+    # rows once they are flushed
+    second.flush()
+
+    def ids(**filters):
+        items, _ = first.query(**filters)
+        return [item["request_id"] for item in items]
+
+    assert ids() == ["c", "b", "a"]
+    assert ids(tier="business") == ["c", "b"]
+    assert ids(agent="orchestrator") == ["c", "a"]
+    assert ids(status="ok") == ["a"]
+    assert ids(status="error", min_duration_ms=100) == ["c"]
+
+
+def test_query_pages_with_cursors(path):
+    store = _store(path)
+    for i in range(7):
+        store.update(f"r{i}", _execution, tier="personal")
+
+    seen, cursor = [], None
+    while True:
+        items, cursor = store.query(limit=3, cursor=cursor)
+        seen.extend(item["request_id"] for item in items)
+        if cursor is None:
+            break
+
+    assert seen == [f"r{i}" for i in reversed(range(7))]
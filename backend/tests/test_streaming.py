@@ -0,0 +1,130 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.agents.base import BaseAgent
+from app.agents.registry import registry
+from tests.agents import make_engine, register_test_agents
+
+
+class StepsAgent(BaseAgent):
+    name = "test_steps"
+    stream_field = "steps"
+
+    async def astream(self, input_data, ctx):
+        for i in range(input_data.get("count", 3)):
+            yield {"step": i}
+
+
+class FailingStreamAgent(BaseAgent):
+    name = "test_failing_stream"
+    stream_field = "steps"
+
+    def stream(self, input_data, ctx):
+        if input_data.get("after"):
+            yield {"step": 0}
+        raise RuntimeError("stream failed")
+
+
+@pytest.fixture(autouse=True)
+def test_agents(monkeypatch):
+    register_test_agents(monkeypatch)
+    registry.register(StepsAgent.name, StepsAgent)
+    registry.register(FailingStreamAgent.name, FailingStreamAgent)
+
+
+@pytest.fixture
+def http():
+    from app.main import app
+
+    return TestClient(app)
+
+
+def _ndjson(response):
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.content.endswith(b"\n")
+    return [json.loads(line) for line in response.content.split(b"\n")[:-1]]
+
+
+def _sse(response):
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.content.endswith(b"\n\n")
+    events = []
+    for frame in response.content.split(b"\n\n")[:-1]:
+        name, data = frame.split(b"\n")
+        assert name.startswith(b"event: ") and data.startswith(b"data: ")
+        event = json.loads(data[len(b"data: "):])
+        assert event["event"] == name[len(b"event: "):].decode()
+        events.append(event)
+    return events
+
+
+def test_ndjson_frames_one_event_per_line(http):
+    response = http.post("/api/v1/agents/test_steps/stream", json={"count": 3})
+    events = _ndjson(response)
+
+    assert response.status_code == 200
+    assert events[:3] == [{"event": "chunk", "data": {"step": i}} for i in range(3)]
+    assert events[3]["event"] == "done"
+    assert (events[3]["agent"], events[3]["ok"], events[3]["error"]) == ("test_steps", True, None)
+    assert events[3]["request_id"] == response.headers["x-request-id"]
+
+
+def test_sse_frames_name_every_event(http):
+    response = http.post(
+        "/api/v1/agents/test_steps/stream", json={"count": 2}, headers={"Accept": "text/event-stream"}
+    )
+    events = _sse(response)
+
+    assert [event["event"] for event in events] == ["chunk", "chunk", "done"]
+    assert [event["data"] for event in events[:2]] == [{"step": 0}, {"step": 1}]
+    assert events[-1]["ok"] is True
+
+
+def test_non_streaming_agents_send_their_output_as_one_chunk(http):
+    events = _ndjson(http.post("/api/v1/agents/test_echo/stream", json={"n": 1}))
+    assert events[0] == {"event": "chunk", "data": {"echo": {"n": 1}}}
+    assert [event["event"] for event in events] == ["chunk", "done"]
+
+
+@pytest.mark.parametrize("accept", ["application/x-ndjson", "text/event-stream"])
+def test_errors_before_the_first_chunk_end_the_stream_with_done(http, accept):
+    response = http.post("/api/v1/agents/test_failing_stream/stream", json={}, headers={"Accept": accept})
+    events = _sse(response) if accept == "text/event-stream" else _ndjson(response)
+
+    assert response.status_code == 200
+    assert len(events) == 1
+    assert (events[0]["event"], events[0]["ok"]) == ("done", False)
+    assert "stream failed" in events[0]["error"]
+
+
+def test_errors_after_a_chunk_keep_the_chunks_sent(http):
+    events = _ndjson(http.post("/api/v1/agents/test_failing_stream/stream", json={"after": True}))
+
+    assert events[0] == {"event": "chunk", "data": {"step": 0}}
+    assert (events[1]["event"], events[1]["ok"]) == ("done", False)
+    assert "stream failed" in events[1]["error"]
+
+
+def test_unknown_agents_stream_a_single_failed_done_event(http):
+    events = _ndjson(http.post("/api/v1/agents/missing_agent/stream", json={}))
+    assert len(events) == 1
+    assert (events[0]["ok"], events[0]["error"]) == (False, "Unknown agent: missing_agent")
+
+
+def test_saturated_tier_is_rejected_before_the_stream_starts(monkeypatch, http):
+    import app.agent_routes as agent_routes
+
+    engine = make_engine(max_concurrency=1, max_queue=0)
+    monkeypatch.setattr(agent_routes, "engine", engine)
+
+    with engine.admission.admit("personal"):
+        response = http.post(
+            "/api/v1/agents/test_steps/stream", json={}, headers={"X-OperatorX-Tier": "personal"}
+        )
+
+    assert response.status_code == 429
+    assert response.headers["content-type"] == "application/json"
+    assert "retry-after" in response.headers